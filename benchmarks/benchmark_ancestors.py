@@ -0,0 +1,40 @@
+#!/usr/bin/env python
+
+import argparse
+import time
+
+import dftlib.storage.dft_gates as dft_gates
+import dftlib.transformer.rewrite_rules as rewrite_rules
+from generate import generate_shared_dft
+
+
+def has_immediate_failure_recursive(dft, gate):
+    # Previous implementation without memoization
+    if gate.element_id == dft.top_level_element.element_id:
+        return True
+    return any(isinstance(parent, dft_gates.DftOr) and has_immediate_failure_recursive(dft, parent) for parent in gate.parents())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the side condition checks of rewrite rules with and without the ancestor index.")
+
+    parser.add_argument("--layers", "-l", help="Maximal number of layers of shared gates", type=int, default=12)
+    parser.add_argument("--width", "-w", help="Number of elements per layer", type=int, default=50)
+    args = parser.parse_args()
+
+    print("{:>8} {:>10} {:>14} {:>12}".format("layers", "elements", "recursive [s]", "index [s]"))
+    for layers in range(2, args.layers + 1, 2):
+        dft = generate_shared_dft(layers, args.width)
+        bes = list(dft.iter_bes())
+        start = time.perf_counter()
+        expected = [has_immediate_failure_recursive(dft, be) for be in bes]
+        time_recursive = time.perf_counter() - start
+        start = time.perf_counter()
+        results = [rewrite_rules.has_immediate_failure(dft, be) for be in bes]
+        time_index = time.perf_counter() - start
+        assert results == expected
+        print("{:>8} {:>10} {:>14.3f} {:>12.3f}".format(layers, dft.size(), time_recursive, time_index))
+
+
+if __name__ == "__main__":
+    main()
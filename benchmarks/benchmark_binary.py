@@ -0,0 +1,45 @@
+#!/usr/bin/env python
+
+import argparse
+import os
+import tempfile
+
+import dftlib.io.export_binary as export_binary
+import dftlib.io.export_json as export_json
+import dftlib.io.parser
+from benchmark_export import measure
+from generate import generate_large_dft
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare loading a DFT from JSON with loading it from the binary format.")
+
+    parser.add_argument("--bes", "-b", help="Number of BEs", type=int, default=450000)
+    parser.add_argument("--fan-in", "-f", help="Number of children per gate", type=int, default=10)
+    args = parser.parse_args()
+
+    dft = generate_large_dft(args.bes, args.fan_in)
+    print("Elements: {}".format(dft.size()))
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        json_file = os.path.join(tmp_dir, "dft.json")
+        binary_file = os.path.join(tmp_dir, "dft.dftb")
+        export_json.export_dft_file(dft, json_file, compact=True)
+        export_binary.export_dft_file(dft, binary_file)
+        del dft
+        print("File size JSON: {:.1f} MiB, binary: {:.1f} MiB".format(os.path.getsize(json_file) / 2**20, os.path.getsize(binary_file) / 2**20))
+
+        imports = [
+            ("JSON", lambda: dftlib.io.parser.parse_dft_json_file(json_file)),
+            ("JSON + freeze()", lambda: dftlib.io.parser.parse_dft_json_file(json_file).freeze()),
+            ("binary", lambda: dftlib.io.parser.parse_dft_binary_file(binary_file)),
+            ("binary array", lambda: dftlib.io.parser.load_dft_array_binary_file(binary_file)),
+        ]
+        print("{:>22} {:>10} {:>12}".format("import", "time [s]", "peak [MiB]"))
+        for name, func in imports:
+            duration, peak = measure(func)
+            print("{:>22} {:>10.3f} {:>12.1f}".format(name, duration, peak / 2**20))
+
+
+if __name__ == "__main__":
+    main()
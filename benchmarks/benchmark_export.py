@@ -0,0 +1,61 @@
+#!/usr/bin/env python
+
+import argparse
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+
+import dftlib.io.export_json as export_json
+from generate import generate_large_dft
+
+
+def measure(func) -> tuple[float, int]:
+    """
+    Measure running time and peak memory of a function.
+    :param func: Function without arguments.
+    :return: Tuple (time in seconds, peak memory in bytes).
+    """
+    start = time.perf_counter()
+    func()
+    duration = time.perf_counter() - start
+    # Memory is measured in a separate run as tracing slows down the export
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return duration, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the throughput of the JSON export via Dft.json() with the streaming export.")
+
+    parser.add_argument("--bes", "-b", help="Number of BEs", type=int, default=100000)
+    parser.add_argument("--fan-in", "-f", help="Number of children per gate", type=int, default=10)
+    args = parser.parse_args()
+
+    dft = generate_large_dft(args.bes, args.fan_in)
+    print("Elements: {}".format(dft.size()))
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        file = os.path.join(tmp_dir, "dft.json")
+
+        def export_dict():
+            with open(file, "w") as out_file:
+                json.dump(dft.json(), out_file, indent=4)
+
+        exports = [
+            ("json.dump(Dft.json())", export_dict),
+            ("streaming", lambda: export_json.export_dft_file(dft, file)),
+            ("streaming compact", lambda: export_json.export_dft_file(dft, file, compact=True)),
+        ]
+        print("{:>22} {:>10} {:>10} {:>12} {:>12}".format("export", "time [s]", "size [MiB]", "rate [MiB/s]", "peak [MiB]"))
+        for name, func in exports:
+            duration, peak = measure(func)
+            size = os.path.getsize(file) / 2**20
+            print("{:>22} {:>10.3f} {:>10.1f} {:>12.1f} {:>12.1f}".format(name, duration, size, size / duration, peak / 2**20))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+#!/usr/bin/env python
+
+import argparse
+import json
+import os
+import tempfile
+
+import dftlib.io.export_json as export_json
+import dftlib.io.parser
+from benchmark_export import measure
+from dftlib.storage.dft import Dft
+from generate import generate_large_dft
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare running time and peak memory of loading a JSON file via json.load() with the incremental loader.")
+
+    parser.add_argument("--bes", "-b", help="Number of BEs", type=int, default=450000)
+    parser.add_argument("--fan-in", "-f", help="Number of children per gate", type=int, default=10)
+    args = parser.parse_args()
+
+    dft = generate_large_dft(args.bes, args.fan_in)
+    print("Elements: {}".format(dft.size()))
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        file = os.path.join(tmp_dir, "dft.json")
+        export_json.export_dft_file(dft, file)
+        del dft
+        print("File size: {:.1f} MiB".format(os.path.getsize(file) / 2**20))
+
+        def load_dict():
+            with open(file) as json_file:
+                return Dft(json.load(json_file))
+
+        imports = [
+            ("json.load() + Dft()", load_dict),
+            ("incremental", lambda: dftlib.io.parser.parse_dft_json_file(file)),
+        ]
+        print("{:>22} {:>10} {:>12}".format("import", "time [s]", "peak [MiB]"))
+        for name, func in imports:
+            duration, peak = measure(func)
+            print("{:>22} {:>10.3f} {:>12.1f}".format(name, duration, peak / 2**20))
+
+
+if __name__ == "__main__":
+    main()
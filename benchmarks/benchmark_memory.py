@@ -0,0 +1,38 @@
+#!/usr/bin/env python
+
+import argparse
+import gc
+import tracemalloc
+
+from generate import generate_large_dft
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure the memory footprint of the DFT data structure on a synthetic DFT.")
+
+    parser.add_argument("--bes", "-b", help="Number of BEs", type=int, default=200000)
+    parser.add_argument("--fan-in", "-f", help="Number of children per gate", type=int, default=10)
+    args = parser.parse_args()
+
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    dft = generate_large_dft(args.bes, args.fan_in)
+    gc.collect()
+    after = tracemalloc.take_snapshot()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    total = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    no_be, no_static, no_dynamic, no_elements = dft.statistics()
+    print("Elements:          {} ({} BEs, {} gates)".format(no_elements, no_be, no_static + no_dynamic))
+    print("Total memory:      {:.1f} MiB".format(total / 2**20))
+    print("Peak memory:       {:.1f} MiB".format(peak / 2**20))
+    print("Bytes per element: {:.1f}".format(total / no_elements))
+    print("Top allocation sites:")
+    for stat in after.compare_to(before, "lineno")[:5]:
+        print("  {}".format(stat))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+#!/usr/bin/env python
+
+import argparse
+import time
+
+import dftlib.transformer.simplifier as simplifier
+from generate import generate_fan_out_dft, generate_simplifiable_dft
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the running time of the simplification strategies on synthetic DFTs.")
+
+    parser.add_argument("--modules", "-m", help="Number of modules in the largest DFT", type=int, default=800)
+    parser.add_argument("--all-rules", "-a", help="Use all rewriting rules", action="store_true")
+    parser.add_argument(
+        "--validation",
+        help="Validation level during simplification",
+        choices=[level.name.lower() for level in simplifier.ValidationLevel],
+        default="incremental",
+    )
+    args = parser.parse_args()
+
+    rules = simplifier.get_all_rules() if args.all_rules else simplifier.get_default_rules()
+    validation = simplifier.ValidationLevel[args.validation.upper()]
+    sizes = [args.modules // 8, args.modules // 4, args.modules // 2, args.modules]
+    # The second case has a top level element with high fan-out which is changed by most rewrites
+    for generate in [generate_simplifiable_dft, generate_fan_out_dft]:
+        print(generate.__name__)
+        print(
+            "{:>8} {:>10} {:>12} {:>12} {:>12} {:>15} {:>13} {:>17}".format(
+                "modules", "elements", "restart [s]", "worklist [s]", "sweep [s]", "restart scans", "sweep scans", "worklist attempts"
+            )
+        )
+        for size in sizes:
+            times = []
+            results = []
+            statistics = []
+            for strategy in [simplifier.SimplificationStrategy.RESTART, simplifier.SimplificationStrategy.WORKLIST, simplifier.SimplificationStrategy.SWEEP]:
+                dft = generate(size)
+                no_elements = dft.size()
+                stats = simplifier.SimplificationStatistics()
+                start = time.perf_counter()
+                simplifier.simplify_dft_rules(dft, rules, strategy, validation, stats)
+                times.append(time.perf_counter() - start)
+                results.append(dft)
+                statistics.append(stats)
+            assert results[0].compare(results[1], respect_ids=False)
+            assert results[0].compare(results[2], respect_ids=False)
+            attempts = sum(rule_statistics.attempts for rule_statistics in statistics[1].rules.values())
+            print(
+                "{:>8} {:>10} {:>12.3f} {:>12.3f} {:>12.3f} {:>15} {:>13} {:>17}".format(
+                    size, no_elements, times[0], times[1], times[2], statistics[0].scans, statistics[2].scans, attempts
+                )
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+import dftlib.storage.dft_be as dft_be
+import dftlib.storage.dft_gates as dft_gates
+from dftlib.storage.dft import Dft
+
+"""
+Generation of synthetic DFTs for benchmarking.
+"""
+
+
+def generate_simplifiable_dft(no_modules: int) -> Dft:
+    """
+    Generate a static DFT which offers many opportunities for simplification.
+    Each module has the form OR(OR(A, B), VOT1(C, AND(D))) where the BEs A and B can be merged, the VOT-gate can be specialized,
+    the AND-gate has a single successor and the nested OR-gates can be flattened.
+    :param no_modules: Number of modules below the top level element.
+    :return: DFT.
+    """
+    dft = Dft()
+    modules = []
+    for i in range(no_modules):
+        bes = []
+        for name in ["A", "B", "C", "D"]:
+            be = dft_be.BeExponential(dft.next_id(), "{}{}".format(name, i), 1.0, 1.0, 0.0, (0, 0))
+            dft.add(be)
+            bes.append(be)
+        or_inner = dft_gates.DftOr(dft.next_id(), "Or{}".format(i), [bes[0], bes[1]], (0, 0))
+        dft.add(or_inner)
+        and_single = dft_gates.DftAnd(dft.next_id(), "And{}".format(i), [bes[3]], (0, 0))
+        dft.add(and_single)
+        vot = dft_gates.DftVotingGate(dft.next_id(), "Vot{}".format(i), 1, [bes[2], and_single], (0, 0))
+        dft.add(vot)
+        module = dft_gates.DftOr(dft.next_id(), "Module{}".format(i), [or_inner, vot], (0, 0))
+        dft.add(module)
+        modules.append(module)
+    top = dft_gates.DftAnd(dft.next_id(), "Top", modules, (0, 0))
+    dft.add(top)
+    dft.set_top_level_element(top.element_id)
+    return dft
+
+
+def generate_fan_out_dft(no_modules: int) -> Dft:
+    """
+    Generate a static DFT whose top level element has a high fan-out and is changed by most rewrites.
+    The top level element is an OR-gate over modules of the form OR(A, AND(B, C)). Each module is flattened into the top level element
+    and afterwards the BEs A of all modules are merged one by one.
+    :param no_modules: Number of modules below the top level element.
+    :return: DFT.
+    """
+    dft = Dft()
+    modules = []
+    for i in range(no_modules):
+        bes = []
+        for name in ["A", "B", "C"]:
+            be = dft_be.BeExponential(dft.next_id(), "{}{}".format(name, i), 1.0, 1.0, 0.0, (0, 0))
+            dft.add(be)
+            bes.append(be)
+        and_gate = dft_gates.DftAnd(dft.next_id(), "And{}".format(i), [bes[1], bes[2]], (0, 0))
+        dft.add(and_gate)
+        module = dft_gates.DftOr(dft.next_id(), "Module{}".format(i), [bes[0], and_gate], (0, 0))
+        dft.add(module)
+        modules.append(module)
+    top = dft_gates.DftOr(dft.next_id(), "Top", modules, (0, 0))
+    dft.add(top)
+    dft.set_top_level_element(top.element_id)
+    return dft
+
+
+def generate_large_dft(no_bes: int, fan_in: int = 10) -> Dft:
+    """
+    Generate a large static DFT.
+    The BEs are grouped by alternating layers of AND- and OR-gates with the given number of children.
+    :param no_bes: Number of BEs.
+    :param fan_in: Number of children per gate.
+    :return: DFT.
+    """
+    dft = Dft()
+    layer = []
+    for i in range(no_bes):
+        be = dft_be.BeExponential(dft.next_id(), "BE{}".format(i), 1.0, 1.0, 0.0, (0, 0))
+        dft.add(be)
+        layer.append(be)
+    depth = 0
+    while len(layer) > 1:
+        next_layer = []
+        for i in range(0, len(layer), fan_in):
+            name = "G{}_{}".format(depth, i // fan_in)
+            if depth % 2 == 0:
+                gate = dft_gates.DftAnd(dft.next_id(), name, layer[i : i + fan_in], (0, 0))
+            else:
+                gate = dft_gates.DftOr(dft.next_id(), name, layer[i : i + fan_in], (0, 0))
+            dft.add(gate)
+            next_layer.append(gate)
+        layer = next_layer
+        depth += 1
+    dft.set_top_level_element(layer[0].element_id)
+    return dft
+
+
+def generate_shared_dft(no_layers: int, width: int, fan_in: int = 3) -> Dft:
+    """
+    Generate a static DFT with heavily shared subtrees.
+    Each layer contains the given number of OR-gates whose children are chosen from the layer below such that every element has several parents.
+    The number of paths from the top level element to a BE grows exponentially with the number of layers.
+    :param no_layers: Number of gate layers.
+    :param width: Number of elements per layer.
+    :param fan_in: Number of children per gate.
+    :return: DFT.
+    """
+    dft = Dft()
+    layer = []
+    for i in range(width):
+        be = dft_be.BeExponential(dft.next_id(), "BE{}".format(i), 1.0, 1.0, 0.0, (0, 0))
+        dft.add(be)
+        layer.append(be)
+    for depth in range(no_layers):
+        next_layer = []
+        for i in range(width):
+            children = [layer[(i + j) % width] for j in range(fan_in)]
+            gate = dft_gates.DftOr(dft.next_id(), "G{}_{}".format(depth, i), children, (0, 0))
+            dft.add(gate)
+            next_layer.append(gate)
+        layer = next_layer
+    top = dft_gates.DftAnd(dft.next_id(), "Top", layer, (0, 0))
+    dft.add(top)
+    dft.set_top_level_element(top.element_id)
+    return dft
@@ -5,18 +5,20 @@ import logging
 
 import dftlib.io.parser
 from dftlib.analysis.smt import SMTAnalysis
+from dftlib.io.cache import add_cache_argument, cache_from_args
 
 
 def main():
     argument_parser = argparse.ArgumentParser(description="Analyse a DFT via SMT.")
     argument_parser.add_argument("--dft", "-i", help="The path for the dft file", required=True)
+    add_cache_argument(argument_parser)
     argument_parser.add_argument("--out", "-o", help="The path for the resulting smt file", required=True)
     args = argument_parser.parse_args()
 
     logging.basicConfig(format="%(levelname)s: %(message)s", level=logging.INFO)
 
     logging.info("Reading {}".format(args.dft))
-    dft = dftlib.io.parser.parse_dft_file(args.dft)
+    dft = dftlib.io.parser.parse_dft_file(args.dft, cache_from_args(args))
     logging.info(dft)
 
     # Analyse DFT
@@ -6,12 +6,14 @@ import logging
 import dftlib.io.export_json
 import dftlib.io.parser
 import dftlib.transformer.anonymizer
+from dftlib.io.cache import add_cache_argument, cache_from_args
 
 
 def main():
     parser = argparse.ArgumentParser(description="Transform the given DFT into an anonymized DFT.")
 
     parser.add_argument("--dft", help="The path for the dft file", required=True)
+    add_cache_argument(parser)
     parser.add_argument("--out", help="The path for the anonymous dft file in JSON encoding", required=True)
     parser.add_argument("--grid", help="Position the elements in a grid layout", action="store_true")
     args = parser.parse_args()
@@ -20,7 +22,7 @@ def main():
 
     # Read DFT file
     logging.info("Reading {}".format(args.dft))
-    dft = dftlib.io.parser.parse_dft_file(args.dft)
+    dft = dftlib.io.parser.parse_dft_file(args.dft, cache_from_args(args))
     logging.info(dft)
 
     # Make anonymous
@@ -6,12 +6,14 @@ import logging
 import dftlib.io.export_galileo
 import dftlib.io.parser
 import dftlib.transformer.simplifier
+from dftlib.io.cache import add_cache_argument, cache_from_args
 
 
 def main():
     parser = argparse.ArgumentParser(description="Export a DFT into Galileo format.")
 
     parser.add_argument("--dft", "-i", help="The path for the dft file", required=True)
+    add_cache_argument(parser)
     parser.add_argument("--out", "-o", help="The path for the saved dft file in Galileo format", required=True)
     args = parser.parse_args()
 
@@ -19,7 +21,7 @@ def main():
 
     # Read DFT file
     logging.info("Reading {}".format(args.dft))
-    dft = dftlib.io.parser.parse_dft_file(args.dft)
+    dft = dftlib.io.parser.parse_dft_file(args.dft, cache_from_args(args))
     logging.info(dft)
 
     # Save DFT again
@@ -5,12 +5,14 @@ import logging
 
 import dftlib.io.latex
 import dftlib.io.parser
+from dftlib.io.cache import add_cache_argument, cache_from_args
 
 
 def main():
     parser = argparse.ArgumentParser(description="Generate tikz file visualizing the given DFT.")
 
     parser.add_argument("--dft", "-i", help="The path for the dft file", required=True)
+    add_cache_argument(parser)
     parser.add_argument("--out", "-o", help="The path for the generated tikz file", required=True)
     args = parser.parse_args()
 
@@ -18,7 +20,7 @@ def main():
 
     # Read DFT file
     logging.info("Reading {}".format(args.dft))
-    dft = dftlib.io.parser.parse_dft_file(args.dft)
+    dft = dftlib.io.parser.parse_dft_file(args.dft, cache_from_args(args))
     logging.info(dft)
 
     # Generate tikz file
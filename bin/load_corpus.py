@@ -0,0 +1,36 @@
+#!/usr/bin/env python
+
+import argparse
+import logging
+import time
+
+import dftlib.io.corpus
+from dftlib.io.cache import add_cache_argument, cache_from_args
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Parse all DFT files in a directory tree in parallel.")
+
+    parser.add_argument("--dir", "-d", help="The directory containing the dft files", required=True)
+    parser.add_argument("--jobs", "-j", help="Number of worker processes (default: number of CPUs)", type=int, default=None)
+    parser.add_argument("--timeout", "-t", help="Timeout in seconds for parsing a single file", type=float, default=None)
+    add_cache_argument(parser)
+    args = parser.parse_args()
+
+    logging.basicConfig(format="%(levelname)s: %(message)s", level=logging.INFO)
+
+    start = time.perf_counter()
+    no_files, no_errors = 0, 0
+    cache = cache_from_args(args)
+    for result in dftlib.io.corpus.load_corpus(args.dir, workers=args.jobs, timeout=args.timeout, cache=cache):
+        no_files += 1
+        if result.success():
+            logging.info(result)
+        else:
+            no_errors += 1
+            logging.error(result)
+    logging.info("Parsed {} files ({} errors) in {:.3f}s".format(no_files, no_errors, time.perf_counter() - start))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,19 +1,30 @@
 #!/usr/bin/env python
 
 import argparse
+import json
 import logging
 
 import dftlib.io.export_json
 import dftlib.io.parser
 import dftlib.transformer.simplifier as simplifier
+from dftlib.io.cache import add_cache_argument, cache_from_args
 
 
 def main():
     parser = argparse.ArgumentParser(description="Simplify a DFT by rewriting.")
 
     parser.add_argument("--dft", "-i", help="The path for the dft file", required=True)
+    add_cache_argument(parser)
     parser.add_argument("--out", "-o", help="The path for the simplified dft file in JSON encoding", required=True)
     parser.add_argument("--all-rules", "-a", help="Use all rewriting rules", action="store_true")
+    parser.add_argument(
+        "--strategy",
+        help="Strategy for finding applicable rewrites",
+        choices=[strategy.name.lower() for strategy in simplifier.SimplificationStrategy],
+        default="restart",
+    )
+    parser.add_argument("--stats", help="Print statistics of the rewrite rules", action="store_true")
+    parser.add_argument("--stats-json", help="The path for the statistics of the rewrite rules in JSON encoding")
     parser.add_argument("--verbose", "-v", help="print more output", action="store_true")
     args = parser.parse_args()
 
@@ -21,7 +32,7 @@ def main():
 
     # Read DFT file
     logging.info("Reading {}".format(args.dft))
-    dft = dftlib.io.parser.parse_dft_file(args.dft)
+    dft = dftlib.io.parser.parse_dft_file(args.dft, cache_from_args(args))
     logging.info(dft)
 
     # Simplify DFT
@@ -29,7 +40,9 @@ def main():
         rules = simplifier.get_all_rules()
     else:
         rules = simplifier.get_default_rules()
-    simplified = simplifier.simplify_dft_rules(dft, rules)
+    statistics = simplifier.SimplificationStatistics() if args.stats or args.stats_json else None
+    strategy = simplifier.SimplificationStrategy[args.strategy.upper()]
+    simplified = simplifier.simplify_dft_rules(dft, rules, strategy, statistics=statistics)
 
     if simplified:
         logging.info("DFT was simplified")
@@ -37,6 +50,12 @@ def main():
     else:
         logging.info("DFT was not simplified")
 
+    if args.stats:
+        print(statistics)
+    if args.stats_json:
+        with open(args.stats_json, "w") as out_file:
+            json.dump(statistics.get_json(), out_file, indent=2)
+
     # Save DFT again
     dftlib.io.export_json.export_dft_file(dft, args.out)
 
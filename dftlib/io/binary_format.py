@@ -0,0 +1,118 @@
+import struct
+import sys
+from array import array
+
+import dftlib.storage.dft_be as dft_be
+import dftlib.storage.dft_gates as dft_gates
+from dftlib.exceptions.exceptions import DftInvalidArgumentException
+from dftlib.storage.dft_element import DftElement
+
+# Layout of the binary format (all values are little-endian and all sections start at multiples of 8 bytes):
+# - header: magic, version, reserved, number of elements, number of child entries, number of strings, number of parameters, index of top level element
+# - string table: offsets (int64, number of strings + 1) into the following UTF-8 encoded data
+# - element records: one record of fixed width per element (see RECORD)
+# - children in CSR format: child offsets (int64, number of elements + 1) and child indices (int64, number of child entries)
+# The first strings in the string table are the parameters.
+
+MAGIC = b"DFTB"
+VERSION = 1
+
+HEADER = struct.Struct("<4sHHqqqqq")
+# Element record: id, index of name in string table, type code, distribution code (-1 for gates), flags, integer value, 4 values, position
+RECORD = struct.Struct("<qqbbBxi4d2d")
+# Number of value slots in a record
+VALUE_SLOTS = 4
+
+# Flags of element records
+FLAG_RELEVANT = 1
+FLAG_FAILED = 2
+FLAG_INCLUSIVE = 4
+# Flag indicating that value slot i contains the index of a parametric value in the string table (shifted by i)
+FLAG_STRING_VALUE = 16
+# Flags of all value slots containing parametric values
+FLAGS_STRING_VALUES = ((1 << VALUE_SLOTS) - 1) * FLAG_STRING_VALUE
+
+# Attributes stored in the value slots of the record (in this order) for BEs with the given distribution
+BE_VALUES: dict[dft_be.Distribution, tuple[str, ...]] = {
+    dft_be.Distribution.CONSTANT: (),
+    dft_be.Distribution.PROBABILITY: ("probability", "dorm"),
+    dft_be.Distribution.EXPONENTIAL: ("rate", "dorm", "repair"),
+    dft_be.Distribution.ERLANG: ("rate", "dorm"),
+    dft_be.Distribution.WEIBULL: ("shape", "rate"),
+    dft_be.Distribution.LOGNORMAL: ("mean", "stddev"),
+}
+
+
+# Arrays of a DftArray in which the attributes of the value slots are stored
+ATTRIBUTE_ARRAYS: dict[str, str] = {
+    "probability": "probabilities",
+    "dorm": "dorms",
+    "rate": "rates",
+    "repair": "repairs",
+    "shape": "shapes",
+    "mean": "means",
+    "stddev": "stddevs",
+}
+
+
+def value_attributes(element: DftElement) -> tuple[str, ...]:
+    """
+    Get the attributes of the element which are stored in the value slots of its record.
+    :param element: Element.
+    :return: Attribute names in the order of the value slots.
+    """
+    if isinstance(element, dft_be.DftBe):
+        return BE_VALUES[element.distribution]
+    elif isinstance(element, dft_gates.DftDependency):
+        return ("probability",)
+    else:
+        return ()
+
+
+def integer_attribute(element: DftElement) -> str | None:
+    """
+    Get the attribute of the element which is stored as integer value in its record.
+    :param element: Element.
+    :return: Attribute name or None if the element has no such attribute.
+    """
+    if isinstance(element, dft_be.BeErlang):
+        return "phases"
+    elif isinstance(element, dft_gates.DftVotingGate):
+        return "voting_threshold"
+    else:
+        return None
+
+
+def padding(size: int) -> int:
+    """
+    Get number of bytes needed to extend the given size to a multiple of 8.
+    :param size: Size in bytes.
+    :return: Number of padding bytes.
+    """
+    return -size % 8
+
+
+def to_little_endian(values: array) -> array:
+    """
+    Convert array between native and little-endian byte order.
+    The array is changed in place.
+    :param values: Array.
+    :return: The given array.
+    """
+    if sys.byteorder != "little":
+        values.byteswap()
+    return values
+
+
+def check_header(header: tuple) -> None:
+    """
+    Check that the header is valid.
+    :param header: Unpacked header.
+    """
+    magic, version, _, elements, children, strings, parameters, top_level = header
+    if magic != MAGIC:
+        raise DftInvalidArgumentException("File does not contain a DFT in binary format.")
+    if version > VERSION:
+        raise DftInvalidArgumentException("Version {} of binary format is not supported.".format(version))
+    if min(elements, children, strings, parameters) < 0 or parameters > strings or not 0 <= top_level < elements:
+        raise DftInvalidArgumentException("Header of binary format is invalid.")
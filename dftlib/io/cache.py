@@ -0,0 +1,176 @@
+import argparse
+import hashlib
+import os
+import tempfile
+
+import dftlib
+import dftlib.io.binary_format as binary_format
+import dftlib.io.export_binary as export_binary
+import dftlib.io.formats as formats
+import dftlib.io.parser as parser
+from dftlib.exceptions.exceptions import DftInvalidArgumentException
+from dftlib.storage.dft import Dft
+
+# File extension of cache entries
+CACHE_EXTENSION = ".dftb"
+
+
+class DftCache:
+    """
+    On-disk cache of parsed DFTs.
+    Entries are stored in the binary format and are keyed by the hash of the file content, the file format and the versions of dftlib and the binary format.
+    The total size of all entries is bounded; if it is exceeded, the least recently used entries are removed.
+    The cache can be used by multiple processes at the same time: entries are written to a temporary file first and then atomically renamed.
+    """
+
+    def __init__(self, directory: str, max_size: int = 1 << 30) -> None:
+        """
+        Create cache in the given directory.
+        :param directory: Cache directory. It is created if it does not exist.
+        :param max_size: Maximal size of all entries in bytes.
+        """
+        if max_size < 0:
+            raise DftInvalidArgumentException("Maximal cache size {} must not be negative.".format(max_size))
+        self.directory = directory
+        self.max_size = max_size
+        os.makedirs(directory, exist_ok=True)
+
+    def key(self, file: str) -> str:
+        """
+        Get key of the cache entry for the given file.
+        :param file: File.
+        :return: Key.
+        """
+        content_hash = hashlib.sha256()
+        with open(file, "rb") as in_file:
+            for chunk in iter(lambda: in_file.read(1 << 20), b""):
+                content_hash.update(chunk)
+        # Files with the same content but different formats are parsed differently
+        file_format = formats.detect_format(file)
+        content_hash.update("|{}|{}|{}".format(file_format.name, dftlib.__version__, binary_format.VERSION).encode("utf-8"))
+        return content_hash.hexdigest()
+
+    def entry(self, key: str) -> str:
+        """
+        Get path of the cache entry with the given key.
+        :param key: Key.
+        :return: Path of the entry.
+        """
+        return os.path.join(self.directory, key + CACHE_EXTENSION)
+
+    def parse_dft_file(self, file: str) -> Dft:
+        """
+        Parse DFT from file.
+        If the file was parsed before, the DFT is loaded from the cache instead.
+        Entries which cannot be loaded are treated as missing: they are removed and the file is parsed again.
+        :param file: File.
+        :return: DFT.
+        """
+        entry = self.entry(self.key(file))
+        try:
+            dft = parser.parse_dft_binary_file(entry)
+        except FileNotFoundError:
+            # Not cached (or removed concurrently)
+            pass
+        except Exception:
+            # Entry is corrupted, e.g., truncated or with damaged records
+            self._remove(entry)
+        else:
+            try:
+                # Mark entry as recently used
+                os.utime(entry)
+            except FileNotFoundError:
+                pass
+            return dft
+
+        dft = parser.parse_dft_file(file)
+        self._store(dft, entry)
+        return dft
+
+    def _store(self, dft: Dft, entry: str) -> None:
+        """
+        Store DFT as cache entry and remove the least recently used entries if the cache is too large.
+        :param dft: DFT.
+        :param entry: Path of the entry.
+        """
+        handle, tmp_file = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(handle, "wb") as out_file:
+                export_binary.export_dft_stream(dft, out_file)
+            os.replace(tmp_file, entry)
+        except BaseException:
+            self._remove(tmp_file)
+            raise
+        self.evict()
+
+    def size(self) -> int:
+        """
+        Get total size of all cache entries.
+        :return: Size in bytes.
+        """
+        return sum(size for _, size, _ in self._entries())
+
+    def evict(self) -> None:
+        """
+        Remove the least recently used entries until the total size is within the maximal size.
+        """
+        entries = sorted(self._entries(), key=lambda entry: entry[2])
+        total = sum(size for _, size, _ in entries)
+        for path, size, _ in entries:
+            if total <= self.max_size:
+                break
+            self._remove(path)
+            total -= size
+
+    def clear(self) -> None:
+        """
+        Remove all cache entries.
+        """
+        for path, _, _ in self._entries():
+            self._remove(path)
+
+    def _entries(self) -> list[tuple[str, int, float]]:
+        """
+        Get all cache entries.
+        :return: List of path, size and time of last use for each entry.
+        """
+        entries = []
+        with os.scandir(self.directory) as it:
+            for dir_entry in it:
+                if dir_entry.name.endswith(CACHE_EXTENSION):
+                    try:
+                        stat = dir_entry.stat()
+                    except FileNotFoundError:
+                        # Removed concurrently
+                        continue
+                    entries.append((dir_entry.path, stat.st_size, stat.st_mtime))
+        return entries
+
+    @staticmethod
+    def _remove(path: str) -> None:
+        """
+        Remove file if it still exists.
+        :param path: File.
+        """
+        try:
+            os.remove(path)
+        except OSError:
+            # Removed concurrently or still in use by another process
+            pass
+
+
+def add_cache_argument(parser: argparse.ArgumentParser) -> None:
+    """
+    Add command line argument for the cache directory.
+    :param parser: Argument parser.
+    """
+    parser.add_argument("--cache", help="Directory for caching parsed DFTs")
+
+
+def cache_from_args(args: argparse.Namespace) -> DftCache | None:
+    """
+    Get cache given by the command line arguments.
+    :param args: Parsed arguments containing the argument added by add_cache_argument().
+    :return: Cache or None if no cache directory was given.
+    """
+    return DftCache(args.cache) if args.cache else None
@@ -0,0 +1,143 @@
+import os
+import signal
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from typing import Iterator
+
+import dftlib.io.formats as formats
+import dftlib.io.parser as parser
+from dftlib.exceptions.exceptions import DftInvalidArgumentException
+
+
+class CorpusResult:
+    """
+    Result of parsing a single file of a corpus.
+    """
+
+    def __init__(self, file: str, statistics: tuple[int, int, int, int] | None, duration: float, error: str | None) -> None:
+        """
+        Constructor.
+        :param file: File.
+        :param statistics: Statistics of the parsed DFT as given by Dft.statistics(). None if parsing failed.
+        :param duration: Time for parsing in seconds.
+        :param error: Error message. None if parsing succeeded.
+        """
+        self.file = file
+        self.statistics = statistics
+        self.duration = duration
+        self.error = error
+
+    def success(self) -> bool:
+        """
+        Return whether the file was parsed successfully.
+        :return: True iff no error occurred.
+        """
+        return self.error is None
+
+    def __str__(self) -> str:
+        if self.success():
+            no_be, no_static, no_dynamic, no_elements = self.statistics
+            return "{}: {} elements ({} BEs, {} static elements, {} dynamic elements) in {:.3f}s".format(
+                self.file, no_elements, no_be, no_static, no_dynamic, self.duration
+            )
+        else:
+            return "{}: error after {:.3f}s: {}".format(self.file, self.duration, self.error)
+
+
+class _Timeout(Exception):
+    """
+    Exception when parsing a file exceeds the timeout.
+    """
+
+
+def _raise_timeout(signum, frame) -> None:
+    raise _Timeout()
+
+
+def find_dft_files(directory: str) -> list[str]:
+    """
+    Find all DFT files in the directory tree.
+    Files are recognized by their extension (possibly followed by an extension for compression).
+    :param directory: Directory.
+    :return: Sorted list of files.
+    """
+    if not os.path.isdir(directory):
+        raise DftInvalidArgumentException("Directory '{}' does not exist.".format(directory))
+    files = []
+    for root, _, names in os.walk(directory):
+        for name in names:
+            if formats.get_format(name) is not None:
+                files.append(os.path.join(root, name))
+    return sorted(files)
+
+
+def parse_corpus_file(file: str, timeout: float | None = None, cache: "dftlib.io.cache.DftCache | None" = None) -> CorpusResult:
+    """
+    Parse a single file of a corpus.
+    Errors are not raised but reported in the result.
+    :param file: File.
+    :param timeout: Timeout in seconds. The timeout is only supported on platforms providing SIGALRM and is ignored otherwise.
+    :param cache: Cache of parsed DFTs.
+    :return: Result.
+    """
+    use_timer = timeout is not None and hasattr(signal, "setitimer")
+    if use_timer:
+        previous_handler = signal.signal(signal.SIGALRM, _raise_timeout)
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+    start = time.perf_counter()
+    try:
+        statistics = parser.parse_dft_file(file, cache).statistics()
+        error = None
+    except _Timeout:
+        statistics = None
+        error = "Timeout of {}s exceeded".format(timeout)
+    except Exception as e:
+        statistics = None
+        error = "{}: {}".format(type(e).__name__, e)
+    finally:
+        if use_timer:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, previous_handler)
+    return CorpusResult(file, statistics, time.perf_counter() - start, error)
+
+
+def load_corpus(
+    directory: str,
+    workers: int | None = None,
+    timeout: float | None = None,
+    max_in_flight: int | None = None,
+    cache: "dftlib.io.cache.DftCache | None" = None,
+) -> Iterator[CorpusResult]:
+    """
+    Parse all DFT files in the directory tree with a pool of worker processes.
+    The results are yielded as soon as they are available, i.e., not necessarily in the order of the files.
+    :param directory: Directory.
+    :param workers: Number of worker processes. Defaults to the number of CPUs.
+    :param timeout: Timeout in seconds for parsing a single file (see parse_corpus_file()).
+    :param max_in_flight: Maximal number of files submitted to the workers at the same time. Defaults to twice the number of workers.
+    :param cache: Cache of parsed DFTs.
+    :return: Iterator over the results for all files.
+    """
+    files = find_dft_files(directory)
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if max_in_flight is None:
+        max_in_flight = 2 * workers
+    if workers < 1 or max_in_flight < 1:
+        raise DftInvalidArgumentException("Number of workers and files in flight must be positive.")
+
+    remaining = iter(files)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        in_flight: set[Future] = set()
+        while True:
+            # Keep the number of submitted files bounded
+            while len(in_flight) < max_in_flight:
+                file = next(remaining, None)
+                if file is None:
+                    break
+                in_flight.add(executor.submit(parse_corpus_file, file, timeout, cache))
+            if not in_flight:
+                break
+            done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
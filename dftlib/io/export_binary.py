@@ -0,0 +1,103 @@
+from array import array
+from typing import BinaryIO
+
+import dftlib.io.binary_format as binary_format
+import dftlib.io.formats as formats
+import dftlib.storage.dft_be as dft_be
+import dftlib.storage.dft_gates as dft_gates
+from dftlib.storage.dft import Dft
+from dftlib.storage.dft_array import DISTRIBUTION_CODES, TYPE_CODES
+
+
+def export_dft_file(dft: Dft, file: str) -> None:
+    """
+    Export DFT to file in binary format.
+    The file is compressed if its extension is '.gz', '.xz' or '.bz2'.
+    :param dft: DFT.
+    :param file: File.
+    """
+    with formats.open_file(file, "wb") as out_file:
+        export_dft_stream(dft, out_file)
+
+
+def export_dft_stream(dft: Dft, stream: BinaryIO) -> None:
+    """
+    Write DFT in binary format to a binary stream.
+    Elements are stored in the order of the DFT and refer to their children by this order.
+    :param dft: DFT.
+    :param stream: Binary stream.
+    """
+    elements = list(dft.elements.values())
+    index = {element.element_id: i for i, element in enumerate(elements)}
+    # Mapping from string to its index in the string table
+    strings: dict[str, int] = dict()
+    if dft.parametric():
+        for parameter in dft.parameters:
+            strings.setdefault(parameter, len(strings))
+    parameters = len(strings)
+
+    record_size = binary_format.RECORD.size
+    records = bytearray(record_size * len(elements))
+    child_offsets = array("q", [0])
+    child_indices = array("q")
+    for i, element in enumerate(elements):
+        name = strings.setdefault(element.name, len(strings))
+        flags = binary_format.FLAG_RELEVANT if element.relevant else 0
+        if isinstance(element, dft_be.BeConstant) and element.failed:
+            flags |= binary_format.FLAG_FAILED
+        elif isinstance(element, dft_gates.DftPriorityGate) and element.inclusive:
+            flags |= binary_format.FLAG_INCLUSIVE
+
+        values = [0.0] * binary_format.VALUE_SLOTS
+        for slot, attribute in enumerate(binary_format.value_attributes(element)):
+            value = getattr(element, attribute)
+            if isinstance(value, str):
+                # Parametric value is stored in string table
+                flags |= binary_format.FLAG_STRING_VALUE << slot
+                value = strings.setdefault(value, len(strings))
+            values[slot] = value
+        attribute = binary_format.integer_attribute(element)
+        integer = 0 if attribute is None else getattr(element, attribute)
+        distribution = DISTRIBUTION_CODES[element.distribution] if element.is_be() else -1
+
+        binary_format.RECORD.pack_into(
+            records,
+            i * record_size,
+            element.element_id,
+            name,
+            TYPE_CODES[element.element_type],
+            distribution,
+            flags,
+            integer,
+            *values,
+            *element.position,
+        )
+        if element.is_gate():
+            child_indices.extend(index[child.element_id] for child in element.children())
+        child_offsets.append(len(child_indices))
+
+    # String table
+    encoded = [string.encode("utf-8") for string in strings]
+    string_offsets = array("q", [0])
+    for data in encoded:
+        string_offsets.append(string_offsets[-1] + len(data))
+    string_size = string_offsets[-1]
+
+    stream.write(
+        binary_format.HEADER.pack(
+            binary_format.MAGIC,
+            binary_format.VERSION,
+            0,
+            len(elements),
+            len(child_indices),
+            len(strings),
+            parameters,
+            index[dft.top_level_element.element_id],
+        )
+    )
+    stream.write(binary_format.to_little_endian(string_offsets).tobytes())
+    stream.writelines(encoded)
+    stream.write(bytes(binary_format.padding(string_size)))
+    stream.write(records)
+    stream.write(binary_format.to_little_endian(child_offsets).tobytes())
+    stream.write(binary_format.to_little_endian(child_indices).tobytes())
@@ -1,8 +1,9 @@
+import dftlib.io.formats as formats
 from dftlib.storage.dft import Dft
 from dftlib.storage.dft_element import DftElement
 import dftlib.storage.dft_be as dft_be
 import dftlib.storage.dft_gates as dft_gates
-from dftlib.exceptions.exceptions import DftTypeNotKnownException, DftInvalidArgumentException
+from dftlib.exceptions.exceptions import DftTypeNotKnownException
 import dftlib.utility.numbers as numbers
 
 
@@ -18,21 +19,15 @@ def galileo_name(element: DftElement) -> str:
 def export_dft_file(dft: Dft, file: str) -> None:
     """
     Export DFT to Galileo file.
+    The file is compressed if its extension is '.gz', '.xz' or '.bz2'.
     :param dft: DFT.
     :param file: File.
     """
     # Sort topological to ensure that elements are defined before occurring as children
     elements = dft.topological_sort()
 
-    # Assert unique names
-    names = dict()
-    for element in elements:
-        if element.name in names:
-            raise DftInvalidArgumentException("Element name '{}' used twice.".format(element.name))
-        names[element.name] = element
-
     # Write file
-    with open(file, "w") as out_file:
+    with formats.open_file(file, "w") as out_file:
         # Parameters
         if dft.parametric():
             assert dft.parameters is not None
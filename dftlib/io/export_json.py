@@ -1,16 +1,58 @@
 import json
+from typing import TextIO
 
+import dftlib.io.formats as formats
 from dftlib.storage.dft import Dft
 
 
-def export_dft_file(dft: Dft, file: str) -> None:
+def export_dft_file(dft: Dft, file: str, compact: bool = False) -> None:
     """
     Export DFT to JSON file.
+    The elements are written one after another without building the JSON object for the complete DFT.
+    The file is compressed if its extension is '.gz', '.xz' or '.bz2'.
     :param dft: DFT.
     :param file: File.
+    :param compact: Whether the JSON is written without indentation and whitespace. Otherwise, an indentation of 4 is used.
     """
-    with open(file, "w") as outFile:
-        json.dump(dft.json(), outFile, indent=4)
+    with formats.open_file(file, "w") as outFile:
+        export_dft_stream(dft, outFile, indent=None if compact else 4)
+
+
+def export_dft_stream(dft: Dft, stream: TextIO, indent: int | None = None) -> None:
+    """
+    Write DFT in JSON format to a text stream.
+    The elements are encoded and written one after another.
+    The output is identical to json.dump(dft.json(), stream, indent=indent) if an indentation is given and otherwise contains no whitespace.
+    :param dft: DFT.
+    :param stream: Text stream.
+    :param indent: Indentation level. If None, the compact format is used.
+    """
+    if indent is None:
+        encoder = json.JSONEncoder(separators=(",", ":"))
+        newline, inner, separator = "", "", ":"
+    else:
+        encoder = json.JSONEncoder(indent=indent)
+        newline, inner, separator = "\n", " " * indent, ": "
+    element_indent = newline + inner * 2
+
+    data = dict()
+    data["toplevel"] = str(dft.top_level_element.element_id)
+    if dft.parametric():
+        data["parameters"] = dft.parameters
+    stream.write("{")
+    for key, value in data.items():
+        value_string = encoder.encode(value).replace("\n", newline + inner)
+        stream.write("{}{}{}{}{},".format(newline, inner, encoder.encode(key), separator, value_string))
+    stream.write("{}{}{}{}[".format(newline, inner, encoder.encode("nodes"), separator))
+    first = True
+    for element in dft.elements.values():
+        if not first:
+            stream.write(",")
+        first = False
+        stream.write(element_indent + encoder.encode(element.get_json()).replace("\n", element_indent))
+    if not first:
+        stream.write(newline + inner)
+    stream.write("]" + newline + "}")
 
 
 def export_dft_string(dft: Dft, indent: int | None = None):
@@ -1,64 +1,83 @@
+import dftlib.io.formats as formats
 from dftlib.storage.dft import Dft
 import dftlib.storage.dft_gates as dft_gates
 from dftlib.exceptions.exceptions import DftInvalidArgumentException, DftTypeNotSupportedException
-from dftlib.storage.dft_element import DftElement
 
 
 def export_dft_string(dft: Dft) -> str:
     """
     Export DFT as textual description.
+    Gates which occur more than once are exported only once as named definition of the form 'G0 = OR(BE0,BE1)' and afterward referenced by their name.
+    Definitions and the description of the top level element are separated by ';'.
+    The size of the description is therefore linear in the size of the DFT.
     :param dft: DFT.
     :return: DFT as textual description.
     """
-    exported_elements = dict()
-    next_be_id = 0
+    assert dft.top_level_element is not None
+    top = dft.top_level_element
 
-    def export_element_string(element: DftElement) -> str:
-        """
-        Export DFT element (and its subtree) as string.
-        The method recursively exports the children.
-        :param element: Element.
-        :return: Textual description of element and its subtree.
-        """
-        # Access to variables in parent scope
-        nonlocal exported_elements
-        nonlocal next_be_id
+    # Count how often each gate occurs as a child of a gate reachable from the top level element
+    occurrences = dict()
+    visited = {top.element_id}
+    stack = [top]
+    while stack:
+        element = stack.pop()
+        if element.is_gate():
+            for child in element.children():
+                occurrences[child.element_id] = occurrences.get(child.element_id, 0) + 1
+                if child.element_id not in visited:
+                    visited.add(child.element_id)
+                    stack.append(child)
 
-        if element.element_id in exported_elements:
-            # Element was already exported before -> use existing textual description
-            return exported_elements[element.element_id]
-        else:
-            if element.is_be():
+    # Textual description of exported elements (or their names for shared gates)
+    exported_elements = dict()
+    definitions = []
+    next_be_id = 0
+    if top.is_be():
+        exported_elements[top.element_id] = "BE0"
+        next_be_id = 1
+    # Export gates in post-order while preserving the order of children
+    stack = [(top, iter(top.children()))] if top.is_gate() else []
+    while stack:
+        element, successors = stack[-1]
+        for child in successors:
+            if child.element_id in exported_elements:
+                continue
+            if child.is_be():
                 # Export BE by id
-                s = "BE{}".format(next_be_id)
+                exported_elements[child.element_id] = "BE{}".format(next_be_id)
                 next_be_id += 1
             else:
-                assert element.is_gate()
-                assert isinstance(element, dft_gates.DftGate)
-                # Recursively export children of gate
-                child_strings = []
-                for child in element.children():
-                    child_strings.append(export_element_string(child))
-                if not (isinstance(element, dft_gates.DftAnd) or isinstance(element, dft_gates.DftOr)):
-                    raise DftTypeNotSupportedException("DFT element {} of type {} not supported in export.".format(element, element.element_type))
-                s = element.element_type.upper() + "(" + ",".join(child_strings) + ")"
+                # Export children of gate first
+                stack.append((child, iter(child.children())))
+                break
+        else:
+            # All children are exported
+            stack.pop()
+            assert isinstance(element, dft_gates.DftGate)
+            if not (isinstance(element, dft_gates.DftAnd) or isinstance(element, dft_gates.DftOr)):
+                raise DftTypeNotSupportedException("DFT element {} of type {} not supported in export.".format(element, element.element_type))
+            s = element.element_type.upper() + "(" + ",".join(exported_elements[child.element_id] for child in element.children()) + ")"
+            if occurrences.get(element.element_id, 0) > 1:
+                # Define shared gate once and refer to it by name
+                name = "G{}".format(len(definitions))
+                definitions.append("{} = {}".format(name, s))
+                s = name
             exported_elements[element.element_id] = s
-            return s
 
-    assert dft.top_level_element is not None
-    dft_string = export_element_string(dft.top_level_element)
     assert next_be_id == dft.number_of_be()
-    return dft_string
+    return "; ".join(definitions + [exported_elements[top.element_id]])
 
 
 def export_dft_file(dft: Dft, file: str) -> None:
     """
     Export DFT to textual format in file.
+    The file is compressed if its extension is '.gz', '.xz' or '.bz2'.
     :param dft: DFT.
     :param file: File.
     """
     # Write file
-    with open(file, "w") as out_file:
+    with formats.open_file(file, "w") as out_file:
         # Parameters
         if dft.parametric():
             raise DftInvalidArgumentException("Parameters are not supported in export.")
@@ -1,7 +1,22 @@
+import bz2
+import gzip
+import lzma
+import re
 from enum import Enum
+from typing import IO
 
+import dftlib.io.binary_format as binary_format
 from dftlib.exceptions.exceptions import DftInvalidArgumentException
 
+# Modules for (de)compressing files by their file extension
+_COMPRESSIONS = {".gz": gzip, ".xz": lzma, ".bz2": bz2}
+# Magic bytes at the start of compressed files
+_COMPRESSION_MAGIC = [(b"\x1f\x8b", gzip), (b"\xfd7zXZ\x00", lzma), (b"BZh", bz2)]
+# Number of bytes used to detect the format of a file
+_SNIFF_SIZE = 4096
+# Keywords of the Galileo format which occur at the start of a statement
+_GALILEO_KEYWORD = re.compile(rb"(^|;)\s*(toplevel|param)\s", re.MULTILINE)
+
 
 class DftFormats(Enum):
     """
@@ -12,6 +27,7 @@ class DftFormats(Enum):
     JSON = 1
     SAFEST = 2
     TEXT = 3
+    BINARY = 4
 
 
 def get_file_extension(file_format: DftFormats) -> str:
@@ -28,6 +44,8 @@ def get_file_extension(file_format: DftFormats) -> str:
         return ".safest"
     elif file_format == DftFormats.TEXT:
         return ".txt"
+    elif file_format == DftFormats.BINARY:
+        return ".dftb"
     else:
         raise DftInvalidArgumentException("DFT format {} not known.".format(file_format))
 
@@ -38,7 +56,7 @@ def is_galileo_file(file: str) -> bool:
     :param file: File.
     :return: True iff the file is a Galileo file.
     """
-    return file.endswith(get_file_extension(DftFormats.GALILEO))
+    return get_format(file) == DftFormats.GALILEO
 
 
 def is_json_file(file: str) -> bool:
@@ -47,7 +65,7 @@ def is_json_file(file: str) -> bool:
     :param file: File.
     :return: True iff the file is a JSON file.
     """
-    return file.endswith(get_file_extension(DftFormats.JSON))
+    return get_format(file) == DftFormats.JSON
 
 
 def is_text_file(file: str) -> bool:
@@ -56,4 +74,108 @@ def is_text_file(file: str) -> bool:
     :param file: File.
     :return: True iff the file is a text file.
     """
-    return file.endswith(get_file_extension(DftFormats.TEXT))
+    return get_format(file) == DftFormats.TEXT
+
+
+def is_binary_file(file: str) -> bool:
+    """
+    Checks whether the given file is a DFT in the binary format.
+    :param file: File.
+    :return: True iff the file is a binary file.
+    """
+    return get_format(file) == DftFormats.BINARY
+
+
+def get_format(file: str) -> DftFormats | None:
+    """
+    Get format of the file according to its file extension.
+    An extension for compression (such as '.gz' or '.xz') is ignored.
+    :param file: File.
+    :return: DFT format or None if the extension is not known.
+    """
+    file = strip_compression_extension(file)
+    for file_format in [DftFormats.GALILEO, DftFormats.JSON, DftFormats.TEXT, DftFormats.BINARY]:
+        if file.endswith(get_file_extension(file_format)):
+            return file_format
+    return None
+
+
+def detect_format(file: str) -> DftFormats:
+    """
+    Detect format of the file.
+    The format is obtained from the file extension if possible and otherwise from the first bytes of the (decompressed) file content.
+    :param file: File.
+    :return: DFT format.
+    """
+    file_format = get_format(file)
+    if file_format is not None:
+        return file_format
+    with open_file(file, "rb") as in_file:
+        start = in_file.read(_SNIFF_SIZE)
+    if start.startswith(binary_format.MAGIC):
+        return DftFormats.BINARY
+    elif start.lstrip().startswith(b"{"):
+        return DftFormats.JSON
+    elif _GALILEO_KEYWORD.search(start):
+        return DftFormats.GALILEO
+    else:
+        return DftFormats.TEXT
+
+
+def strip_compression_extension(file: str) -> str:
+    """
+    Remove the file extension for compression (such as '.gz' or '.xz') if present.
+    :param file: File.
+    :return: File without extension for compression.
+    """
+    for extension in _COMPRESSIONS:
+        if file.endswith(extension):
+            return file[: -len(extension)]
+    return file
+
+
+def _compression(file: str, mode: str):
+    """
+    Get module for (de)compressing the file.
+    When writing, the compression is given by the file extension. When reading, the first bytes of the file are used as well.
+    :param file: File.
+    :param mode: Mode for opening the file.
+    :return: Module for compression or None if the file is not compressed.
+    """
+    for extension, module in _COMPRESSIONS.items():
+        if file.endswith(extension):
+            return module
+    if "r" in mode:
+        with open(file, "rb") as in_file:
+            start = in_file.read(6)
+        for magic, module in _COMPRESSION_MAGIC:
+            if start.startswith(magic):
+                return module
+    return None
+
+
+def is_compressed(file: str) -> bool:
+    """
+    Checks whether the given file is compressed.
+    :param file: File.
+    :return: True iff the file is compressed (according to its file extension or its content).
+    """
+    return _compression(file, "r") is not None
+
+
+def open_file(file: str, mode: str = "r") -> IO:
+    """
+    Open file for reading or writing.
+    Compressed files (gzip, xz or bzip2) are transparently decompressed while reading and compressed while writing.
+    The compression is determined by the file extension and, when reading, by the first bytes of the file.
+    :param file: File.
+    :param mode: Mode as for open(), i.e., 'r', 'w', 'rb' or 'wb'.
+    :return: File object.
+    """
+    module = _compression(file, mode)
+    if module is None:
+        return open(file, mode)
+    elif "b" in mode:
+        return module.open(file, mode)
+    else:
+        return module.open(file, mode + "t")
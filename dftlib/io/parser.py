@@ -1,23 +1,254 @@
+import itertools
 import json
+import mmap
+import os
+import re
+import sys
+from array import array
+from typing import Callable, Iterable, Iterator, TextIO
 
+import dftlib.io.binary_format as binary_format
 import dftlib.io.formats as formats
-import dftlib.tools.stormpy as stormpy
+import dftlib.storage.dft_be as dft_be
+import dftlib.storage.dft_gates as dft_gates
+import dftlib.utility.numbers as numbers
 from dftlib.exceptions.exceptions import DftInvalidArgumentException, DftTypeNotKnownException
 from dftlib.storage.dft import Dft
-from dftlib.storage.dft_element import DftElement
+from dftlib.storage.dft_array import ARRAY_NAMES, DISTRIBUTIONS, TYPES, DftArray
+from dftlib.storage.dft_element import DftElement, ElementType
 from dftlib.storage.dft_be import BeExponential
 from dftlib.storage.dft_gates import DftAnd, DftOr
 
+# Tokens in the Galileo format: quoted names, line comments, start of block comments, statement ends and other words
+_GALILEO_TOKEN = re.compile(r'"[^"]*"|//.*|/\*|;|[^\s";]+')
+# Voting gates of the form 'vot3' or '3of5'
+_GALILEO_VOTING = re.compile(r"vot(\d+)|(\d+)of\d+")
+# Tokens in the text format: brackets, separators, definitions and names (possibly surrounded by whitespace)
+_TXT_TOKEN = re.compile(r"[(),;=]|[^(),;=]+")
+
 
 def parse_dft_galileo_file(file: str) -> Dft:
     """
     Parse DFT from Galileo file.
+    The file is read line by line.
     :param file: File.
     :return: DFT.
     """
-    # Generate JSON format by converting from Galileo file
-    json_obj = stormpy.convert_to_json(file)
-    return parse_dft_json(json.loads(json_obj))
+    with formats.open_file(file) as galileo_file:
+        return _parse_galileo_lines(galileo_file)
+
+
+def parse_dft_galileo_string(galileo_string: str) -> Dft:
+    """
+    Parse DFT from string in Galileo format.
+    :param galileo_string: String in Galileo format.
+    :return: DFT.
+    """
+    return _parse_galileo_lines(galileo_string.splitlines())
+
+
+def _tokenize_galileo(lines: Iterable[str]) -> Iterator[str]:
+    """
+    Split lines in Galileo format into tokens.
+    Comments are skipped.
+    :param lines: Lines.
+    :return: Iterator over tokens. Names keep their quotation marks.
+    """
+    in_comment = False
+    for line in lines:
+        position = 0
+        while position < len(line):
+            if in_comment:
+                # Skip until end of block comment
+                end = line.find("*/", position)
+                if end < 0:
+                    break
+                position = end + 2
+                in_comment = False
+            match = _GALILEO_TOKEN.search(line, position)
+            if match is None:
+                break
+            token = match.group()
+            position = match.end()
+            if token.startswith("//"):
+                break
+            elif token == "/*":
+                in_comment = True
+            else:
+                yield token
+    if in_comment:
+        raise DftInvalidArgumentException("Block comment is not closed.")
+
+
+def _galileo_name(token: str) -> str:
+    """
+    Get name from token by removing the quotation marks.
+    :param token: Token.
+    :return: Name.
+    """
+    if len(token) >= 2 and token[0] == '"' and token[-1] == '"':
+        return token[1:-1]
+    return token
+
+
+def _parse_galileo_lines(lines: Iterable[str]) -> Dft:
+    """
+    Parse DFT from lines in Galileo format in a single pass.
+    Children can be used before they are defined and are linked after all elements are known.
+    :param lines: Lines.
+    :return: DFT.
+    """
+    dft = Dft()
+    top_level_name = None
+    # Gates together with the names of their children
+    gates = []
+    statement = []
+    for token in _tokenize_galileo(lines):
+        if token != ";":
+            statement.append(token)
+            continue
+        if not statement:
+            # Empty statement
+            continue
+        if statement[0] == "param":
+            if len(statement) != 2:
+                raise DftInvalidArgumentException("Invalid parameter definition: {}".format(" ".join(statement)))
+            if dft.parameters is None:
+                dft.parameters = []
+            assert statement[1] not in dft.parameters
+            dft.parameters.append(statement[1])
+        elif statement[0] == "toplevel":
+            if len(statement) != 2:
+                raise DftInvalidArgumentException("Invalid top level definition: {}".format(" ".join(statement)))
+            top_level_name = _galileo_name(statement[1])
+        else:
+            if len(statement) < 2:
+                raise DftInvalidArgumentException("Element '{}' has no type.".format(_galileo_name(statement[0])))
+            name = _galileo_name(statement[0])
+            if "=" in statement[1] and not statement[1].startswith("pdep="):
+                dft.add(_create_galileo_be(dft.next_id(), name, statement[1:], dft.parameters))
+            else:
+                gate = _create_galileo_gate(dft.next_id(), name, statement[1], dft.parameters)
+                dft.add(gate)
+                gates.append((gate, statement[2:]))
+        statement = []
+    if statement:
+        raise DftInvalidArgumentException("Missing ';' after '{}'.".format(" ".join(statement)))
+
+    # Set children
+    for gate, children in gates:
+        for child in children:
+            gate.add_child(dft.get_element_by_name(_galileo_name(child)))
+
+    # Set top level element
+    if top_level_name is None:
+        raise DftInvalidArgumentException("Top level element not defined")
+    top_level_element = dft.get_element_by_name(top_level_name)
+
+    # Number elements bottom-up such that children have smaller ids than their parents
+    labels = dict()
+    visited = set()
+    for root in [top_level_element] + list(dft.elements.values()):
+        if root.element_id in visited:
+            continue
+        visited.add(root.element_id)
+        stack = [(root, iter(root.children() if root.is_gate() else []))]
+        while stack:
+            element, successors = stack[-1]
+            for child in successors:
+                if child.element_id not in visited:
+                    visited.add(child.element_id)
+                    stack.append((child, iter(child.children() if child.is_gate() else [])))
+                    break
+            else:
+                stack.pop()
+                labels[element.element_id] = (len(labels), element.name)
+    dft.relabel(labels)
+    dft.set_top_level_element(top_level_element.element_id)
+    dft.check_valid()
+    return dft
+
+
+def _create_galileo_gate(element_id: int, name: str, gate_type: str, parameters: list[str] | None) -> dft_gates.DftGate:
+    """
+    Create gate from the type given in Galileo format.
+    :param element_id: Id.
+    :param name: Name.
+    :param gate_type: Gate type in Galileo format.
+    :param parameters: Parameters which are defined. Used for parsing parametric values.
+    :return: Gate without children.
+    """
+    gate_type = gate_type.lower()
+    position = (0, 0)
+    if gate_type == "and":
+        return dft_gates.DftAnd(element_id, name, [], position)
+    elif gate_type == "or":
+        return dft_gates.DftOr(element_id, name, [], position)
+    elif gate_type in ["pand", "pand-incl", "pand-inc"]:
+        return dft_gates.DftPand(element_id, name, True, [], position)
+    elif gate_type == "pand-excl":
+        return dft_gates.DftPand(element_id, name, False, [], position)
+    elif gate_type in ["por", "por-incl", "por-inc"]:
+        return dft_gates.DftPor(element_id, name, True, [], position)
+    elif gate_type == "por-excl":
+        return dft_gates.DftPor(element_id, name, False, [], position)
+    elif gate_type in ["wsp", "csp", "hsp", "spare"]:
+        return dft_gates.DftSpare(element_id, name, [], position)
+    elif gate_type == "fdep":
+        return dft_gates.DftDependency(element_id, name, 1, [], position)
+    elif gate_type.startswith("pdep="):
+        probability = numbers.parse_number(gate_type[len("pdep=") :], parameters)
+        return dft_gates.DftDependency(element_id, name, probability, [], position)
+    elif gate_type == "seq":
+        return dft_gates.DftSeq(element_id, name, [], position)
+    elif gate_type == "mutex":
+        return dft_gates.DftMutex(element_id, name, [], position)
+    match = _GALILEO_VOTING.fullmatch(gate_type)
+    if match:
+        threshold = int(match.group(1) if match.group(1) is not None else match.group(2))
+        return dft_gates.DftVotingGate(element_id, name, threshold, [], position)
+    raise DftTypeNotKnownException("Gate type '{}' not known.".format(gate_type))
+
+
+def _create_galileo_be(element_id: int, name: str, attributes: list[str], parameters: list[str] | None) -> dft_be.DftBe:
+    """
+    Create BE from its attributes given in Galileo format.
+    :param element_id: Id.
+    :param name: Name.
+    :param attributes: Attributes of the form 'key=value'.
+    :param parameters: Parameters which are defined. Used for parsing parametric values.
+    :return: BE.
+    """
+    values = dict()
+    for attribute in attributes:
+        key, separator, value = attribute.partition("=")
+        if not separator:
+            raise DftInvalidArgumentException("Attribute '{}' of BE '{}' has no value.".format(attribute, name))
+        values[key.lower()] = value
+    keys = set(values.keys())
+    position = (0, 0)
+
+    def number(key: str, default: float | None = None) -> float | str:
+        if key not in values:
+            if default is None:
+                raise DftInvalidArgumentException("Attribute '{}' of BE '{}' is missing.".format(key, name))
+            return default
+        return numbers.parse_number(values[key], parameters)
+
+    if "prob" in keys and keys <= {"prob", "dorm"}:
+        probability = number("prob")
+        if "dorm" not in keys and (numbers.is_one(probability) or numbers.is_zero(probability)):
+            return dft_be.BeConstant(element_id, name, numbers.is_one(probability), position)
+        return dft_be.BeProbability(element_id, name, probability, number("dorm", 1.0), position)
+    elif "lambda" in keys and "phases" in keys and keys <= {"lambda", "phases", "dorm"}:
+        return dft_be.BeErlang(element_id, name, number("lambda"), int(values["phases"]), number("dorm", 1.0), position)
+    elif "lambda" in keys and keys <= {"lambda", "dorm", "repair"}:
+        return dft_be.BeExponential(element_id, name, number("lambda"), number("dorm", 1.0), number("repair", 0.0), position)
+    elif "shape" in keys and keys <= {"shape", "rate"}:
+        return dft_be.BeWeibull(element_id, name, number("shape"), number("rate"), position)
+    elif "mean" in keys and keys <= {"mean", "stddev"}:
+        return dft_be.BeLognormal(element_id, name, number("mean"), number("stddev"), position)
+    raise DftTypeNotKnownException("BE '{}' with attributes {} not known.".format(name, ", ".join(attributes)))
 
 
 def parse_dft_json(json_obj: dict) -> Dft:
@@ -32,12 +263,189 @@ def parse_dft_json(json_obj: dict) -> Dft:
 def parse_dft_json_file(file: str) -> Dft:
     """
     Parse DFT from JSON file.
+    The file is read incrementally and each node is turned into an element directly after it was decoded.
+    The JSON object of the complete DFT is never created.
     :param file: File.
     :return: DFT.
     """
-    with open(file) as json_file:
-        json_obj = json.load(json_file)
-    return parse_dft_json(json_obj)
+    with formats.open_file(file) as json_file:
+        return parse_dft_json_stream(json_file)
+
+
+def parse_dft_json_stream(stream: TextIO) -> Dft:
+    """
+    Parse DFT from text stream in JSON format.
+    Nodes are decoded one after another and children are linked via their ids after all nodes are known.
+    If parametric values occur before the parameters are defined, the remaining nodes are kept until the parameters are known.
+    :param stream: Text stream.
+    :return: DFT.
+    """
+    reader = _JsonStreamReader(stream)
+    dft = Dft()
+    top_level_id = None
+    # Gates together with the ids of their children
+    gates = []
+    # Nodes which can only be parsed after the parameters are known (None if all nodes could be parsed directly)
+    deferred = None
+
+    def add_node(node: dict) -> None:
+        element_type = node["data"]["type"]
+        if element_type == "compound":
+            # Compound nodes are ignored
+            return
+        elif element_type == "be" or element_type == "be_exp":
+            dft.add(dft_be.create_from_json(node, dft.parameters))
+        else:
+            gate = dft_gates.create_from_json(node, dft.parameters)
+            dft.add(gate)
+            gates.append((gate, [int(child_id) for child_id in node["data"]["children"]]))
+
+    reader.expect("{")
+    if reader.peek() == "}":
+        raise DftInvalidArgumentException("Top level element not defined")
+    while True:
+        key = reader.decode()
+        reader.expect(":")
+        if key == "nodes":
+            reader.expect("[")
+            if reader.peek() == "]":
+                reader.expect("]")
+            else:
+                while True:
+                    node = reader.decode()
+                    if deferred is not None:
+                        deferred.append(node)
+                    else:
+                        try:
+                            add_node(node)
+                        except ValueError:
+                            if dft.parameters is not None:
+                                raise
+                            # Value might be parametric
+                            deferred = [node]
+                    if reader.next_separator("]"):
+                        break
+        elif key == "parameters":
+            parameters = reader.decode()
+            if len(parameters) > 0:
+                dft.parameters = []
+                for param in parameters:
+                    assert param not in dft.parameters
+                    dft.parameters.append(param)
+        elif key == "toplevel":
+            top_level_id = int(reader.decode())
+        else:
+            # Other entries are ignored
+            reader.decode()
+        if reader.next_separator("}"):
+            break
+    reader.expect_end()
+    if deferred is not None:
+        for node in deferred:
+            add_node(node)
+
+    # Set children
+    for gate, children in gates:
+        for child_id in children:
+            gate.add_child(dft.get_element(child_id))
+
+    # Set top level element
+    if top_level_id is None or top_level_id < 0:
+        raise DftInvalidArgumentException("Top level element not defined")
+    dft.set_top_level_element(top_level_id)
+    dft.check_valid()
+    return dft
+
+
+class _JsonStreamReader:
+    """
+    Reader for decoding a JSON text stream value by value.
+    Only the part of the stream which is not decoded yet is kept in memory.
+    """
+
+    def __init__(self, stream: TextIO, chunk_size: int = 1 << 16) -> None:
+        self._stream = stream
+        self._chunk_size = chunk_size
+        self._decoder = json.JSONDecoder()
+        self._buffer = ""
+        self._position = 0
+        self._eof = False
+
+    def _read(self) -> bool:
+        """
+        Append the next chunk of the stream to the buffer.
+        :return: False iff the end of the stream was reached before.
+        """
+        if self._eof:
+            return False
+        chunk = self._stream.read(self._chunk_size)
+        if not chunk:
+            self._eof = True
+            return False
+        # Drop decoded part of the buffer
+        self._buffer = self._buffer[self._position :] + chunk
+        self._position = 0
+        return True
+
+    def peek(self) -> str:
+        """
+        Skip whitespace and get the next character without consuming it.
+        :return: Next character or empty string at the end of the stream.
+        """
+        while True:
+            while self._position < len(self._buffer) and self._buffer[self._position] in " \t\n\r":
+                self._position += 1
+            if self._position < len(self._buffer):
+                return self._buffer[self._position]
+            if not self._read():
+                return ""
+
+    def expect(self, character: str) -> None:
+        """
+        Consume the given character after skipping whitespace.
+        :param character: Expected character.
+        """
+        if self.peek() != character:
+            raise DftInvalidArgumentException("Invalid JSON: expected '{}' at position {}.".format(character, self._position))
+        self._position += 1
+
+    def expect_end(self) -> None:
+        """
+        Check that only whitespace is left in the stream.
+        """
+        if self.peek() != "":
+            raise DftInvalidArgumentException("Invalid JSON: unexpected data after end of object.")
+
+    def next_separator(self, closing: str) -> bool:
+        """
+        Consume either a ',' or the given closing bracket.
+        :param closing: Closing bracket of the current object or array.
+        :return: True iff the closing bracket was consumed.
+        """
+        if self.peek() == closing:
+            self._position += 1
+            return True
+        self.expect(",")
+        return False
+
+    def decode(self):
+        """
+        Decode the next JSON value.
+        :return: Value.
+        """
+        self.peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._position)
+            except json.JSONDecodeError:
+                # Value might be incomplete
+                if self._read():
+                    continue
+                raise
+            if end < len(self._buffer) or not self._read():
+                # Value is complete as further characters follow (numbers could otherwise be truncated)
+                self._position = end
+                return value
 
 
 def parse_dft_json_string(json_string: str) -> Dft:
@@ -52,98 +460,464 @@ def parse_dft_json_string(json_string: str) -> Dft:
 def parse_dft_txt_string(dft_text: str) -> Dft:
     """
     Parse DFT from string containing textual description.
+    The description has the form 'AND(OR(A,B),C)'. Supported gates are AND, OR, VOTk (with threshold k), PAND, POR, SPARE, FDEP, SEQ and MUTEX.
+    Elements which are not gates are BEs. BEs with the same name are identified.
+    Shared elements can be defined before the top level element with statements of the form 'G = OR(A,B);' and referenced afterward by their name.
     :param dft_text: Textual description of DFT.
     :return: DFT.
     """
+    dft = Dft()
+    # Elements defined by name
+    definitions = dict()
+    # Gates whose children are currently parsed
+    stack = []
+    top_event = None
+    # Name of definition and element of the current statement
+    definition = None
+    statement_element = None
+    # Name or gate type which was read last and is not processed yet
+    word = None
+    # Whether an element is required next (at the beginning and after '(', ',' or '=')
+    expect_element = True
 
-    def parse_dft_element_txt(dft: Dft, element_text: str) -> DftElement:
-        """
-        Parse DFT element from string containing textual description.
-        :param dft: DFT containing all previously parsed elements.
-        :param element_text: Textual description of DFT element.
-        :return: DFT element.
-        """
-        s = element_text.strip()
-        pos_opening = s.find("(")
-        if pos_opening >= 0:
-            # Current level describes a gate
-            assert s[-1] == ")"
-            gate_type = s[:pos_opening].lower()
-            children_text = s[pos_opening + 1 : -1]
-            if gate_type == "and":
-                gate = DftAnd(dft.next_id(), "And_{}".format(dft.next_id()), [], (0, 0))
-            elif gate_type == "or":
-                gate = DftOr(dft.next_id(), "Or_{}".format(dft.next_id()), [], (0, 0))
-            else:
-                raise DftTypeNotKnownException("Gate type '{}' not known.".format(gate_type))
+    def add_element(element: DftElement) -> None:
+        nonlocal statement_element
+        if stack:
+            stack[-1].add_child(element)
+        elif statement_element is None:
+            statement_element = element
+        else:
+            raise DftInvalidArgumentException("Statement contains more than one element.")
+
+    def add_word(name: str) -> None:
+        # Complete word is either the name of a definition or the name of a BE
+        if name in definitions:
+            element = definitions[name]
+        elif dft.has_name(name):
+            element = dft.get_element_by_name(name)
+        else:
+            element = BeExponential(dft.next_id(), name, 1, 1, 0, (0, 0))
+            dft.add(element)
+        add_element(element)
+
+    # The end of the text also ends the last statement
+    for token, position in itertools.chain(((match.group().strip(), match.start()) for match in _TXT_TOKEN.finditer(dft_text)), [(";", len(dft_text))]):
+        if not token:
+            # Only whitespace
+            continue
+        if token == "(":
+            if word is None:
+                raise DftInvalidArgumentException("Gate type missing before '(' at position {}.".format(position))
+            gate = _create_txt_gate(dft, word)
             dft.add(gate)
-            # Find splitting points for children
-            brackets = 0
-            i = 0
-            while i < len(children_text):
-                if children_text[i] == "(":
-                    brackets += 1
-                elif children_text[i] == ")":
-                    assert brackets > 0
-                    brackets -= 1
-                elif children_text[i] == "," and brackets == 0:
-                    # Can split
-                    child_text = children_text[:i]
-                    child_element = parse_dft_element_txt(dft, child_text)
-                    gate.add_child(child_element)
-                    # Keep text for remaining children
-                    children_text = children_text[i + 1 :]
-                    i = -1  # To account for += 1
-                i += 1
-            # Handle last child
-            child_element = parse_dft_element_txt(dft, children_text)
-            gate.add_child(child_element)
-            return gate
+            add_element(gate)
+            stack.append(gate)
+            word = None
+            expect_element = True
+        elif token == "," or token == ")":
+            if word is not None:
+                add_word(word)
+                word = None
+            elif expect_element:
+                raise DftInvalidArgumentException("Element missing before '{}' at position {}.".format(token, position))
+            if not stack:
+                raise DftInvalidArgumentException("Unexpected '{}' at position {}.".format(token, position))
+            if token == ")":
+                stack.pop()
+                expect_element = False
+            else:
+                expect_element = True
+        elif token == "=":
+            if word is None or stack or statement_element is not None or definition is not None:
+                raise DftInvalidArgumentException("Unexpected '=' at position {}.".format(position))
+            if word in definitions or dft.has_name(word):
+                raise DftInvalidArgumentException("Name '{}' defined twice.".format(word))
+            definition = word
+            word = None
+            expect_element = True
+        elif token == ";":
+            if word is not None:
+                add_word(word)
+                word = None
+            if stack:
+                raise DftInvalidArgumentException("Missing ')' before position {}.".format(position))
+            if definition is not None:
+                if statement_element is None:
+                    raise DftInvalidArgumentException("Definition of '{}' is empty.".format(definition))
+                definitions[definition] = statement_element
+            elif statement_element is not None:
+                if top_event is not None:
+                    raise DftInvalidArgumentException("Text contains more than one top level element.")
+                top_event = statement_element
+            definition = None
+            statement_element = None
+            expect_element = True
         else:
-            # Complete string is name of BE
-            # Check whether BE already exists
-            try:
-                element = dft.get_element_by_name(s)
-            except DftInvalidArgumentException:
-                # BE does not exist
-                element = None
-            if not element:
-                # Create new BE
-                element = BeExponential(dft.next_id(), s, 1, 1, 0, (0, 0))
-                dft.add(element)
-            return element
+            if not expect_element:
+                raise DftInvalidArgumentException("Separator missing before '{}' at position {}.".format(token, position))
+            word = token
+            expect_element = False
 
-    dft = Dft()
-    top_event = parse_dft_element_txt(dft, dft_text)
+    if top_event is None:
+        raise DftInvalidArgumentException("Text contains no top level element.")
     dft.set_top_level_element(top_event.element_id)
+    dft.check_valid()
     return dft
 
 
+def _create_txt_gate(dft: Dft, gate_type: str) -> dft_gates.DftGate:
+    """
+    Create gate for the given type in the text format.
+    :param dft: DFT to which the gate will be added. Used for generating the id and the name.
+    :param gate_type: Gate type in text format.
+    :return: Gate without children.
+    """
+    gate_type = gate_type.lower()
+    element_id = dft.next_id()
+    position = (0, 0)
+
+    def name(prefix: str) -> str:
+        return dft.get_unique_name("{}_{}".format(prefix, element_id))
+
+    if gate_type == "and":
+        return DftAnd(element_id, name("And"), [], position)
+    elif gate_type == "or":
+        return DftOr(element_id, name("Or"), [], position)
+    elif gate_type == "pand":
+        return dft_gates.DftPand(element_id, name("Pand"), True, [], position)
+    elif gate_type == "por":
+        return dft_gates.DftPor(element_id, name("Por"), True, [], position)
+    elif gate_type == "spare":
+        return dft_gates.DftSpare(element_id, name("Spare"), [], position)
+    elif gate_type == "fdep":
+        return dft_gates.DftDependency(element_id, name("Fdep"), 1, [], position)
+    elif gate_type == "seq":
+        return dft_gates.DftSeq(element_id, name("Seq"), [], position)
+    elif gate_type == "mutex":
+        return dft_gates.DftMutex(element_id, name("Mutex"), [], position)
+    elif gate_type.startswith("vot") and gate_type[3:].isdigit():
+        return dft_gates.DftVotingGate(element_id, name("Vot"), int(gate_type[3:]), [], position)
+    raise DftTypeNotKnownException("Gate type '{}' not known.".format(gate_type))
+
+
 def parse_dft_txt_file(file: str) -> Dft:
     """
     Parse DFT from textual description in file.
     :param file: File.
     :return: DFT.
     """
-    with open(file) as txtFile:
+    with formats.open_file(file) as txtFile:
         lines = txtFile.readlines()
         assert len(lines) > 0
         text = lines[0]
     return parse_dft_txt_string(text)
 
 
-def parse_dft_file(file: str) -> Dft:
+def parse_dft_binary_file(file: str) -> Dft:
+    """
+    Parse DFT from file in binary format.
+    Uncompressed files are memory-mapped and the elements are created from their records one after another.
+    :param file: File.
+    :return: DFT.
+    """
+    return _read_binary_file(file, _create_binary_dft)
+
+
+def load_dft_array_binary_file(file: str) -> DftArray:
+    """
+    Load array snapshot of DFT from file in binary format.
+    The arrays are filled directly from the memory-mapped file (or the decompressed content) without creating any elements.
+    The result is the same as parse_dft_binary_file(file).freeze().
+    :param file: File.
+    :return: Array snapshot of DFT.
+    """
+    return _read_binary_file(file, _create_binary_array)
+
+
+def _read_binary_file(file: str, create: Callable):
+    """
+    Read the sections of a file in binary format and create the result from them.
+    Uncompressed files are memory-mapped and the sections are views into the mapping without copying.
+    Compressed files are decompressed into memory.
+    :param file: File.
+    :param create: Function which gets the strings, the number of parameters, the element records, the child offsets, the child indices and the index
+        of the top level element. The result must not refer to the given sections.
+    :return: Result of create.
+    """
+    if formats.is_compressed(file):
+        with formats.open_file(file, "rb") as binary_file:
+            data = binary_file.read()
+        return create(*_read_binary_sections(data))
+
+    with open(file, "rb") as binary_file:
+        if os.fstat(binary_file.fileno()).st_size < binary_format.HEADER.size:
+            raise DftInvalidArgumentException("File does not contain a DFT in binary format.")
+        data = mmap.mmap(binary_file.fileno(), 0, access=mmap.ACCESS_READ)
+        sections = None
+        try:
+            sections = _read_binary_sections(data)
+            return create(*sections)
+        finally:
+            # Release the views before the mapping is closed
+            del sections
+            try:
+                data.close()
+            except BufferError:
+                # After an error, the traceback can still refer to views; the mapping is closed once they are freed
+                pass
+
+
+def _read_binary_sections(data: bytes | mmap.mmap) -> tuple:
+    """
+    Read the sections of the binary format.
+    The records and the integer sections are views into the given data.
+    :param data: Content of the file.
+    :return: Tuple of the strings, the number of parameters, the element records, the child offsets, the child indices and the index of the top level
+        element.
+    """
+    size = len(data)
+    if size < binary_format.HEADER.size:
+        raise DftInvalidArgumentException("File does not contain a DFT in binary format.")
+    header = binary_format.HEADER.unpack_from(data, 0)
+    binary_format.check_header(header)
+    _, _, _, number_elements, number_children, number_strings, number_parameters, top_level = header
+    position = binary_format.HEADER.size
+    view = memoryview(data)
+
+    def section(length: int) -> memoryview:
+        nonlocal position
+        if position + length > size:
+            raise DftInvalidArgumentException("File in binary format is truncated.")
+        result = view[position : position + length]
+        position += length + binary_format.padding(length)
+        return result
+
+    def int_array(length: int) -> memoryview | array:
+        values = section(8 * length)
+        if sys.byteorder == "little":
+            return values.cast("q")
+        # Values must be converted on big-endian platforms
+        converted = array("q")
+        converted.frombytes(values)
+        return binary_format.to_little_endian(converted)
+
+    string_offsets = int_array(number_strings + 1)
+    string_data = section(string_offsets[-1])
+    strings = [str(string_data[start:end], "utf-8") for start, end in itertools.pairwise(string_offsets)]
+    records = section(binary_format.RECORD.size * number_elements)
+    child_offsets = int_array(number_elements + 1)
+    child_indices = int_array(number_children)
+    if position != size:
+        raise DftInvalidArgumentException("File in binary format contains unexpected data.")
+    if child_offsets[0] != 0 or child_offsets[-1] != number_children:
+        raise DftInvalidArgumentException("Children in binary format are invalid.")
+    if number_children > 0 and (min(child_indices) < 0 or max(child_indices) >= number_elements):
+        raise DftInvalidArgumentException("Children in binary format are invalid.")
+    return strings, number_parameters, records, child_offsets, child_indices, top_level
+
+
+def _create_binary_dft(
+    strings: list[str], number_parameters: int, records: memoryview, child_offsets: memoryview | array, child_indices: memoryview | array, top_level: int
+) -> Dft:
+    """
+    Create DFT from the sections of a file in binary format.
+    :param strings: String table.
+    :param number_parameters: Number of parameters at the beginning of the string table.
+    :param records: Element records.
+    :param child_offsets: Child offsets.
+    :param child_indices: Child indices.
+    :param top_level: Index of top level element.
+    :return: DFT.
+    """
+    dft = Dft()
+    if number_parameters > 0:
+        dft.parameters = strings[:number_parameters]
+    elements = []
+    for record in binary_format.RECORD.iter_unpack(records):
+        element = _create_binary_element(record, strings)
+        dft.add(element)
+        elements.append(element)
+
+    # Set children
+    for i, element in enumerate(elements):
+        start, end = child_offsets[i], child_offsets[i + 1]
+        if start < end and not element.is_gate():
+            raise DftInvalidArgumentException("Element {} is not a gate and cannot have children.".format(element))
+        for child in child_indices[start:end]:
+            element.add_child(elements[child])
+
+    dft.set_top_level_element(elements[top_level].element_id)
+    dft.check_valid()
+    return dft
+
+
+def _create_binary_element(record: tuple, strings: list[str]) -> DftElement:
+    """
+    Create element from record in binary format.
+    :param record: Unpacked element record.
+    :param strings: String table.
+    :return: Element without children.
+    """
+    element_id, name, type_code, distribution, flags, integer, *values, x, y = record
+    if flags & binary_format.FLAGS_STRING_VALUES:
+        values = [strings[int(value)] if flags & (binary_format.FLAG_STRING_VALUE << slot) else value for slot, value in enumerate(values)]
+    position = (int(x) if x.is_integer() else x, int(y) if y.is_integer() else y)
+    name = strings[name]
+    if not 0 <= type_code < len(TYPES):
+        raise DftTypeNotKnownException("Type code {} not known.".format(type_code))
+    element_type = TYPES[type_code]
+
+    if element_type == ElementType.BE:
+        if not 0 <= distribution < len(DISTRIBUTIONS):
+            raise DftTypeNotKnownException("Distribution code {} not known.".format(distribution))
+        distribution = DISTRIBUTIONS[distribution]
+        if distribution == dft_be.Distribution.CONSTANT:
+            element = dft_be.BeConstant(element_id, name, bool(flags & binary_format.FLAG_FAILED), position)
+        elif distribution == dft_be.Distribution.PROBABILITY:
+            element = dft_be.BeProbability(element_id, name, values[0], values[1], position)
+        elif distribution == dft_be.Distribution.EXPONENTIAL:
+            element = dft_be.BeExponential(element_id, name, values[0], values[1], values[2], position)
+        elif distribution == dft_be.Distribution.ERLANG:
+            element = dft_be.BeErlang(element_id, name, values[0], integer, values[1], position)
+        elif distribution == dft_be.Distribution.WEIBULL:
+            element = dft_be.BeWeibull(element_id, name, values[0], values[1], position)
+        else:
+            assert distribution == dft_be.Distribution.LOGNORMAL
+            element = dft_be.BeLognormal(element_id, name, values[0], values[1], position)
+    elif element_type == ElementType.AND:
+        element = dft_gates.DftAnd(element_id, name, [], position)
+    elif element_type == ElementType.OR:
+        element = dft_gates.DftOr(element_id, name, [], position)
+    elif element_type == ElementType.VOT:
+        element = dft_gates.DftVotingGate(element_id, name, integer, [], position)
+    elif element_type == ElementType.PAND:
+        element = dft_gates.DftPand(element_id, name, bool(flags & binary_format.FLAG_INCLUSIVE), [], position)
+    elif element_type == ElementType.POR:
+        element = dft_gates.DftPor(element_id, name, bool(flags & binary_format.FLAG_INCLUSIVE), [], position)
+    elif element_type == ElementType.SPARE:
+        element = dft_gates.DftSpare(element_id, name, [], position)
+    elif element_type == ElementType.FDEP:
+        element = dft_gates.DftDependency(element_id, name, 1, [], position)
+    elif element_type == ElementType.PDEP:
+        element = dft_gates.DftDependency(element_id, name, values[0], [], position)
+    elif element_type == ElementType.SEQ:
+        element = dft_gates.DftSeq(element_id, name, [], position)
+    else:
+        assert element_type == ElementType.MUTEX
+        element = dft_gates.DftMutex(element_id, name, [], position)
+    element.relevant = bool(flags & binary_format.FLAG_RELEVANT)
+    return element
+
+
+def _create_binary_array(
+    strings: list[str], number_parameters: int, records: memoryview, child_offsets: memoryview | array, child_indices: memoryview | array, top_level: int
+) -> DftArray:
+    """
+    Create array snapshot from the sections of a file in binary format.
+    :param strings: String table.
+    :param number_parameters: Number of parameters at the beginning of the string table.
+    :param records: Element records.
+    :param child_offsets: Child offsets.
+    :param child_indices: Child indices.
+    :param top_level: Index of top level element.
+    :return: Array snapshot.
+    """
+    # The snapshot keeps the children, so they are copied out of the file
+    child_offsets, child_indices = array("q", child_offsets), array("q", child_indices)
+    nan = float("nan")
+    n = len(child_offsets) - 1
+    arrays = {name: array("d", [nan]) * n for name in binary_format.ATTRIBUTE_ARRAYS.values()}
+    ids = array("q", [0]) * n
+    types = array("b", [0]) * n
+    relevant = array("b", [0]) * n
+    distributions = array("b", [-1]) * n
+    phases = array("q", [0]) * n
+    failed = array("b", [0]) * n
+    thresholds = array("q", [0]) * n
+    inclusive = array("b", [0]) * n
+    names = []
+    # Arrays of the value slots for each BE distribution
+    be_arrays = [tuple(arrays[binary_format.ATTRIBUTE_ARRAYS[attribute]] for attribute in binary_format.BE_VALUES[d]) for d in DISTRIBUTIONS]
+    dependency_arrays = (arrays["probabilities"],)
+    be_code, vot_code, fdep_code, pdep_code = (TYPES.index(t) for t in (ElementType.BE, ElementType.VOT, ElementType.FDEP, ElementType.PDEP))
+    priority_codes = (TYPES.index(ElementType.PAND), TYPES.index(ElementType.POR))
+    for i, record in enumerate(binary_format.RECORD.iter_unpack(records)):
+        element_id, name, type_code, distribution, flags, integer = record[:6]
+        if flags & binary_format.FLAGS_STRING_VALUES:
+            raise DftInvalidArgumentException("Parametric value of element {} cannot be stored in array.".format(strings[name]))
+        if not 0 <= type_code < len(TYPES):
+            raise DftTypeNotKnownException("Type code {} not known.".format(type_code))
+        ids[i] = element_id
+        names.append(strings[name])
+        types[i] = type_code
+        relevant[i] = flags & binary_format.FLAG_RELEVANT
+        if type_code == be_code:
+            if not 0 <= distribution < len(DISTRIBUTIONS):
+                raise DftTypeNotKnownException("Distribution code {} not known.".format(distribution))
+            distributions[i] = distribution
+            slots = be_arrays[distribution]
+            failed[i] = bool(flags & binary_format.FLAG_FAILED)
+            if DISTRIBUTIONS[distribution] == dft_be.Distribution.ERLANG:
+                phases[i] = integer
+        else:
+            slots = dependency_arrays if type_code == fdep_code or type_code == pdep_code else ()
+            if type_code == vot_code:
+                thresholds[i] = integer
+            elif type_code in priority_codes:
+                inclusive[i] = bool(flags & binary_format.FLAG_INCLUSIVE)
+        for values, value in zip(slots, record[6:]):
+            values[i] = value
+
+    # Parents are obtained by transposing the children
+    parent_offsets = array("q", [0]) * (n + 1)
+    for child in child_indices:
+        parent_offsets[child + 1] += 1
+    for i in range(n):
+        parent_offsets[i + 1] += parent_offsets[i]
+    parent_indices = array("q", [0]) * len(child_indices)
+    next_position = parent_offsets[:-1]
+    for i in range(n):
+        for child in child_indices[child_offsets[i] : child_offsets[i + 1]]:
+            parent_indices[next_position[child]] = i
+            next_position[child] += 1
+
+    arrays.update(
+        ids=ids,
+        types=types,
+        child_offsets=child_offsets,
+        child_indices=child_indices,
+        parent_offsets=parent_offsets,
+        parent_indices=parent_indices,
+        relevant=relevant,
+        distributions=distributions,
+        phases=phases,
+        failed=failed,
+        thresholds=thresholds,
+        inclusive=inclusive,
+    )
+    return DftArray.from_arrays(tuple(names), top_level, {name: arrays[name] for name in ARRAY_NAMES})
+
+
+def parse_dft_file(file: str, cache: "dftlib.io.cache.DftCache | None" = None) -> Dft:
     """
     Parse DFT from file.
-    The file can have the following formats: Galileo, JSON, Text.
+    The file can have the following formats: Galileo, JSON, Text, Binary.
+    The format is given by the file extension or otherwise detected from the file content.
+    Files compressed with gzip, xz or bzip2 are decompressed while reading.
     :param file: File.
+    :param cache: Cache of parsed DFTs. If given, the DFT is only parsed if it is not contained in the cache yet.
     :return: DFT.
     """
-    if formats.is_galileo_file(file):
+    if cache is not None:
+        return cache.parse_dft_file(file)
+    file_format = formats.detect_format(file)
+    if file_format == formats.DftFormats.GALILEO:
         return parse_dft_galileo_file(file)
-    elif formats.is_json_file(file):
+    elif file_format == formats.DftFormats.JSON:
         return parse_dft_json_file(file)
-    elif formats.is_text_file(file):
+    elif file_format == formats.DftFormats.TEXT:
         return parse_dft_txt_file(file)
+    elif file_format == formats.DftFormats.BINARY:
+        return parse_dft_binary_file(file)
     else:
         raise DftInvalidArgumentException("File type of '{}' not known.".format(file))
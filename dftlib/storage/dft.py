@@ -1,9 +1,14 @@
+import hashlib
 from collections import deque
+from typing import Iterator
 
 import dftlib.storage.dft_be as dft_be
 import dftlib.storage.dft_gates as dft_gates
 from dftlib.exceptions.exceptions import DftInvalidArgumentException
-from dftlib.storage.dft_element import DftElement
+from dftlib.storage.dft_ancestors import AncestorIndex
+from dftlib.storage.dft_array import DftArray
+from dftlib.storage.dft_element import DftElement, ElementType
+from dftlib.storage.dft_modules import DftModules
 
 
 class Dft:
@@ -16,7 +21,27 @@ class Dft:
         self.position_bounds: tuple[float, float, float, float] = (0, 0, 0, 0)  # Left, Top, Right, Bottom
         self.top_level_element: DftElement = None
         self.elements: dict = dict()
+        # Mapping from name to element
+        self._names: dict[str, DftElement] = dict()
+        # Mapping from element type to elements of this type
+        self._elements_by_type: dict[ElementType, dict[int, DftElement]] = {element_type: dict() for element_type in ElementType}
         self.parameters: list[str] = None
+        # Ids of elements changed since change tracking was started (None if tracking is disabled)
+        self._touched: set[int] | None = None
+        # Ids of elements changed since the last incremental validation (None if incremental validation is disabled)
+        self._dirty: set[int] | None = None
+        # Cached structural hashes of elements
+        self._hashes: dict[int, int] = dict()
+        # Cached modules (None if the DFT changed since they were computed)
+        self._modules: DftModules | None = None
+        # Ancestor indices by their class, kept up-to-date when elements change
+        self._ancestor_indices: dict[type, AncestorIndex] = dict()
+        # Whether new edges are checked for cycles when they are added
+        self._incremental_cycle_check: bool = False
+        # Journal of changes as pairs (undo function, arguments) while a transaction is open (None otherwise)
+        self._journal: list[tuple] | None = None
+        # Journal lengths at the open checkpoints
+        self._checkpoints: list[int] = []
         # Parse json
         if json:
             self.from_json(json)
@@ -104,18 +129,125 @@ class Dft:
         :param name: Name.
         :return: Element.
         """
-        for element in self.elements.values():
-            if name == element.name:
-                return element
-        raise DftInvalidArgumentException("Element {} not known.".format(name))
+        if name not in self._names:
+            raise DftInvalidArgumentException("Element {} not known.".format(name))
+        return self._names[name]
+
+    def has_name(self, name: str) -> bool:
+        """
+        Check whether an element with the given name exists.
+        :param name: Name.
+        :return: True iff an element with this name exists.
+        """
+        return name in self._names
+
+    def get_unique_name(self, name: str) -> str:
+        """
+        Get a name which is not used by any element yet.
+        :param name: Preferred name.
+        :return: The preferred name if it is unused, otherwise the preferred name with an additional numeric suffix.
+        """
+        if name not in self._names:
+            return name
+        i = 1
+        while "{}_{}".format(name, i) in self._names:
+            i += 1
+        return "{}_{}".format(name, i)
+
+    def update_name(self, element: DftElement, name: str) -> None:
+        """
+        Update the name lookup when an element is renamed.
+        This method is called automatically when setting the name of an element.
+        :param element: Element which is renamed.
+        :param name: New name.
+        """
+        if name in self._names and self._names[name] is not element:
+            raise DftInvalidArgumentException("Element name '{}' used twice.".format(name))
+        if self._journal is not None:
+            self._journal.append((self._undo_rename, (element, element.name)))
+        if self._names.get(element.name) is element:
+            del self._names[element.name]
+        self._names[name] = element
+
+    def _undo_rename(self, element: DftElement, name: str) -> None:
+        """
+        Revert renaming of an element.
+        :param element: Renamed element.
+        :param name: Previous name.
+        """
+        if self._names.get(element.name) is element:
+            del self._names[element.name]
+        self._names[name] = element
+        element._name = name
+
+    def relabel(self, labels: dict[int, tuple[int, str]]) -> None:
+        """
+        Change ids and names of elements.
+        All changes are performed at once, i.e., new labels can be labels which are currently used by other elements.
+        :param labels: Mapping from current element id to tuple (new id, new name). Elements not contained keep their labels.
+        """
+        new_elements = dict()
+        new_names = dict()
+        for element_id, element in self.elements.items():
+            new_id, new_name = labels.get(element_id, (element_id, element.name))
+            if new_id in new_elements:
+                raise DftInvalidArgumentException("Element id {} used twice.".format(new_id))
+            if new_name in new_names:
+                raise DftInvalidArgumentException("Element name '{}' used twice.".format(new_name))
+            new_elements[new_id] = element
+            new_names[new_name] = element
+        if self._journal is not None:
+            inverse = {labels[element_id][0]: (element_id, self.elements[element_id].name) for element_id in labels}
+            self._journal.append((self._undo_relabel, (inverse, self.max_id)))
+        # Apply changes
+        for element_id, (new_id, new_name) in labels.items():
+            element = self.elements[element_id]
+            element.element_id = new_id
+            element._name = new_name
+        self.elements = new_elements
+        self._names = new_names
+        self._elements_by_type = {element_type: dict() for element_type in ElementType}
+        for element_id, element in self.elements.items():
+            self._elements_by_type[element.element_type][element_id] = element
+        self.max_id = max(self.elements.keys(), default=-1)
+        # Structural hashes do not depend on ids
+        self._hashes = {labels[element_id][0] if element_id in labels else element_id: value for element_id, value in self._hashes.items()}
+        self._modules = None
+        self._clear_ancestor_indices()
+
+    def _undo_relabel(self, labels: dict[int, tuple[int, str]], max_id: int) -> None:
+        """
+        Revert relabeling of elements.
+        :param labels: Mapping from new element id to tuple (previous id, previous name).
+        :param max_id: Previous maximal id.
+        """
+        self.relabel(labels)
+        self.max_id = max_id
 
     def set_top_level_element(self, element_id: int) -> None:
         """
         Set top level element.
         :param element_id: Id.
         """
-        self.top_level_element = self.get_element(element_id)
+        element = self.get_element(element_id)
+        if self._journal is not None:
+            self._journal.append((self._undo_set_top_level_element, (self.top_level_element, element, element.relevant)))
+        self.top_level_element = element
         self.top_level_element.set_relevant(True)
+        self._modules = None
+        self._clear_ancestor_indices()
+
+    def _undo_set_top_level_element(self, previous: DftElement | None, element: DftElement, relevant: bool) -> None:
+        """
+        Revert setting of the top level element.
+        :param previous: Previous top level element.
+        :param element: Top level element which was set.
+        :param relevant: Previous relevance of the element which was set.
+        """
+        element.set_relevant(relevant)
+        self.top_level_element = previous
+        self._modules = None
+        self._clear_ancestor_indices()
 
     def add(self, element: DftElement) -> None:
         """
@@ -124,9 +256,36 @@ class Dft:
         """
         assert isinstance(element, DftElement)
         assert element.element_id not in self.elements
+        if element.name in self._names:
+            raise DftInvalidArgumentException("Element name '{}' used twice.".format(element.name))
+        if self._journal is not None:
+            self._journal.append((self._undo_add, (element, self.max_id, self.position_bounds)))
         self.elements[element.element_id] = element
+        self._names[element.name] = element
+        self._elements_by_type[element.element_type][element.element_id] = element
         self.max_id = max(self.max_id, element.element_id)
         self.update_bounds(element)
+        element._dft = self
+        self.mark_changed(element)
+        if element.is_gate():
+            # Children have a new parent
+            for child in element.children():
+                self.mark_changed(child)
+
+    def _undo_add(self, element: DftElement, max_id: int, position_bounds: tuple[float, float, float, float]) -> None:
+        """
+        Revert adding of an element.
+        :param element: Added element.
+        :param max_id: Previous maximal id.
+        :param position_bounds: Previous position bounds.
+        """
+        self.mark_changed(element)
+        element._dft = None
+        del self.elements[element.element_id]
+        del self._names[element.name]
+        del self._elements_by_type[element.element_type][element.element_id]
+        self.max_id = max_id
+        self.position_bounds = position_bounds
 
     def remove(self, element: DftElement) -> None:
         """
@@ -146,7 +305,25 @@ class Dft:
             child_ids = [child.element_id for child in element.children()]
             for child_id in child_ids:
                 self.get_element(child_id).remove_parent(element)
+        self.mark_changed(element)
+        if self._journal is not None:
+            self._journal.append((self._undo_remove, (element,)))
+        element._dft = None
         del self.elements[element.element_id]
+        del self._names[element.name]
+        del self._elements_by_type[element.element_type][element.element_id]
+
+    def _undo_remove(self, element: DftElement) -> None:
+        """
+        Revert removal of an element.
+        The element is appended at the end of the iteration order.
+        :param element: Removed element.
+        """
+        self.elements[element.element_id] = element
+        self._names[element.name] = element
+        self._elements_by_type[element.element_type][element.element_id] = element
+        element._dft = self
+        self.mark_changed(element)
 
     def replace(self, orig_element: DftElement, new_element: DftElement) -> None:
         """
@@ -157,8 +334,27 @@ class Dft:
         assert isinstance(orig_element, DftElement)
         assert isinstance(new_element, DftElement)
         assert new_element.element_id == orig_element.element_id
+        if self._incremental_cycle_check and orig_element.parents():
+            # New element must not reach the original element which it replaces
+            for child in self._cycle_successors(new_element):
+                if self._reaches(child, orig_element):
+                    raise DftInvalidArgumentException("Replacing {} would create a cycle.".format(orig_element.name))
+        if new_element.name != orig_element.name and new_element.name in self._names:
+            raise DftInvalidArgumentException("Element name '{}' used twice.".format(new_element.name))
+        if self._journal is not None:
+            self._journal.append((self._undo_replace, (orig_element, new_element, self.position_bounds)))
+        del self._names[orig_element.name]
+        del self._elements_by_type[orig_element.element_type][orig_element.element_id]
         self.elements[new_element.element_id] = new_element
+        self._names[new_element.name] = new_element
+        self._elements_by_type[new_element.element_type][new_element.element_id] = new_element
         self.update_bounds(new_element)
+        orig_element._dft = None
+        new_element._dft = self
+        self.mark_changed(new_element)
+        if new_element.is_gate():
+            for child in new_element.children():
+                self.mark_changed(child)
 
         # Replace original element as child of its parents
         parent_ids = [parent.element_id for parent in orig_element.parents()]
@@ -176,6 +372,135 @@ class Dft:
             for child_id in child_ids:
                 self.get_element(child_id).remove_parent(orig_element)
 
+    def _undo_replace(self, orig_element: DftElement, new_element: DftElement, position_bounds: tuple[float, float, float, float]) -> None:
+        """
+        Revert replacement of an element.
+        The changed parents and children are restored separately.
+        :param orig_element: Original element.
+        :param new_element: New element.
+        :param position_bounds: Previous position bounds.
+        """
+        self.mark_changed(new_element)
+        del self._names[new_element.name]
+        del self._elements_by_type[new_element.element_type][new_element.element_id]
+        self.elements[orig_element.element_id] = orig_element
+        self._names[orig_element.name] = orig_element
+        self._elements_by_type[orig_element.element_type][orig_element.element_id] = orig_element
+        self.position_bounds = position_bounds
+        new_element._dft = None
+        orig_element._dft = self
+        self.mark_changed(orig_element)
+
+    def set_attribute(self, element: DftElement, attribute: str, value) -> None:
+        """
+        Set a parameter of an element, e.g., the rate of a BE.
+        In contrast to a direct assignment, the change is recorded for rollbacks and for incremental validation.
+        Names must be set via the name property instead.
+        :param element: Element.
+        :param attribute: Name of the attribute.
+        :param value: New value.
+        """
+        if attribute.startswith("_") or attribute == "name" or not hasattr(element, attribute):
+            raise DftInvalidArgumentException("Attribute '{}' cannot be set for element {}.".format(attribute, element.name))
+        if self._journal is not None:
+            self._journal.append((self._undo_set_attribute, (element, attribute, getattr(element, attribute))))
+        setattr(element, attribute, value)
+        self.mark_changed(element)
+
+    def _undo_set_attribute(self, element: DftElement, attribute: str, value) -> None:
+        """
+        Revert setting of a parameter.
+        :param element: Element.
+        :param attribute: Name of the attribute.
+        :param value: Previous value.
+        """
+        setattr(element, attribute, value)
+        self.mark_changed(element)
+
+    def checkpoint(self) -> None:
+        """
+        Open a (nested) transaction.
+        All following changes made via the methods of the DFT and its elements are recorded until the transaction is ended by rollback() or commit().
+        Direct modifications of element attributes are not recorded, use set_attribute() instead.
+        """
+        if self._journal is None:
+            self._journal = []
+        self._checkpoints.append(len(self._journal))
+
+    def rollback(self) -> None:
+        """
+        Revert all changes since the last checkpoint and close the corresponding transaction.
+        Elements, names, parents and children are restored, but removed elements are re-inserted at the end of the iteration order.
+        """
+        if not self._checkpoints:
+            raise DftInvalidArgumentException("No open transaction to roll back.")
+        length = self._checkpoints.pop()
+        journal = self._journal
+        # Reverting changes must not be recorded itself
+        self._journal = None
+        while len(journal) > length:
+            undo, args = journal.pop()
+            undo(*args)
+        if self._checkpoints:
+            self._journal = journal
+
+    def commit(self) -> None:
+        """
+        Keep all changes since the last checkpoint and close the corresponding transaction.
+        The changes can still be reverted by rolling back an enclosing transaction.
+        """
+        if not self._checkpoints:
+            raise DftInvalidArgumentException("No open transaction to commit.")
+        self._checkpoints.pop()
+        if not self._checkpoints:
+            self._journal = None
+
+    def in_transaction(self) -> bool:
+        """
+        Get whether a transaction is open.
+        :return: True iff changes are currently recorded.
+        """
+        return self._journal is not None
+
+    def mark_changed(self, element: DftElement) -> None:
+        """
+        Record that the given element was added, removed or that its parents or children changed.
+        :param element: Element.
+        """
+        if self._touched is not None:
+            self._touched.add(element.element_id)
+        if self._dirty is not None:
+            self._dirty.add(element.element_id)
+        if self._hashes:
+            self._invalidate_hash(element)
+        self._modules = None
+        for index in self._ancestor_indices.values():
+            index.invalidate(element)
+
+    def start_tracking_changes(self) -> None:
+        """
+        Start recording the ids of all elements which are changed.
+        """
+        self._touched = set()
+
+    def stop_tracking_changes(self) -> None:
+        """
+        Stop recording changed elements.
+        """
+        self._touched = None
+
+    def pop_changed(self) -> set[int]:
+        """
+        Get the ids of all elements changed since the last call and reset the recorded changes.
+        Change tracking must have been started before.
+        Note that the ids can also belong to elements which have been removed in the meantime.
+        :return: Set of element ids.
+        """
+        assert self._touched is not None
+        touched = self._touched
+        self._touched = set()
+        return touched
+
     def update_bounds(self, element: DftElement) -> None:
         """
         Update position bounds by also including bounds of given element.
@@ -203,35 +528,96 @@ class Dft:
         data["nodes"] = nodes
         return data
 
+    def clone(self) -> "Dft":
+        """
+        Get independent copy of the DFT.
+        Elements are copied directly without the JSON round trip, i.e., numbers are not parsed again.
+        Cached structural hashes and the setting of the incremental cycle check are kept.
+        Change tracking and incremental validation are not enabled for the copy.
+        :return: Copy of the DFT.
+        """
+        dft = Dft()
+        dft.max_id = self.max_id
+        dft.position_bounds = self.position_bounds
+        dft.parameters = None if self.parameters is None else list(self.parameters)
+        # Copy elements
+        for element_id, element in self.elements.items():
+            copy = element.copy_unlinked()
+            copy._dft = dft
+            dft.elements[element_id] = copy
+            dft._names[copy.name] = copy
+            dft._elements_by_type[copy.element_type][element_id] = copy
+        # Link children in the original order
+        # The copies do not belong to the DFT temporarily to avoid cycle checks and change notifications
+        for element_id, element in self.elements.items():
+            if element.is_gate():
+                copy = dft.elements[element_id]
+                copy._dft = None
+                for child in element.children():
+                    copy.add_child(dft.elements[child.element_id])
+                copy._dft = dft
+        if self.top_level_element is not None:
+            dft.top_level_element = dft.elements[self.top_level_element.element_id]
+        dft._hashes = dict(self._hashes)
+        dft._incremental_cycle_check = self._incremental_cycle_check
+        return dft
+
+    def freeze(self) -> DftArray:
+        """
+        Get immutable array-based snapshot of the DFT.
+        The snapshot is not updated when the DFT changes afterward.
+        Only supported for non-parametric DFTs.
+        :return: Array-based snapshot.
+        """
+        assert self.top_level_element is not None
+        return DftArray(list(self.elements.values()), self.top_level_element)
+
     def number_of_be(self) -> int:
         """
         Get number of BEs.
         :return: Number of BEs.
         """
-        no_be = 0
-        for element in self.elements.values():
-            if element.is_be():
-                no_be += 1
-        return no_be
+        return len(self._elements_by_type[ElementType.BE])
+
+    def number_of_elements(self, element_type: ElementType) -> int:
+        """
+        Get number of elements of the given type.
+        :param element_type: Element type.
+        :return: Number of elements.
+        """
+        return len(self._elements_by_type[element_type])
+
+    def iter_bes(self) -> Iterator[DftElement]:
+        """
+        Iterate over all BEs.
+        The DFT must not be modified during the iteration.
+        :return: Iterator over BEs.
+        """
+        return iter(self._elements_by_type[ElementType.BE].values())
+
+    def iter_gates(self, element_type: ElementType | None = None) -> Iterator[DftElement]:
+        """
+        Iterate over gates.
+        The DFT must not be modified during the iteration.
+        :param element_type: Only iterate over gates of this type. If None, all gates are considered.
+        :return: Iterator over gates.
+        """
+        if element_type is not None:
+            assert element_type != ElementType.BE
+            yield from self._elements_by_type[element_type].values()
+        else:
+            for gate_type, elements in self._elements_by_type.items():
+                if gate_type != ElementType.BE:
+                    yield from elements.values()
 
     def statistics(self) -> tuple[int, int, int, int]:
         """
         Get general statistics about DFT.
         :return: Tuple (number of BEs, number of static gates, number of dynamic gates, number of elements)
         """
-        no_be = 0
-        no_static = 0
-        no_dynamic = 0
-        for element in self.elements.values():
-            if element.is_be():
-                no_be += 1
-            else:
-                assert element.is_gate()
-                if element.is_dynamic():
-                    no_dynamic += 1
-                else:
-                    no_static += 1
-        assert no_static + no_dynamic + no_be == len(self.elements)
+        no_be = self.number_of_be()
+        no_static = self.number_of_elements(ElementType.AND) + self.number_of_elements(ElementType.OR) + self.number_of_elements(ElementType.VOT)
+        no_dynamic = len(self.elements) - no_be - no_static
         return no_be, no_static, no_dynamic, len(self.elements)
 
     def __str__(self) -> str:
@@ -247,10 +633,64 @@ class Dft:
         """
         return "{}\n".format(self) + "\n".join([str(element) for element in self.elements.values()])
 
+    def structural_hash(self, element: DftElement | None = None) -> int:
+        """
+        Get structural (Merkle) hash of the element.
+        The hash is computed bottom-up from the type, the parameters and the hashes of the children.
+        Ids and names are not part of the hash.
+        Hashes are cached and invalidated when the structure of the DFT changes.
+        Direct modifications of element attributes are not tracked.
+        :param element: Element. If None, the hash of the top level element is returned.
+        :return: Hash which is equal for structurally equal elements.
+        """
+        if element is None:
+            element = self.top_level_element
+        if element.element_id in self._hashes:
+            return self._hashes[element.element_id]
+
+        # Compute missing hashes in post-order
+        on_path = {element.element_id}
+        stack = [(element, iter(element.children() if element.is_gate() else []))]
+        while stack:
+            current, successors = stack[-1]
+            for child in successors:
+                if child.element_id not in self._hashes:
+                    if child.element_id in on_path:
+                        raise DftInvalidArgumentException("DFT is cyclic.")
+                    on_path.add(child.element_id)
+                    stack.append((child, iter(child.children() if child.is_gate() else [])))
+                    break
+            else:
+                # Hashes of all children are known
+                stack.pop()
+                on_path.remove(current.element_id)
+                key = current.structure_key()
+                if current.is_gate():
+                    key += (current.successors_key([self._hashes[child.element_id] for child in current.children()]),)
+                digest = hashlib.blake2b(repr(key).encode(), digest_size=8).digest()
+                self._hashes[current.element_id] = int.from_bytes(digest, "little")
+        return self._hashes[element.element_id]
+
+    def _invalidate_hash(self, element: DftElement) -> None:
+        """
+        Remove cached structural hashes of the element and all its predecessors.
+        :param element: Changed element.
+        """
+        self._hashes.pop(element.element_id, None)
+        # Hashes are only cached if all hashes of successors are cached as well
+        stack = [element]
+        while stack:
+            current = stack.pop()
+            for parent in current.parents():
+                if parent.element_id in self._hashes:
+                    del self._hashes[parent.element_id]
+                    stack.append(parent)
+
     def compare(self, other: "Dft", respect_ids: bool) -> bool:
         """
         Compare two DFT.
-        Note that the comparison currently performs redundant work as for each element comparison the complete subtree is checked.
+        Elements are matched by their ids or names and compared via their structural hashes.
+        The exact comparison only considers the element itself and the ids/names of its children.
         :param other: Other DFT.
         :param respect_ids: Whether the ids must be equal.
         :return: True iff all elements, the top-level element and the structure are equal between the two DFTs.
@@ -261,30 +701,26 @@ class Dft:
         if respect_ids:
             if self.max_id != other.max_id:
                 raise Exception("Different maximal ids: {} and {} .".format(self.max_id, other.max_id))
-            for i in range(0, self.max_id):
-                assert i in self.elements
-                element = self.elements[i]
-                assert i in other.elements
-                other_element = other.elements[i]
-                if not element.compare(other_element, respect_ids):
-                    raise Exception("Elements with id {} are different: {} and {}.".format(i, element, other_element))
+            if self.top_level_element.element_id != other.top_level_element.element_id:
+                raise Exception("Top level elements {} and {} not equal.".format(self.top_level_element, other.top_level_element))
         else:
-            # Prepare mapping from name to id (for other DFT)
-            # because ids could be different between both DFTs
-            other_mapping = dict()
-            for element in other.elements.values():
-                assert element.name not in other_mapping
-                other_mapping[element.name] = element
-
-            for element in self.elements.values():
-                if element.name not in other_mapping:
-                    raise Exception("Element {} not present in other DFT.".format(element))
-                other_element = other_mapping[element.name]
-                if not element.compare(other_element, respect_ids):
-                    raise Exception("Elements are different: {} and {}.".format(element, other_element))
+            if self.top_level_element.name != other.top_level_element.name:
+                raise Exception("Top level elements {} and {} not equal.".format(self.top_level_element, other.top_level_element))
 
-        if not self.top_level_element.compare(other.top_level_element, respect_ids):
-            raise Exception("Top level elements {} and {} not equal.".format(self.top_level_element, other.top_level_element))
+        for element in self.elements.values():
+            if respect_ids:
+                if element.element_id not in other.elements:
+                    raise Exception("Element {} not present in other DFT.".format(element))
+                other_element = other.elements[element.element_id]
+            else:
+                # Use mapping from name to element (for other DFT)
+                # because ids could be different between both DFTs
+                if not other.has_name(element.name):
+                    raise Exception("Element {} not present in other DFT.".format(element))
+                other_element = other.get_element_by_name(element.name)
+            # Hashes are only used to quickly detect differences, the exact check is performed afterward
+            if self.structural_hash(element) != other.structural_hash(other_element) or not element.compare_local(other_element, respect_ids):
+                raise Exception("Elements are different: {} and {}.".format(element, other_element))
 
         return True
 
@@ -315,86 +751,269 @@ class Dft:
         assert len(elements) == len(self.elements)
         return elements
 
-    def get_module(self, module_repr: DftElement) -> list[DftElement]:
+    def modules(self) -> DftModules:
         """
-        Compute module of module_repr.
-        :param module_repr: Module representative.
-        :return: List of element ids which form the module for module_repr.
+        Get the independent modules and the spare modules of the DFT.
+        The modules are computed in linear time and cached until the DFT changes.
+        :return: Modules.
         """
-        # Check if module_repr is a valid module representative (either top level element or SPARE-gate)
-        if module_repr.element_id != self.top_level_element.element_id and not isinstance(module_repr, dft_gates.DftSpare):
-            return []
+        if self._modules is None:
+            self._modules = DftModules(list(self.elements.values()), self.top_level_element)
+        return self._modules
 
-        # Compute module
-        module = []
-        visited = set()
-        queue = deque()
-        queue.append(module_repr)
-        visited.add(module_repr.element_id)
-        while len(queue) > 0:
-            elem = queue.popleft()
-            module.append(elem.element_id)
-            # Go "downwards" and only stop when encountering a BE or a SPARE
-            if not elem.is_be() and not isinstance(elem, dft_gates.DftSpare):
-                for child in elem.children():
-                    if child.element_id not in visited:
-                        queue.append(child)
-                        visited.add(child.element_id)
-            # Go "sideways" for dependencies and SEQ/MUTEX
-            for parent in elem.parents():
-                if parent.element_id not in visited:
-                    if isinstance(elem, dft_gates.DftDependency) or isinstance(elem, dft_gates.DftSeq) or isinstance(elem, dft_gates.DftMutex):
-                        queue.append(parent)
-                        visited.add(parent)
-        return module
+    def ancestor_index(self, index_class: type[AncestorIndex]) -> AncestorIndex:
+        """
+        Get the ancestor index of the given class.
+        The index is created on first use and afterward kept up-to-date: the cached values of changed elements and their descendants are invalidated.
+        :param index_class: Subclass of AncestorIndex.
+        :return: Index.
+        """
+        index = self._ancestor_indices.get(index_class)
+        if index is None:
+            index = index_class(self)
+            self._ancestor_indices[index_class] = index
+        return index
+
+    def _clear_ancestor_indices(self) -> None:
+        """
+        Remove all cached values of the ancestor indices, e.g., when the top level element changed.
+        """
+        for index in self._ancestor_indices.values():
+            index.clear()
+
+    def get_module(self, module_repr: DftElement) -> list[int]:
+        """
+        Compute module of module_repr.
+        :param module_repr: Module representative, i.e., the top level element or a child of a SPARE gate.
+        :return: List of element ids which form the module for module_repr. Empty if module_repr is no module representative.
+        """
+        return [element.element_id for element in self.modules().get_module(module_repr)]
 
     def check_valid(self) -> None:
         """
         Checks that the DFT is valid, e.g. acyclic, has TLE, etc.
         Otherwise, an assertion is raised.
         """
-        assert self.size() <= self.max_id + 1
-        assert self.top_level_element
+        self._check_valid_global()
         for element_id, element in self.elements.items():
-            assert element.element_id == element_id
-            element.check_valid()
-            # Check parents and children exist
-            assert all(parent.element_id in self.elements for parent in element.parents())
-            if element.is_gate():
-                assert all(child.element_id in self.elements for child in element.children())
+            self._check_valid_element(element_id, element)
         assert not self.is_cyclic()
 
+    def start_incremental_validation(self) -> None:
+        """
+        Validate the complete DFT and afterward start tracking the elements which are changed.
+        Subsequent calls of check_valid_incremental() only validate the changed elements.
+        """
+        self.check_valid()
+        self._dirty = set()
+
+    def stop_incremental_validation(self) -> None:
+        """
+        Stop tracking changed elements for incremental validation.
+        """
+        self._dirty = None
+
+    def check_valid_incremental(self) -> None:
+        """
+        Checks that the DFT is valid by only considering the elements changed since the last (incremental) validation.
+        Each change of the structure (adding/removing elements, parents or children) marks the involved elements.
+        Direct modifications of element attributes are not tracked.
+        If a check fails, the changed elements are kept and checked again in the next call.
+        Incremental validation must have been started before.
+        Otherwise, an assertion is raised.
+        """
+        assert self._dirty is not None
+        self._check_valid_global()
+        # Changed elements are only forgotten after all checks passed
+        dirty = self._dirty
+        for element_id in dirty:
+            if element_id in self.elements:
+                self._check_valid_element(element_id, self.elements[element_id])
+        if not self._incremental_cycle_check:
+            # Each new cycle contains a new edge and therefore an element which was changed
+            for element_id in dirty:
+                if element_id in self.elements:
+                    assert not self._on_cycle(self.elements[element_id])
+        self._dirty = set()
+
+    def _check_valid_global(self) -> None:
+        """
+        Check validity of global properties of the DFT.
+        """
+        assert self.size() <= self.max_id + 1
+        assert self.top_level_element
+        assert self.top_level_element.element_id in self.elements
+        assert sum(len(elements) for elements in self._elements_by_type.values()) == self.size()
+
+    def _check_valid_element(self, element_id: int, element: DftElement) -> None:
+        """
+        Check validity of a single element.
+        :param element_id: Id under which the element is stored.
+        :param element: Element.
+        """
+        assert element.element_id == element_id
+        element.check_valid()
+        # Check parents and children exist
+        assert all(parent.element_id in self.elements for parent in element.parents())
+        if element.is_gate():
+            assert all(child.element_id in self.elements for child in element.children())
+
+    def _on_cycle(self, element: DftElement) -> bool:
+        """
+        Check whether the given element lies on a cycle.
+        The check searches upwards from the element as the number of predecessors is typically small.
+        :param element: Element.
+        :return: True iff the element is reachable from itself (excluding dependencies and restrictors).
+        """
+        if not self._cycle_successors(element):
+            return False
+        visited = {element.element_id}
+        stack = [element]
+        while stack:
+            current = stack.pop()
+            for parent in current.parents():
+                if not self._cycle_successors(parent):
+                    # Edge is not relevant for cycles
+                    continue
+                if parent.element_id == element.element_id:
+                    return True
+                if parent.element_id not in visited:
+                    visited.add(parent.element_id)
+                    stack.append(parent)
+        return False
+
+    @staticmethod
+    def _has_cycle_successors(element: DftElement) -> bool:
+        """
+        Check whether the outgoing edges of the element are relevant for cycles.
+        This is decided by the kind of the element: BEs, dependencies and restrictors are excluded.
+        :param element: Element.
+        :return: True iff the element is a gate whose children are relevant for cycles.
+        """
+        return not (element.is_be() or isinstance(element, (dft_gates.DftDependency, dft_gates.DftSeq, dft_gates.DftMutex)))
+
+    @staticmethod
+    def _cycle_successors(element: DftElement) -> list[DftElement]:
+        """
+        Get successors of element which are relevant for cycles.
+        Dependencies and restrictors are excluded.
+        :param element: Element.
+        :return: List of successors.
+        """
+        if not Dft._has_cycle_successors(element):
+            return []
+        return element.children()
+
     def is_cyclic(self) -> bool:
         """
         Checks whether the DFT is cyclic.
         DFTs should be acyclic.
+        If the incremental cycle check is enabled, the DFT is known to be acyclic and no check is performed.
         :return: True iff the DFT has a cycle (excluding dependencies and restrictors).
         """
+        if self._incremental_cycle_check:
+            return False
+        return self._has_cycle()
 
-        def dfs(element):
-            if finished[element.element_id]:
-                return False
-            if visited[element.element_id]:
-                # Found cycle
-                return True
-            visited[element.element_id] = True
-            if (
-                not element.is_be()
-                and not isinstance(element, dft_gates.DftDependency)
-                and not isinstance(element, dft_gates.DftSeq)
-                and not isinstance(element, dft_gates.DftMutex)
-            ):
-                # BEs, dependencies and restrictors are skipped
-                for child in element.children():
-                    if dfs(child):
+    def _has_cycle(self) -> bool:
+        """
+        Checks whether the DFT has a cycle via iterative DFS.
+        :return: True iff the DFT has a cycle (excluding dependencies and restrictors).
+        """
+        # Elements which are on the current DFS path (True) or finished (False)
+        on_path = dict()
+        for root in self.elements.values():
+            if root.element_id in on_path:
+                continue
+            on_path[root.element_id] = True
+            stack = [(root, iter(self._cycle_successors(root)))]
+            while stack:
+                element, successors = stack[-1]
+                for child in successors:
+                    if child.element_id not in on_path:
+                        # Descend into child
+                        on_path[child.element_id] = True
+                        stack.append((child, iter(self._cycle_successors(child))))
+                        break
+                    elif on_path[child.element_id]:
+                        # Found cycle
                         return True
-            finished[element.element_id] = True
-            return False
+                else:
+                    # All successors are finished
+                    on_path[element.element_id] = False
+                    stack.pop()
+        return False
 
-        # Check for cycle via DFS
-        visited = [False] * self.next_id()
-        finished = [False] * self.next_id()
-        for elem in self.elements.values():
-            if dfs(elem):
+    def _reaches(self, start: DftElement, target: DftElement) -> bool:
+        """
+        Check whether target is reachable from start via edges relevant for cycles.
+        :param start: Start element.
+        :param target: Target element.
+        :return: True iff target is reachable.
+        """
+        visited = {start.element_id}
+        stack = [start]
+        while stack:
+            element = stack.pop()
+            if element.element_id == target.element_id:
                 return True
+            for child in self._cycle_successors(element):
+                if child.element_id not in visited:
+                    visited.add(child.element_id)
+                    stack.append(child)
         return False
+
+    def enable_incremental_cycle_check(self, enable: bool = True) -> None:
+        """
+        Enable or disable the incremental cycle check.
+        If enabled, adding an edge which would close a cycle raises an exception and is_cyclic() does not need to check the complete DFT anymore.
+        :param enable: Whether the check should be enabled.
+        """
+        if enable and not self._incremental_cycle_check:
+            if self._has_cycle():
+                raise DftInvalidArgumentException("DFT is cyclic.")
+        self._incremental_cycle_check = enable
+
+    def check_new_edge(self, parent: DftElement, child: DftElement) -> None:
+        """
+        Check that adding the edge from parent to child does not close a cycle.
+        This method is called by gates when adding children and only performs a check if the incremental cycle check is enabled.
+        Only the elements reachable from the child are visited.
+        :param parent: Parent gate.
+        :param child: New child.
+        """
+        if not self._incremental_cycle_check:
+            return
+        if not self._has_cycle_successors(parent):
+            # Edges of parent are not relevant for cycles
+            return
+        if self._reaches(child, parent):
+            raise DftInvalidArgumentException("Adding {} as child of {} would create a cycle.".format(child.name, parent.name))
+
+
+def group_equal_dfts(dfts: list[Dft]) -> list[list[int]]:
+    """
+    Group equal DFTs, e.g., to deduplicate a corpus.
+    DFTs are first grouped by their structural hash and only DFTs with the same hash are compared exactly (see Dft.compare()).
+    :param dfts: DFTs.
+    :return: Groups of indices of equal DFTs. The groups and the indices within a group are sorted by their first occurrence.
+    """
+    buckets = dict()
+    for i, dft in enumerate(dfts):
+        buckets.setdefault((dft.size(), dft.structural_hash()), []).append(i)
+    groups = []
+    for indices in buckets.values():
+        # Exact comparison within bucket
+        bucket_groups = []
+        for i in indices:
+            for group in bucket_groups:
+                try:
+                    dfts[group[0]].compare(dfts[i], respect_ids=False)
+                except Exception:
+                    continue
+                group.append(i)
+                break
+            else:
+                bucket_groups.append([i])
+        groups.extend(bucket_groups)
+    return sorted(groups)
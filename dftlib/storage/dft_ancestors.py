@@ -0,0 +1,180 @@
+from abc import ABC, abstractmethod
+from typing import Any
+
+from dftlib.storage.dft_element import DftElement
+
+
+class AncestorIndex(ABC):
+    """
+    Memoized values over the predecessor closure of elements.
+    The value of an element combines its own value with the values of its parents along the edges which are followed.
+    Values are computed on demand and cached. Whenever an element changes, the cached values of the element and its descendants are invalidated.
+    Subclasses define own_value(), follow(), combine() and optionally done() to stop as soon as the value cannot change anymore.
+    Use Dft.ancestor_index() to obtain an index which is kept up-to-date with the DFT.
+    """
+
+    def __init__(self, dft: "dftlib.storage.dft.Dft") -> None:
+        """
+        Create empty index.
+        :param dft: DFT.
+        """
+        self._dft = dft
+        self._values: dict[int, Any] = dict()
+
+    @abstractmethod
+    def own_value(self, element: DftElement) -> Any:
+        """
+        Get value of the element without considering its parents.
+        :param element: Element.
+        :return: Value.
+        """
+
+    @abstractmethod
+    def follow(self, element: DftElement, parent: DftElement) -> bool:
+        """
+        Get whether the value of the parent contributes to the value of the element.
+        :param element: Element.
+        :param parent: Parent of the element.
+        :return: True iff the edge is followed.
+        """
+
+    @abstractmethod
+    def combine(self, value: Any, parent_value: Any) -> Any:
+        """
+        Combine the value of an element with the value of a parent.
+        :param value: Current value of the element.
+        :param parent_value: Value of the parent.
+        :return: Combined value.
+        """
+
+    def done(self, value: Any) -> bool:
+        """
+        Get whether further parents cannot change the given value anymore.
+        :param value: Current value.
+        :return: True iff the remaining parents can be skipped.
+        """
+        return False
+
+    def value(self, element: DftElement) -> Any:
+        """
+        Get value of the element.
+        The predecessor closure is traversed iteratively and the values of all visited elements are cached.
+        :param element: Element.
+        :return: Value.
+        """
+        values = self._values
+        if element.element_id in values:
+            return values[element.element_id]
+        # Stack of [element, current value, iterator over parents]
+        stack = [[element, self.own_value(element), iter(element.parents())]]
+        # Elements on the stack are skipped to guard against cycles
+        on_stack = {element.element_id}
+        while stack:
+            frame = stack[-1]
+            current, value, parents = frame
+            pushed = False
+            if not self.done(value):
+                for parent in parents:
+                    if not self.follow(current, parent):
+                        continue
+                    if parent.element_id in values:
+                        value = self.combine(value, values[parent.element_id])
+                        if self.done(value):
+                            break
+                    elif parent.element_id not in on_stack:
+                        # Compute value of parent first
+                        frame[1] = value
+                        stack.append([parent, self.own_value(parent), iter(parent.parents())])
+                        on_stack.add(parent.element_id)
+                        pushed = True
+                        break
+            if not pushed:
+                values[current.element_id] = value
+                on_stack.discard(current.element_id)
+                stack.pop()
+                if stack:
+                    stack[-1][1] = self.combine(stack[-1][1], value)
+        return values[element.element_id]
+
+    def invalidate(self, element: DftElement) -> None:
+        """
+        Invalidate the cached values of the element and all its descendants whose values were derived from it.
+        :param element: Changed element.
+        """
+        values = self._values
+        values.pop(element.element_id, None)
+        if not element.is_gate():
+            return
+        stack = list(element.children())
+        while stack:
+            current = stack.pop()
+            # Cached values of descendants can only depend on the element via cached elements
+            if current.element_id in values:
+                del values[current.element_id]
+                if current.is_gate():
+                    stack.extend(current.children())
+
+    def clear(self) -> None:
+        """
+        Remove all cached values.
+        """
+        self._values.clear()
+
+
+class AncestorClosure(AncestorIndex):
+    """
+    Index for checking whether an element is an ancestor of another element.
+    The ancestors of an element are stored as bitset where each element is assigned a bit when it is first encountered.
+    Subclasses can restrict the edges which are followed by overriding follow().
+    """
+
+    def __init__(self, dft: "dftlib.storage.dft.Dft") -> None:
+        super().__init__(dft)
+        self._bits: dict[int, int] = dict()
+
+    def _bit(self, element: DftElement) -> int:
+        """
+        Get bit assigned to the element.
+        :param element: Element.
+        :return: Bitset containing only the element.
+        """
+        bit = self._bits.get(element.element_id)
+        if bit is None:
+            bit = 1 << len(self._bits)
+            self._bits[element.element_id] = bit
+        return bit
+
+    def own_value(self, element: DftElement) -> int:
+        return self._bit(element)
+
+    def follow(self, element: DftElement, parent: DftElement) -> bool:
+        return True
+
+    def combine(self, value: int, parent_value: int) -> int:
+        return value | parent_value
+
+    def is_ancestor(self, ancestor: DftElement, element: DftElement) -> bool:
+        """
+        Check whether the ancestor is contained in the predecessor closure of the element (including the element itself).
+        :param ancestor: Possible ancestor.
+        :param element: Element.
+        :return: True iff the ancestor is reachable from the element via the followed edges.
+        """
+        return bool(self.value(element) & self._bit(ancestor))
+
+    def clear(self) -> None:
+        super().clear()
+        self._bits.clear()
+
+
+class AncestorProperty(AncestorIndex):
+    """
+    Index for checking whether some element in the predecessor closure satisfies a property.
+    Subclasses define the property via own_value() and the edges which are followed via follow().
+    """
+
+    def combine(self, value: bool, parent_value: bool) -> bool:
+        return value or parent_value
+
+    def done(self, value: bool) -> bool:
+        return value
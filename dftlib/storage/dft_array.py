@@ -0,0 +1,249 @@
+from array import array
+
+import dftlib.storage.dft_be as dft_be
+import dftlib.storage.dft_gates as dft_gates
+from dftlib.exceptions.exceptions import DftInvalidArgumentException, ToolNotFound
+from dftlib.storage.dft_element import DftElement, ElementType
+
+try:
+    import numpy as _numpy
+except ImportError:
+    _has_numpy = False
+else:
+    _has_numpy = True
+
+# Integer codes for element types and BE distributions
+TYPES: list[ElementType] = list(ElementType)
+TYPE_CODES: dict[ElementType, int] = {element_type: code for code, element_type in enumerate(TYPES)}
+DISTRIBUTIONS: list[dft_be.Distribution] = list(dft_be.Distribution)
+DISTRIBUTION_CODES: dict[dft_be.Distribution, int] = {distribution: code for code, distribution in enumerate(DISTRIBUTIONS)}
+
+# Names of all arrays contained in a DftArray
+ARRAY_NAMES = [
+    "ids",
+    "types",
+    "child_offsets",
+    "child_indices",
+    "parent_offsets",
+    "parent_indices",
+    "relevant",
+    "distributions",
+    "rates",
+    "dorms",
+    "repairs",
+    "probabilities",
+    "phases",
+    "shapes",
+    "means",
+    "stddevs",
+    "failed",
+    "thresholds",
+    "inclusive",
+]
+
+
+class DftArray:
+    """
+    Immutable array-based snapshot of a DFT.
+    Elements are identified by a dense index 0, ..., n-1.
+    Parents and children are stored in compressed sparse row (CSR) format:
+    the children of the element with index i are child_indices[child_offsets[i]:child_offsets[i+1]], in the order of the DFT.
+    Parameters are stored in one float array per parameter where entries not applicable to an element are NaN.
+    All arrays are contiguous and accessible as read-only memoryviews via get_array().
+    They can be converted to NumPy arrays without copying via numpy().
+    The snapshot can be pickled, e.g., to share it with worker processes.
+    """
+
+    def __init__(self, elements: list[DftElement], top_level_element: DftElement) -> None:
+        """
+        Create snapshot from the given elements.
+        Use Dft.freeze() instead of calling this constructor directly.
+        :param elements: All elements of the DFT.
+        :param top_level_element: Top level element.
+        """
+        nan = float("nan")
+        n = len(elements)
+        self._index: dict[int, int] = {element.element_id: i for i, element in enumerate(elements)}
+        self._names: tuple[str, ...] = tuple(element.name for element in elements)
+        self._top_level: int = self._index[top_level_element.element_id]
+
+        ids = array("q", (element.element_id for element in elements))
+        types = array("b", (TYPE_CODES[element.element_type] for element in elements))
+        relevant = array("b", (element.relevant for element in elements))
+
+        # Adjacency in CSR format
+        child_offsets = array("q", [0])
+        child_indices = array("q")
+        parent_offsets = array("q", [0])
+        parent_indices = array("q")
+        for element in elements:
+            if element.is_gate():
+                child_indices.extend(self._index[child.element_id] for child in element.children())
+            child_offsets.append(len(child_indices))
+            parent_indices.extend(self._index[parent.element_id] for parent in element.parents())
+            parent_offsets.append(len(parent_indices))
+
+        # Parameters
+        distributions = array("b", [-1]) * n
+        rates = array("d", [nan]) * n
+        dorms = array("d", [nan]) * n
+        repairs = array("d", [nan]) * n
+        probabilities = array("d", [nan]) * n
+        phases = array("q", [0]) * n
+        shapes = array("d", [nan]) * n
+        means = array("d", [nan]) * n
+        stddevs = array("d", [nan]) * n
+        failed = array("b", [0]) * n
+        thresholds = array("q", [0]) * n
+        inclusive = array("b", [0]) * n
+        for i, element in enumerate(elements):
+            try:
+                if isinstance(element, dft_be.DftBe):
+                    distributions[i] = DISTRIBUTION_CODES[element.distribution]
+                    if isinstance(element, dft_be.BeConstant):
+                        failed[i] = element.failed
+                    elif isinstance(element, dft_be.BeProbability):
+                        probabilities[i] = element.probability
+                        dorms[i] = element.dorm
+                    elif isinstance(element, dft_be.BeExponential):
+                        rates[i] = element.rate
+                        dorms[i] = element.dorm
+                        repairs[i] = element.repair
+                    elif isinstance(element, dft_be.BeErlang):
+                        rates[i] = element.rate
+                        phases[i] = element.phases
+                        dorms[i] = element.dorm
+                    elif isinstance(element, dft_be.BeWeibull):
+                        shapes[i] = element.shape
+                        rates[i] = element.rate
+                    elif isinstance(element, dft_be.BeLognormal):
+                        means[i] = element.mean
+                        stddevs[i] = element.stddev
+                elif isinstance(element, dft_gates.DftVotingGate):
+                    thresholds[i] = element.voting_threshold
+                elif isinstance(element, dft_gates.DftPriorityGate):
+                    inclusive[i] = element.inclusive
+                elif isinstance(element, dft_gates.DftDependency):
+                    probabilities[i] = element.probability
+            except TypeError:
+                raise DftInvalidArgumentException("Parametric value of element {} cannot be stored in array.".format(element))
+
+        self._arrays: dict[str, array] = {
+            "ids": ids,
+            "types": types,
+            "child_offsets": child_offsets,
+            "child_indices": child_indices,
+            "parent_offsets": parent_offsets,
+            "parent_indices": parent_indices,
+            "relevant": relevant,
+            "distributions": distributions,
+            "rates": rates,
+            "dorms": dorms,
+            "repairs": repairs,
+            "probabilities": probabilities,
+            "phases": phases,
+            "shapes": shapes,
+            "means": means,
+            "stddevs": stddevs,
+            "failed": failed,
+            "thresholds": thresholds,
+            "inclusive": inclusive,
+        }
+        assert list(self._arrays.keys()) == ARRAY_NAMES
+
+    @classmethod
+    def from_arrays(cls, names: tuple[str, ...], top_level: int, arrays: dict[str, array]) -> "DftArray":
+        """
+        Create snapshot directly from arrays without creating elements.
+        The arrays are taken over without copying and must not be changed afterward.
+        :param names: Names of the elements.
+        :param top_level: Index of the top level element.
+        :param arrays: Mapping from array name to array for all names in ARRAY_NAMES.
+        :return: Snapshot.
+        """
+        if list(arrays.keys()) != ARRAY_NAMES:
+            raise DftInvalidArgumentException("Arrays {} do not match the arrays of a snapshot.".format(list(arrays.keys())))
+        snapshot = cls.__new__(cls)
+        snapshot._index = {element_id: i for i, element_id in enumerate(arrays["ids"])}
+        snapshot._names = names
+        snapshot._top_level = top_level
+        snapshot._arrays = arrays
+        return snapshot
+
+    def get_array(self, name: str) -> memoryview:
+        """
+        Get array by name.
+        :param name: Name of the array (one of ARRAY_NAMES).
+        :return: Read-only view of the array.
+        """
+        if name not in self._arrays:
+            raise DftInvalidArgumentException("Array '{}' not known.".format(name))
+        return memoryview(self._arrays[name]).toreadonly()
+
+    def size(self) -> int:
+        """
+        Get number of elements.
+        :return: Number of elements.
+        """
+        return len(self._names)
+
+    def top_level_index(self) -> int:
+        """
+        Get index of top level element.
+        :return: Index.
+        """
+        return self._top_level
+
+    def index(self, element_id: int) -> int:
+        """
+        Get dense index of element.
+        :param element_id: Element id.
+        :return: Index.
+        """
+        if element_id not in self._index:
+            raise DftInvalidArgumentException("Element with id {} not known.".format(element_id))
+        return self._index[element_id]
+
+    def name(self, index: int) -> str:
+        """
+        Get name of element.
+        :param index: Index.
+        :return: Name.
+        """
+        return self._names[index]
+
+    def element_type(self, index: int) -> ElementType:
+        """
+        Get type of element.
+        :param index: Index.
+        :return: Element type.
+        """
+        return TYPES[self._arrays["types"][index]]
+
+    def children(self, index: int) -> memoryview:
+        """
+        Get children of element.
+        :param index: Index.
+        :return: Indices of children in order.
+        """
+        offsets = self._arrays["child_offsets"]
+        return self.get_array("child_indices")[offsets[index] : offsets[index + 1]]
+
+    def parents(self, index: int) -> memoryview:
+        """
+        Get parents of element.
+        :param index: Index.
+        :return: Indices of parents.
+        """
+        offsets = self._arrays["parent_offsets"]
+        return self.get_array("parent_indices")[offsets[index] : offsets[index + 1]]
+
+    def numpy(self) -> dict:
+        """
+        Get all arrays as NumPy arrays.
+        The NumPy arrays share the memory with this snapshot and are read-only.
+        :return: Mapping from array name to NumPy array.
+        """
+        if not _has_numpy:
+            raise ToolNotFound("numpy is required for this functionality.")
+        return {name: _numpy.frombuffer(self.get_array(name), dtype=self._arrays[name].typecode) for name in ARRAY_NAMES}
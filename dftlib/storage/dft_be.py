@@ -77,6 +77,8 @@ class DftBe(DftElement):
     Basic element (BE).
     """
 
+    __slots__ = ("distribution",)
+
     def __init__(self, element_id: int, name: str, distribution: Distribution, position: tuple[float, float]) -> None:
         DftElement.__init__(self, element_id, name, ElementType.BE, position)
         self.distribution: Distribution = distribution
@@ -86,6 +88,9 @@ class DftBe(DftElement):
         json["data"]["distribution"] = self.distribution
         return json
 
+    def structure_key(self) -> tuple:
+        return super().structure_key() + (self.distribution,)
+
     def compare(self, other: DftElement, respect_ids: bool) -> bool:
         if not super().compare(other, respect_ids):
             return False
@@ -98,6 +103,8 @@ class BeConstant(DftBe):
     Constant failed/failsafe BE.
     """
 
+    __slots__ = ("failed",)
+
     def __init__(self, element_id: int, name: str, failed: bool, position: tuple[float, float]) -> None:
         DftBe.__init__(self, element_id, name, Distribution.CONSTANT, position)
         self.failed = failed
@@ -112,6 +119,9 @@ class BeConstant(DftBe):
         s += " constant, {}".format("failed" if self.failed else "failsafe")
         return s
 
+    def structure_key(self) -> tuple:
+        return super().structure_key() + (self.failed,)
+
     def compare(self, other: DftElement, respect_ids: bool) -> bool:
         if not super().compare(other, respect_ids):
             return False
@@ -128,6 +138,8 @@ class BeProbability(DftBe):
     BE with constant probability distribution.
     """
 
+    __slots__ = ("probability", "dorm")
+
     def __init__(self, element_id: int, name: str, probability: float | str, dorm: float | str, position: tuple[float, float]) -> None:
         DftBe.__init__(self, element_id, name, Distribution.PROBABILITY, position)
         self.probability = probability
@@ -146,6 +158,9 @@ class BeProbability(DftBe):
             s += ", dormancy {}".format(self.dorm)
         return s
 
+    def structure_key(self) -> tuple:
+        return super().structure_key() + (self.probability, self.dorm)
+
     def compare(self, other: DftElement, respect_ids: bool) -> bool:
         if not super().compare(other, respect_ids):
             return False
@@ -167,6 +182,8 @@ class BeExponential(DftBe):
     BE with exponential distribution.
     """
 
+    __slots__ = ("rate", "dorm", "repair")
+
     def __init__(self, element_id: int, name: str, rate: float | str, dorm: float | str, repair: float | str, position: tuple[float, float]) -> None:
         DftBe.__init__(self, element_id, name, Distribution.EXPONENTIAL, position)
         self.rate = rate
@@ -189,6 +206,9 @@ class BeExponential(DftBe):
             s += ", dormancy {}".format(self.dorm)
         return s
 
+    def structure_key(self) -> tuple:
+        return super().structure_key() + (self.rate, self.dorm, self.repair)
+
     def compare(self, other: DftElement, respect_ids: bool) -> bool:
         if not super().compare(other, respect_ids):
             return False
@@ -214,6 +234,8 @@ class BeErlang(DftBe):
     BE with Erlang distribution.
     """
 
+    __slots__ = ("rate", "phases", "dorm")
+
     def __init__(self, element_id: int, name: str, rate: float | str, phases: int, dorm: float | str, position: tuple[float, float]) -> None:
         DftBe.__init__(self, element_id, name, Distribution.ERLANG, position)
         self.rate = rate
@@ -234,6 +256,9 @@ class BeErlang(DftBe):
             s += ", dormancy {}".format(self.dorm)
         return s
 
+    def structure_key(self) -> tuple:
+        return super().structure_key() + (self.rate, self.phases, self.dorm)
+
     def compare(self, other: DftElement, respect_ids: bool) -> bool:
         if not super().compare(other, respect_ids):
             return False
@@ -259,6 +284,8 @@ class BeWeibull(DftBe):
     BE with Weibull distribution.
     """
 
+    __slots__ = ("shape", "rate")
+
     def __init__(self, element_id: int, name: str, shape: float | str, rate: float | str, position: tuple[float, float]) -> None:
         DftBe.__init__(self, element_id, name, Distribution.WEIBULL, position)
         self.shape = shape
@@ -275,6 +302,9 @@ class BeWeibull(DftBe):
         s += " weibull, shape {}, rate {}".format(self.shape, self.rate)
         return s
 
+    def structure_key(self) -> tuple:
+        return super().structure_key() + (self.shape, self.rate)
+
     def compare(self, other: DftElement, respect_ids: bool) -> bool:
         if not super().compare(other, respect_ids):
             return False
@@ -297,6 +327,8 @@ class BeLognormal(DftBe):
     BE with log-normal distribution.
     """
 
+    __slots__ = ("mean", "stddev")
+
     def __init__(self, element_id: int, name: str, mean: float | str, stddev: float | str, position: tuple[float, float]) -> None:
         DftBe.__init__(self, element_id, name, Distribution.LOGNORMAL, position)
         self.mean = mean
@@ -313,6 +345,9 @@ class BeLognormal(DftBe):
         s += " lognormal, mean {}, stddev {}".format(self.mean, self.stddev)
         return s
 
+    def structure_key(self) -> tuple:
+        return super().structure_key() + (self.mean, self.stddev)
+
     def compare(self, other: DftElement, respect_ids: bool) -> bool:
         if not super().compare(other, respect_ids):
             return False
@@ -15,18 +15,68 @@ class ElementType(StrEnum):
     MUTEX = "mutex"
 
 
+# Number of parents/children from which on an additional index for constant-time lookups is maintained
+ADJACENCY_INDEX_THRESHOLD = 16
+
+# Slots which are not copied by DftElement.copy_unlinked() as they describe the graph structure
+_UNCOPIED_SLOTS = frozenset(("_ingoing", "_ingoing_index", "_outgoing", "_outgoing_counts", "_dft"))
+# Cache of copied slots per element class
+_copied_slots_cache: dict[type, tuple[str, ...]] = dict()
+
+
+def _copied_slots(cls: type) -> tuple[str, ...]:
+    """
+    Get all slots of the element class (including the slots of base classes) which hold the attributes of an element.
+    :param cls: Element class.
+    :return: Tuple of slot names.
+    """
+    if cls not in _copied_slots_cache:
+        slots = []
+        for base in cls.__mro__:
+            for slot in base.__dict__.get("__slots__", ()):
+                if slot not in _UNCOPIED_SLOTS:
+                    slots.append(slot)
+        _copied_slots_cache[cls] = tuple(slots)
+    return _copied_slots_cache[cls]
+
+
 class DftElement:
     """
     Base class for a DFT element.
     """
 
+    __slots__ = ("element_id", "_name", "element_type", "position", "_ingoing", "_ingoing_index", "relevant", "_dft")
+
     def __init__(self, element_id: int, name: str, element_type: ElementType, position: tuple[float, float]) -> None:
         self.element_id: int = element_id
-        self.name: str = name
+        self._name: str = name
         self.element_type: ElementType = element_type
         self.position: tuple[float, float] = position
         self._ingoing: list[DftElement] = []
+        # Positions of each parent in _ingoing (only maintained for many parents)
+        self._ingoing_index: dict[DftElement, list[int]] | None = None
         self.relevant: bool = False
+        # DFT containing this element (set when the element is added to a DFT)
+        self._dft: "dftlib.storage.dft.Dft | None" = None
+
+    @property
+    def name(self) -> str:
+        """
+        Get name.
+        :return: Name.
+        """
+        return self._name
+
+    @name.setter
+    def name(self, name: str) -> None:
+        """
+        Set name.
+        If the element is part of a DFT, the name must be unique within the DFT.
+        :param name: New name.
+        """
+        if self._dft is not None:
+            self._dft.update_name(self, name)
+        self._name = name
 
     def is_dynamic(self) -> bool:
         """
@@ -49,21 +99,141 @@ class DftElement:
         """
         return not self.is_be()
 
+    def _add_parent(self, element: "DftElement") -> None:
+        """
+        Add parent.
+        Should only be called from DftGate when adding a child.
+        :param element: Parent to add.
+        """
+        self._record(self._undo_add_parent, self._ingoing_index is not None)
+        self._ingoing.append(element)
+        if self._ingoing_index is not None:
+            self._ingoing_index.setdefault(element, []).append(len(self._ingoing) - 1)
+        elif len(self._ingoing) > ADJACENCY_INDEX_THRESHOLD:
+            self._ingoing_index = dict()
+            for position, parent in enumerate(self._ingoing):
+                self._ingoing_index.setdefault(parent, []).append(position)
+
+    def _undo_add_parent(self, had_index: bool) -> None:
+        """
+        Revert the last call of _add_parent().
+        :param had_index: Whether the index of parents existed before.
+        """
+        element = self._ingoing.pop()
+        if not had_index:
+            self._ingoing_index = None
+        elif self._ingoing_index is not None:
+            positions = self._ingoing_index[element]
+            positions.pop()
+            if not positions:
+                del self._ingoing_index[element]
+        self._changed()
+
     def remove_parent(self, element: "DftElement") -> None:
         """
         Remove parent.
+        For elements with many parents, the removal takes constant time but does not preserve the order of the parents.
         :param element: Parent to remove.
         """
-        assert element in self._ingoing
-        self._ingoing.remove(element)
+        had_index = self._ingoing_index is not None
+        if self._ingoing_index is None:
+            assert element in self._ingoing
+            position = self._ingoing.index(element)
+            del self._ingoing[position]
+        else:
+            # Move last parent to the position of the removed parent
+            positions = self._ingoing_index[element]
+            position = positions.pop()
+            if not positions:
+                del self._ingoing_index[element]
+            last = self._ingoing.pop()
+            if position < len(self._ingoing):
+                self._ingoing[position] = last
+                last_positions = self._ingoing_index[last]
+                last_positions[last_positions.index(len(self._ingoing))] = position
+            if len(self._ingoing) <= ADJACENCY_INDEX_THRESHOLD // 2:
+                self._ingoing_index = None
+        self._record(self._undo_remove_parent, element, position, had_index)
+        self._changed()
+
+    def _undo_remove_parent(self, element: "DftElement", position: int, had_index: bool) -> None:
+        """
+        Revert a call of remove_parent().
+        :param element: Removed parent.
+        :param position: Position of the removed parent.
+        :param had_index: Whether the index of parents existed before the removal.
+        """
+        if not had_index:
+            self._ingoing.insert(position, element)
+        else:
+            # The parent which was moved to the position goes back to the end
+            if position < len(self._ingoing):
+                moved = self._ingoing[position]
+                self._ingoing[position] = element
+                self._ingoing.append(moved)
+                if self._ingoing_index is not None:
+                    moved_positions = self._ingoing_index[moved]
+                    moved_positions[moved_positions.index(position)] = len(self._ingoing) - 1
+            else:
+                self._ingoing.append(element)
+            if self._ingoing_index is not None:
+                self._ingoing_index.setdefault(element, []).append(position)
+            else:
+                self._ingoing_index = dict()
+                for parent_position, parent in enumerate(self._ingoing):
+                    self._ingoing_index.setdefault(parent, []).append(parent_position)
+        self._changed()
+
+    def has_parent(self, element: "DftElement") -> bool:
+        """
+        Check whether the given element is a parent.
+        :param element: Element.
+        :return: True iff element is a parent.
+        """
+        if self._ingoing_index is None:
+            return element in self._ingoing
+        return element in self._ingoing_index
+
+    def _record(self, undo, *args) -> None:
+        """
+        Record a change in the journal of the containing DFT if a transaction is open.
+        :param undo: Function reverting the change.
+        :param args: Arguments for the function.
+        """
+        if self._dft is not None and self._dft._journal is not None:
+            self._dft._journal.append((undo, args))
+
+    def _changed(self) -> None:
+        """
+        Notify the containing DFT that the structure around this element changed.
+        """
+        if self._dft is not None:
+            self._dft.mark_changed(self)
 
     def parents(self) -> list["dftlib.storage.dft_gates.DftGate"]:
         """
         Get parents.
+        The order of the parents is not meaningful and can change when parents are removed.
+        The list must not be modified directly.
         :return: List of parents.
         """
         return self._ingoing
 
+    def copy_unlinked(self) -> "DftElement":
+        """
+        Get copy of the element with the same id, name and parameters but without parents and children.
+        The copy does not belong to any DFT.
+        :return: Copy of the element.
+        """
+        cls = type(self)
+        copy = cls.__new__(cls)
+        for slot in _copied_slots(cls):
+            setattr(copy, slot, getattr(self, slot))
+        copy._ingoing = []
+        copy._ingoing_index = None
+        copy._dft = None
+        return copy
+
     def set_relevant(self, relevant: bool = True) -> None:
         """
         Set whether the element is relevant (and will not be set to 'Don't Care' for example).
@@ -105,3 +275,33 @@ class DftElement:
             return False
 
         return True
+
+    def structure_key(self) -> tuple:
+        """
+        Get key describing the type and the parameters of the element.
+        Neither the id, the name nor the children are part of the key.
+        :return: Tuple which is equal for two elements iff their types and parameters are equal.
+        """
+        return (self.element_type,)
+
+    def compare_local(self, other: "DftElement", respect_ids: bool) -> bool:
+        """
+        Compare elements without recursively comparing the children.
+        Children are only identified by their id or name.
+        :param other: Other element.
+        :param respect_ids: Whether the ids must be equal. If False, children are identified by their names.
+        :return: True iff both elements are equal and have the same children.
+        """
+        if respect_ids and self.element_id != other.element_id:
+            return False
+        if self.structure_key() != other.structure_key():
+            return False
+        if self.is_gate():
+            if respect_ids:
+                keys = [child.element_id for child in self.children()]
+                other_keys = [child.element_id for child in other.children()]
+            else:
+                keys = [child.name for child in self.children()]
+                other_keys = [child.name for child in other.children()]
+            return self.successors_key(keys) == other.successors_key(other_keys)
+        return True
@@ -1,6 +1,6 @@
 import dftlib.utility.numbers as numbers
 from dftlib.exceptions.exceptions import DftTypeNotKnownException, DftInvalidArgumentException
-from dftlib.storage.dft_element import DftElement, ElementType
+from dftlib.storage.dft_element import DftElement, ElementType, ADJACENCY_INDEX_THRESHOLD
 
 
 def create_from_json(json: dict, parameters: list[str] | None = None) -> DftElement:
@@ -77,50 +77,152 @@ class DftGate(DftElement):
     Base class for DFT gates.
     """
 
+    __slots__ = ("_outgoing", "_outgoing_counts")
+
     def __init__(self, element_id: int, name: str, element_type: ElementType, children: list[DftElement], position: tuple[float, float]) -> None:
         DftElement.__init__(self, element_id, name, element_type, position)
         assert self.is_gate()
         self._outgoing: list[DftElement] = []
+        # Multiplicity of each child (only maintained for many children).
+        # It makes membership checks constant time, but children stay an ordered list as the order is relevant for PAND, POR, SPARE and SEQ.
+        self._outgoing_counts: dict[DftElement, int] | None = None
         for child in children:
             self.add_child(child)
 
+    def copy_unlinked(self) -> "DftGate":
+        copy = DftElement.copy_unlinked(self)
+        copy._outgoing = []
+        copy._outgoing_counts = None
+        return copy
+
     def add_child(self, element: DftElement) -> None:
         """
         Add child.
         :param element: Child to add.
         """
+        if self._dft is not None:
+            self._dft.check_new_edge(self, element)
+        self._record(self._undo_add_child, self._outgoing_counts is not None)
         self._outgoing.append(element)
-        element._ingoing.append(self)
+        if self._outgoing_counts is not None:
+            self._outgoing_counts[element] = self._outgoing_counts.get(element, 0) + 1
+        elif len(self._outgoing) > ADJACENCY_INDEX_THRESHOLD:
+            self._outgoing_counts = dict()
+            for child in self._outgoing:
+                self._outgoing_counts[child] = self._outgoing_counts.get(child, 0) + 1
+        element._add_parent(self)
+        self._changed()
+        element._changed()
+
+    def _undo_add_child(self, had_counts: bool) -> None:
+        """
+        Revert the last call of add_child().
+        The parent is restored separately by the child.
+        :param had_counts: Whether the multiplicities of children were maintained before.
+        """
+        element = self._outgoing.pop()
+        if had_counts:
+            self._decrease_count(element)
+        else:
+            self._outgoing_counts = None
+        self._changed()
 
     def remove_child(self, element: DftElement) -> None:
         """
         Remove child.
         This element is also removed as parent from the child.
+        The order of the remaining children is kept, so the removal takes time linear in the number of children.
         :param element: Child to remove.
         """
-        assert element in self._outgoing
-        self._outgoing.remove(element)
+        assert self.has_child(element)
+        index = self._outgoing.index(element)
+        del self._outgoing[index]
+        self._decrease_count(element)
+        self._record(self._undo_remove_child, element, index)
         element.remove_parent(self)
+        self._changed()
+
+    def _undo_remove_child(self, element: DftElement, index: int) -> None:
+        """
+        Revert a call of remove_child().
+        The parent is restored separately by the child.
+        :param element: Removed child.
+        :param index: Position of the removed child.
+        """
+        self._outgoing.insert(index, element)
+        if self._outgoing_counts is not None:
+            self._outgoing_counts[element] = self._outgoing_counts.get(element, 0) + 1
+        self._changed()
 
     def replace_child(self, child: DftElement, element: DftElement) -> None:
         """
         Replace given child with new element.
-        Maintains the order.
+        Maintains the order. Finding the position of the child takes time linear in the number of children.
         :param child: Original child to be replaced.
         :param element: Element which will be the new child.
         """
+        if self._dft is not None:
+            self._dft.check_new_edge(self, element)
         index = self._outgoing.index(child)  # A ValueError is raised if the child was not found
-        self._outgoing[index] = element
+        self._replace_child_at(index, element)
+        self._record(self._replace_child_at, index, child)
         child.remove_parent(self)
-        element._ingoing.append(self)
+        element._add_parent(self)
+        self._changed()
+        element._changed()
+
+    def _replace_child_at(self, index: int, element: DftElement) -> None:
+        """
+        Replace the child at the given position without updating the parents of the children.
+        :param index: Position.
+        :param element: New child.
+        """
+        child = self._outgoing[index]
+        self._outgoing[index] = element
+        self._decrease_count(child)
+        if self._outgoing_counts is not None:
+            self._outgoing_counts[element] = self._outgoing_counts.get(element, 0) + 1
+        self._changed()
+
+    def _decrease_count(self, element: DftElement) -> None:
+        """
+        Decrease multiplicity of child after it was removed once.
+        :param element: Child.
+        """
+        if self._outgoing_counts is not None:
+            if self._outgoing_counts[element] == 1:
+                del self._outgoing_counts[element]
+            else:
+                self._outgoing_counts[element] -= 1
+
+    def has_child(self, element: DftElement) -> bool:
+        """
+        Check whether the given element is a child.
+        The check takes constant time for gates with many children.
+        :param element: Element.
+        :return: True iff element is a child.
+        """
+        if self._outgoing_counts is None:
+            return element in self._outgoing
+        return element in self._outgoing_counts
 
     def children(self) -> list[DftElement]:
         """
         Get children.
+        The list must not be modified directly.
         :return: Ordered list of children.
         """
         return self._outgoing
 
+    def successors_key(self, keys: list) -> tuple:
+        """
+        Combine the keys (e.g., ids or hashes) of the children into a key for all children.
+        For gates where the order of children is irrelevant, the key does not depend on the order.
+        :param keys: Keys of the children in order.
+        :return: Tuple of keys.
+        """
+        return tuple(keys)
+
     def compare_successors(self, other: "DftGate", ordered: bool, respect_ids: bool) -> bool:
         """
         Check whether two gates have the same successors.
@@ -139,13 +241,18 @@ class DftGate(DftElement):
             return True
         else:
             # Use either id or name as unique identifier
-            map_children = {elem.element_id if respect_ids else elem.name: elem for elem in other.children()}
+            # The same successor can occur multiple times
+            map_children = dict()
+            for elem in other.children():
+                map_children.setdefault(elem.element_id if respect_ids else elem.name, []).append(elem)
             for element in self.children():
                 identifier = element.element_id if respect_ids else element.name
                 if identifier in map_children:
-                    if element.compare(map_children[identifier], respect_ids):
+                    if element.compare(map_children[identifier][-1], respect_ids):
                         # Found matching successor
-                        del map_children[identifier]
+                        map_children[identifier].pop()
+                        if not map_children[identifier]:
+                            del map_children[identifier]
                     else:
                         # Not matching
                         return False
@@ -170,9 +277,14 @@ class DftAnd(DftGate):
     AND gate.
     """
 
+    __slots__ = ()
+
     def __init__(self, element_id: int, name: str, children: list[DftElement], position: tuple[float, float]) -> None:
         DftGate.__init__(self, element_id, name, ElementType.AND, children, position)
 
+    def successors_key(self, keys: list) -> tuple:
+        return tuple(sorted(keys))
+
     def compare(self, other: DftElement, respect_ids: bool) -> bool:
         if not super().compare(other, respect_ids):
             return False
@@ -189,9 +301,14 @@ class DftOr(DftGate):
     OR gate.
     """
 
+    __slots__ = ()
+
     def __init__(self, element_id: int, name: str, children: list[DftElement], position: tuple[float, float]) -> None:
         DftGate.__init__(self, element_id, name, ElementType.OR, children, position)
 
+    def successors_key(self, keys: list) -> tuple:
+        return tuple(sorted(keys))
+
     def compare(self, other: DftElement, respect_ids: bool) -> bool:
         if not super().compare(other, respect_ids):
             return False
@@ -208,6 +325,8 @@ class DftVotingGate(DftGate):
     VOTing gate.
     """
 
+    __slots__ = ("voting_threshold",)
+
     def __init__(self, element_id: int, name: str, voting_threshold: int, children: list[DftElement], position: tuple[float, float]) -> None:
         DftGate.__init__(self, element_id, name, ElementType.VOT, children, position)
         self.voting_threshold = int(voting_threshold)
@@ -220,6 +339,12 @@ class DftVotingGate(DftGate):
     def __str__(self) -> str:
         return super().__str__() + ", threshold: {}".format(self.voting_threshold)
 
+    def structure_key(self) -> tuple:
+        return super().structure_key() + (self.voting_threshold,)
+
+    def successors_key(self, keys: list) -> tuple:
+        return tuple(sorted(keys))
+
     def compare(self, other: DftElement, respect_ids: bool) -> bool:
         if not super().compare(other, respect_ids):
             return False
@@ -240,6 +365,8 @@ class DftPriorityGate(DftGate):
     Base class for priority gates.
     """
 
+    __slots__ = ("inclusive",)
+
     def __init__(
         self, element_id: int, name: str, element_type: ElementType, inclusive: bool, children: list[DftElement], position: tuple[float, float]
     ) -> None:
@@ -254,6 +381,9 @@ class DftPriorityGate(DftGate):
     def __str__(self) -> str:
         return super().__str__() + ", {}".format("inclusive" if self.inclusive else "exclusive")
 
+    def structure_key(self) -> tuple:
+        return super().structure_key() + (self.inclusive,)
+
     def compare(self, other: DftElement, respect_ids: bool):
         if not super().compare(other, respect_ids):
             return False
@@ -270,6 +400,8 @@ class DftPand(DftPriorityGate):
     Priority AND gate (PAND).
     """
 
+    __slots__ = ()
+
     def __init__(self, element_id: int, name: str, inclusive: bool, children: list[DftElement], position: tuple[float, float]) -> None:
         DftPriorityGate.__init__(self, element_id, name, ElementType.PAND, inclusive, children, position)
 
@@ -282,6 +414,8 @@ class DftPor(DftPriorityGate):
     Priority OR gate (POR).
     """
 
+    __slots__ = ()
+
     def __init__(self, element_id: int, name: str, inclusive: bool, children: list[DftElement], position: tuple[float, float]) -> None:
         DftPriorityGate.__init__(self, element_id, name, ElementType.POR, inclusive, children, position)
 
@@ -294,6 +428,8 @@ class DftSpare(DftGate):
     SPARE gate.
     """
 
+    __slots__ = ()
+
     def __init__(self, element_id: int, name: str, children: list[DftElement], position: tuple[float, float]) -> None:
         DftGate.__init__(self, element_id, name, ElementType.SPARE, children, position)
 
@@ -313,6 +449,8 @@ class DftDependency(DftGate):
     General class for dependencies (FDEP and PDEP).
     """
 
+    __slots__ = ("probability",)
+
     def __init__(self, element_id: int, name: str, probability: float | str, children: list[DftElement], position: tuple[float, float]) -> None:
         DftGate.__init__(self, element_id, name, ElementType.FDEP if numbers.is_one(probability) else ElementType.PDEP, children, position)
         self.probability = probability
@@ -332,6 +470,13 @@ class DftDependency(DftGate):
     def dependent(self) -> list[DftElement]:
         return self.children()[1:]
 
+    def structure_key(self) -> tuple:
+        return super().structure_key() + (self.probability,)
+
+    def successors_key(self, keys: list) -> tuple:
+        # Trigger is fixed, order of dependent events is irrelevant
+        return tuple(keys[:1]) + tuple(sorted(keys[1:]))
+
     def compare(self, other: DftElement, respect_ids: bool) -> bool:
         if not super().compare(other, respect_ids):
             return False
@@ -362,6 +507,8 @@ class DftSeq(DftGate):
     SEQuence enforcer.
     """
 
+    __slots__ = ()
+
     def __init__(self, element_id: int, name: str, children: list[DftElement], position: tuple[float, float]) -> None:
         DftGate.__init__(self, element_id, name, ElementType.SEQ, children, position)
 
@@ -381,9 +528,14 @@ class DftMutex(DftGate):
     MUTEX restrictor.
     """
 
+    __slots__ = ()
+
     def __init__(self, element_id: int, name: str, children: list[DftElement], position: tuple[float, float]) -> None:
         DftGate.__init__(self, element_id, name, ElementType.MUTEX, children, position)
 
+    def successors_key(self, keys: list) -> tuple:
+        return tuple(sorted(keys))
+
     def compare(self, other: DftElement, respect_ids: bool) -> bool:
         if not super().compare(other, respect_ids):
             return False
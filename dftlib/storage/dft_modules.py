@@ -0,0 +1,226 @@
+from collections import deque
+
+import dftlib.storage.dft_gates as dft_gates
+from dftlib.exceptions.exceptions import DftInvalidArgumentException
+from dftlib.storage.dft_element import DftElement, ElementType
+
+# Element types which are static
+_STATIC_TYPES = frozenset((ElementType.BE, ElementType.AND, ElementType.OR, ElementType.VOT))
+
+
+class DftModules:
+    """
+    Modules of a DFT.
+    Two kinds of modules are computed:
+    - Independent modules: gates whose descendants are only connected to the remaining DFT through the gate itself.
+      They are computed in linear time with the algorithm by Dutuit and Rauzy.
+      Dependencies, SEQ and MUTEX gates are treated as parents of their children, i.e., they connect their children.
+    - Spare modules: the top module (represented by the top level element) and the modules represented by the children of SPARE gates.
+      A module contains all elements reachable via children without going below SPARE gates, together with the dependencies, SEQ and MUTEX gates
+      attached to them.
+    Use Dft.modules() to obtain the modules; the result is cached until the DFT changes.
+    """
+
+    def __init__(self, elements: list[DftElement], top_level_element: DftElement) -> None:
+        """
+        Compute modules.
+        :param elements: All elements of the DFT.
+        :param top_level_element: Top level element.
+        """
+        if top_level_element is None:
+            raise DftInvalidArgumentException("Top level element not defined.")
+        self._top_level = top_level_element
+        self._compute_independent_modules(elements)
+        self._compute_spare_modules(elements)
+
+    def _compute_independent_modules(self, elements: list[DftElement]) -> None:
+        """
+        Compute independent modules with the algorithm by Dutuit and Rauzy.
+        A depth-first search records the date of the first visit, the last visit and the exit of each element.
+        A gate is an independent module iff all its descendants are first visited after the gate was entered and last visited before it was exited.
+        :param elements: All elements.
+        """
+        first: dict[int, int] = dict()
+        last: dict[int, int] = dict()
+        exit_date: dict[int, int] = dict()
+        # Elements in the order of their first visit and their exit
+        preorder: list[DftElement] = []
+        postorder: list[DftElement] = []
+        date = 0
+        # Start with the top level element, afterward the remaining roots (e.g., dependencies) and finally all unvisited elements
+        roots = [self._top_level] + [element for element in elements if not element.parents()] + elements
+        for root in roots:
+            if root.element_id in first:
+                continue
+            date += 1
+            first[root.element_id] = last[root.element_id] = date
+            preorder.append(root)
+            stack = [(root, iter(root.children()) if root.is_gate() else iter(()))]
+            while stack:
+                element, children = stack[-1]
+                for child in children:
+                    date += 1
+                    if child.element_id in first:
+                        last[child.element_id] = date
+                    else:
+                        first[child.element_id] = last[child.element_id] = date
+                        preorder.append(child)
+                        stack.append((child, iter(child.children()) if child.is_gate() else iter(())))
+                        break
+                else:
+                    date += 1
+                    exit_date[element.element_id] = date
+                    postorder.append(element)
+                    stack.pop()
+
+        # Minimal first and maximal last visit of all descendants, computed bottom-up
+        low: dict[int, float] = dict()
+        high: dict[int, float] = dict()
+        # Whether an element or one of its descendants is dynamic
+        dynamic: dict[int, bool] = dict()
+        self._independent: dict[int, DftElement] = dict()
+        self._static: set[int] = set()
+        for element in postorder:
+            element_id = element.element_id
+            minimum, maximum = float("inf"), 0
+            is_dynamic = element.element_type not in _STATIC_TYPES
+            if element.is_gate():
+                for child in element.children():
+                    child_id = child.element_id
+                    minimum = min(minimum, first[child_id], low[child_id])
+                    maximum = max(maximum, last[child_id], high[child_id])
+                    is_dynamic = is_dynamic or dynamic[child_id]
+            low[element_id], high[element_id], dynamic[element_id] = minimum, maximum, is_dynamic
+            if element.is_gate() and element.children() and first[element_id] < minimum and maximum < exit_date[element_id]:
+                self._independent[element_id] = element
+                if not is_dynamic:
+                    self._static.add(element_id)
+
+        # Innermost independent module of each element
+        # Elements first visited within the visit interval of a module are exactly its descendants and the intervals are nested
+        self._innermost: dict[int, DftElement] = dict()
+        open_modules: list[DftElement] = []
+        for element in preorder:
+            while open_modules and exit_date[open_modules[-1].element_id] < first[element.element_id]:
+                open_modules.pop()
+            if element.element_id in self._independent:
+                open_modules.append(element)
+            if open_modules:
+                self._innermost[element.element_id] = open_modules[-1]
+
+    def _compute_spare_modules(self, elements: list[DftElement]) -> None:
+        """
+        Compute the top module and the spare modules together with their hierarchy.
+        :param elements: All elements.
+        """
+        self._representatives: list[DftElement] = [self._top_level]
+        known = {self._top_level.element_id}
+        for element in elements:
+            if isinstance(element, dft_gates.DftSpare):
+                for child in element.children():
+                    if child.element_id not in known:
+                        self._representatives.append(child)
+                        known.add(child.element_id)
+
+        self._modules: dict[int, list[DftElement]] = dict()
+        # Representatives of all modules containing an element
+        self._containing: dict[int, list[DftElement]] = dict()
+        for representative in self._representatives:
+            module = []
+            visited = {representative.element_id}
+            queue = deque([representative])
+            while queue:
+                element = queue.popleft()
+                module.append(element)
+                self._containing.setdefault(element.element_id, []).append(representative)
+                # Go "downwards" and only stop when encountering a BE or a SPARE
+                if element.is_gate() and not isinstance(element, dft_gates.DftSpare):
+                    for child in element.children():
+                        if child.element_id not in visited:
+                            queue.append(child)
+                            visited.add(child.element_id)
+                # Go "sideways" for dependencies and SEQ/MUTEX
+                for parent in element.parents():
+                    if parent.element_id not in visited and isinstance(parent, (dft_gates.DftDependency, dft_gates.DftSeq, dft_gates.DftMutex)):
+                        queue.append(parent)
+                        visited.add(parent.element_id)
+            self._modules[representative.element_id] = module
+
+        # Parent module of each spare module is a module containing the SPARE gate
+        self._parent: dict[int, DftElement] = dict()
+        for representative in self._representatives[1:]:
+            for spare in representative.parents():
+                if isinstance(spare, dft_gates.DftSpare) and spare.element_id in self._containing:
+                    self._parent[representative.element_id] = self._containing[spare.element_id][0]
+                    break
+
+    def independent_modules(self) -> list[DftElement]:
+        """
+        Get all gates which are independent modules.
+        :return: Gates ordered bottom-up.
+        """
+        return list(self._independent.values())
+
+    def is_independent_module(self, element: DftElement) -> bool:
+        """
+        Check whether the element is an independent module.
+        :param element: Element.
+        :return: True iff the element is a gate whose descendants are only connected via the gate itself.
+        """
+        return element.element_id in self._independent
+
+    def is_static_module(self, element: DftElement) -> bool:
+        """
+        Check whether the element is an independent module which only contains static gates and BEs.
+        :param element: Element.
+        :return: True iff the element is a static independent module.
+        """
+        return element.element_id in self._static
+
+    def get_independent_module(self, element: DftElement) -> DftElement | None:
+        """
+        Get the innermost independent module containing the element.
+        :param element: Element.
+        :return: The element itself if it is an independent module, otherwise the closest ancestor which is an independent module.
+            None if no such module exists.
+        """
+        return self._innermost.get(element.element_id)
+
+    def representatives(self) -> list[DftElement]:
+        """
+        Get representatives of the top module and all spare modules.
+        :return: Top level element followed by the children of SPARE gates.
+        """
+        return list(self._representatives)
+
+    def get_module(self, representative: DftElement) -> list[DftElement]:
+        """
+        Get module of the given representative.
+        :param representative: Top level element or child of a SPARE gate.
+        :return: Elements in the module. Empty if the element is no module representative.
+        """
+        return list(self._modules.get(representative.element_id, []))
+
+    def get_representatives(self, element: DftElement) -> list[DftElement]:
+        """
+        Get representatives of the modules (top module and spare modules) containing the element.
+        :param element: Element.
+        :return: Module representatives.
+        """
+        return list(self._containing.get(element.element_id, []))
+
+    def in_spare_module(self, element: DftElement) -> bool:
+        """
+        Check whether the element is part of a spare module.
+        :param element: Element.
+        :return: True iff a module represented by a child of a SPARE gate contains the element.
+        """
+        return any(representative is not self._top_level for representative in self._containing.get(element.element_id, []))
+
+    def get_parent_module(self, representative: DftElement) -> DftElement | None:
+        """
+        Get the module which contains the SPARE gate of the given spare module.
+        :param representative: Representative of a spare module.
+        :return: Representative of the parent module or None for the top module.
+        """
+        return self._parent.get(representative.element_id)
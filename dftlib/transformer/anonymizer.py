@@ -16,9 +16,9 @@ def make_anonymous(dft: Dft, grid_layout: bool = False):
     dist_y = 200
     end_x = 10 * dist_x
     # Make all elements anonymous
+    labels = dict()
     for element in dft.elements.values():
-        element.element_id = counter
-        element.name = "A{}".format(counter)
+        labels[element.element_id] = (counter, "A{}".format(counter))
         if grid_layout:
             element.position = (x, y)
             x += dist_x
@@ -26,3 +26,4 @@ def make_anonymous(dft: Dft, grid_layout: bool = False):
                 x = 0
                 y += dist_y
         counter += 1
+    dft.relabel(labels)
@@ -1,7 +1,8 @@
 from enum import Enum
 
 from dftlib.storage.dft import Dft
-from dftlib.storage.dft_element import DftElement
+from dftlib.storage.dft_ancestors import AncestorClosure, AncestorProperty
+from dftlib.storage.dft_element import DftElement, ElementType
 import dftlib.storage.dft_be as dft_be
 import dftlib.storage.dft_gates as dft_gates
 import dftlib.transformer.trimming as trimming
@@ -100,7 +101,7 @@ def try_split_fdep(dft: Dft, fdep: DftElement) -> bool:
     dependents = fdep.children()[2:].copy()  # Keep first dependent event for original dependency
     for dependent in dependents:
         position = (fdep.position[0] - (50 * pos_add), fdep.position[1] - (75 * pos_add))
-        new_fdep = dft_gates.DftDependency(dft.next_id(), "FDEP_{}_{}".format(fdep.name, pos_add), 1, [trigger, dependent], position)
+        new_fdep = dft_gates.DftDependency(dft.next_id(), dft.get_unique_name("FDEP_{}_{}".format(fdep.name, pos_add)), 1, [trigger, dependent], position)
         dft.add(new_fdep)
         fdep.remove_child(dependent)
         pos_add += 1
@@ -181,15 +182,15 @@ def try_merge_bes_in_or(dft: Dft, or_gate: DftElement) -> bool:
 
     # Update merged BE
     # Set name
-    first_child.name = name
+    first_child.name = dft.get_unique_name(name)
 
     # Set active rate
     if active_rate_str == "":
-        first_child.rate = active_rate_float
+        dft.set_attribute(first_child, "rate", active_rate_float)
     elif active_rate_float > 0:
-        first_child.rate = "{} + ({})".format(active_rate_float, active_rate_str)
+        dft.set_attribute(first_child, "rate", "{} + ({})".format(active_rate_float, active_rate_str))
     else:
-        first_child.rate = active_rate_str
+        dft.set_attribute(first_child, "rate", active_rate_str)
 
     # Compute passive rate
     if passive_rate_str == "":
@@ -201,37 +202,42 @@ def try_merge_bes_in_or(dft: Dft, or_gate: DftElement) -> bool:
 
     # Set dormancy factor
     if isinstance(first_child.rate, float) and isinstance(passive_rate, float):
-        first_child.dorm = passive_rate / first_child.rate
+        dft.set_attribute(first_child, "dorm", passive_rate / first_child.rate)
     elif numbers.is_zero(passive_rate):
-        first_child.dorm = 0
+        dft.set_attribute(first_child, "dorm", 0)
     elif first_child.rate == passive_rate:
-        first_child.dorm = 1
+        dft.set_attribute(first_child, "dorm", 1)
     else:
-        first_child.dorm = "({}) / ({})".format(passive_rate, first_child.rate)
+        dft.set_attribute(first_child, "dorm", "({}) / ({})".format(passive_rate, first_child.rate))
 
     # Repair rate is zero
-    first_child.repair = 0
+    dft.set_attribute(first_child, "repair", 0)
 
     return True
 
 
+class _ImmediateFailure(AncestorProperty):
+    """
+    Index for elements whose failure leads to an immediate failure of the top level element, i.e., the top level element is reachable via OR-gates.
+    """
+
+    def own_value(self, element: DftElement) -> bool:
+        return element.element_id == self._dft.top_level_element.element_id
+
+    def follow(self, element: DftElement, parent: DftElement) -> bool:
+        return isinstance(parent, dft_gates.DftOr)
+
+
 def has_immediate_failure(dft: Dft, gate: DftElement) -> bool:
     """
     Checks whether a failure of the gate leads to an immediate failure of the top level element.
     In other words, all parents are OR-gates.
+    The result is cached in an ancestor index of the DFT.
     :param dft: DFT.
     :param gate: Gate.
     :return: True iff failure leads to system failure.
     """
-    if gate.element_id == dft.top_level_element.element_id:
-        # Gate is top level element
-        return True
-    else:
-        for parent in gate.parents():
-            if isinstance(parent, dft_gates.DftOr):
-                if has_immediate_failure(dft, parent):
-                    return True
-        return False
+    return dft.ancestor_index(_ImmediateFailure).value(gate)
 
 
 def try_remove_dependencies(dft: Dft, dependency: DftElement) -> bool:
@@ -328,21 +334,21 @@ def try_factor_common_cause(dft: Dft, gate: DftElement) -> bool:
     # Create new AND-gate over remaining Or-gates
     # This gate represents the independent failures
     position = (gate.position[0] + 100, gate.position[1] + 150)
-    independent_gate = dft_gates.DftAnd(dft.next_id(), gate.name + "_IndepFailures", gate.children(), position)
+    independent_gate = dft_gates.DftAnd(dft.next_id(), dft.get_unique_name(gate.name + "_IndepFailures"), gate.children(), position)
     dft.add(independent_gate)
 
     # Set element for common cause failures
     # If there are multiple ones, introduce a new gate
     if len(common_causes) > 1:
         position = (gate.position[0] - 100, gate.position[1] + 150)
-        common_cause = dft_gates.DftOr(dft.next_id(), gate.name + "_CommonCauseFailures", common_causes, position)
+        common_cause = dft_gates.DftOr(dft.next_id(), dft.get_unique_name(gate.name + "_CommonCauseFailures"), common_causes, position)
         dft.add(common_cause)
     else:
         common_cause = common_causes[0]
 
     # Create new OR-gate as combination of common causes and independent failures
     position = (gate.position[0], gate.position[1] + 50)
-    or_gate = dft_gates.DftOr(dft.next_id(), gate.name + "_2", [common_cause, independent_gate], position)
+    or_gate = dft_gates.DftOr(dft.next_id(), dft.get_unique_name(gate.name + "_2"), [common_cause, independent_gate], position)
     # Add new gate as single child of existing gate
     # This will be simplified later on with rule REMOVE_SINGLE_SUCCESSOR
     dft.add(or_gate)
@@ -400,7 +406,8 @@ def try_merge_identical_gates(dft: Dft, gate1: DftElement, gate2: DftElement) ->
         return False
 
     # Check if rule is applicable.
-    if not gate1.compare(gate2, respect_ids=False):
+    # Names are unique and therefore identify the children
+    if not gate1.compare_local(gate2, respect_ids=False):
         return False
 
     # Check if both gates are of type AND, OR, VOT, PAND, POR. As both gates have the same type it suffices to check gate1.
@@ -426,12 +433,106 @@ def try_merge_identical_gates(dft: Dft, gate1: DftElement, gate2: DftElement) ->
         # Parent was removed from gate2 by replace_child
 
     # Merge names as well
-    gate1.name += "_" + gate2.name
+    gate1.name = dft.get_unique_name(gate1.name + "_" + gate2.name)
     # Remove gate2
     dft.remove(gate2)
     return True
 
 
+def identical_gates_signature(element: DftElement) -> tuple | None:
+    """
+    Get signature of element for rule #2 (MERGE_IDENTICAL_GATES).
+    Gates which can be merged have the same signature.
+    The signature consists of the structure key (gate type, threshold or inclusive flag) and the children ids.
+    For order-dependent gates the children ids are kept in order, otherwise they are treated as a multiset.
+    :param element: Element.
+    :return: Signature or None if the element can never be merged.
+    """
+    if (
+        isinstance(element, dft_gates.DftAnd)
+        or isinstance(element, dft_gates.DftOr)
+        or isinstance(element, dft_gates.DftVotingGate)
+        or isinstance(element, dft_gates.DftPriorityGate)
+    ):
+        return element.structure_key(), element.successors_key([child.element_id for child in element.children()])
+    else:
+        return None
+
+
+class IdenticalGatesIndex:
+    """
+    Index grouping gates by their signature for rule #2 (MERGE_IDENTICAL_GATES).
+    Only gates within the same bucket need to be compared.
+    Children are identified by their id, i.e., gates whose children are different elements with the same names are not considered identical.
+    """
+
+    def __init__(self, dft: Dft) -> None:
+        # Mapping from signature to elements with this signature (in insertion order)
+        self.buckets: dict[tuple, dict[int, DftElement]] = dict()
+        # Mapping from element id to current signature
+        self.signatures: dict[int, tuple] = dict()
+        for element in dft.elements.values():
+            self.update(dft, element.element_id)
+
+    def update(self, dft: Dft, element_id: int) -> None:
+        """
+        Update the signature of the given element.
+        Must be called for all elements which were added, removed or whose children changed.
+        :param dft: DFT.
+        :param element_id: Element id.
+        """
+        signature = None
+        if element_id in dft.elements:
+            signature = identical_gates_signature(dft.elements[element_id])
+        old_signature = self.signatures.get(element_id)
+        if old_signature is not None and old_signature == signature:
+            # Update element object as it could have been replaced
+            self.buckets[signature][element_id] = dft.elements[element_id]
+            return
+        if old_signature is not None:
+            bucket = self.buckets[old_signature]
+            del bucket[element_id]
+            if not bucket:
+                del self.buckets[old_signature]
+            del self.signatures[element_id]
+        if signature is not None:
+            self.buckets.setdefault(signature, dict())[element_id] = dft.elements[element_id]
+            self.signatures[element_id] = signature
+
+    def candidates(self, element: DftElement) -> list[DftElement]:
+        """
+        Get all other gates which have the same signature as the given element.
+        :param element: Element.
+        :return: List of candidate gates for merging.
+        """
+        signature = self.signatures.get(element.element_id)
+        if signature is None:
+            return []
+        return [elem for elem_id, elem in self.buckets[signature].items() if elem_id != element.element_id]
+
+    def candidate_pairs(self, dft: Dft) -> list[tuple[DftElement, DftElement]]:
+        """
+        Get all pairs of gates with the same signature.
+        The pairs are ordered in the same way as itertools.combinations(dft.elements.values(), 2) would yield them.
+        :param dft: DFT.
+        :return: List of pairs (gate1, gate2).
+        """
+        position = None
+        pairs = []
+        for bucket in self.buckets.values():
+            if len(bucket) <= 1:
+                continue
+            if position is None:
+                position = {elem_id: i for i, elem_id in enumerate(dft.elements.keys())}
+            members = sorted(bucket.values(), key=lambda elem: position[elem.element_id])
+            for i in range(len(members)):
+                for j in range(i + 1, len(members)):
+                    pairs.append((members[i], members[j]))
+        if pairs:
+            pairs.sort(key=lambda pair: (position[pair[0].element_id], position[pair[1].element_id]))
+        return pairs
+
+
 def try_remove_gates_with_one_successor(dft: Dft, gate: DftElement) -> bool:
     """
     (Rule #3): Remove gates with just one successor.
@@ -514,7 +615,7 @@ def try_flatten_gate(dft: Dft, gate: DftElement) -> bool:
         # Add children of AND or OR to parent gate
         # The order is irrelevant here
         for child in gate.children():
-            if child not in parent.children():
+            if not parent.has_child(child):
                 parent.add_child(child)
 
     # Delete gate
@@ -550,7 +651,7 @@ def try_subsumption(dft: Dft, gate: DftElement) -> bool:
 
     # Check if a child occurs in both gate and parent
     for child in gate.children():
-        if child in parent.children():
+        if parent.has_child(child):
             # Can remove gate
             dft.remove(gate)
             return True
@@ -569,6 +670,7 @@ def add_or_as_predecessor(dft: Dft, element: DftElement, name: str | None = None
     """
     if name is None:
         name = "OR_{}".format(dft.next_id())
+    name = dft.get_unique_name(name)
     # Create empty OR-gate
     position = (element.position[0] - 100, element.position[1] - 150)
     or_gate = dft_gates.DftOr(dft.next_id(), name, [], position)
@@ -585,48 +687,53 @@ def add_or_as_predecessor(dft: Dft, element: DftElement, name: str | None = None
     return or_gate
 
 
+class _DynamicPredecessor(AncestorProperty):
+    """
+    Index for elements with at least one dynamic element (except a dependency) in their predecessor closure.
+    The search stops at the top level element.
+    """
+
+    def own_value(self, element: DftElement) -> bool:
+        return element.is_dynamic() and not isinstance(element, dft_gates.DftDependency)
+
+    def follow(self, element: DftElement, parent: DftElement) -> bool:
+        return element.element_id != self._dft.top_level_element.element_id
+
+
 def check_dynamic_predecessor(dft: Dft, element: DftElement) -> bool:
     """
     Check whether element has at least one dynamic element (except a dependency) in its predecessor closure.
-    Performs DFS of predecessors.
+    The result is cached in an ancestor index of the DFT.
     :param dft: DFT.
     :param element: Element.
     :return: True iff the predecessor closure of element contains at least one dynamic element.
     """
-    if element.is_dynamic() and not isinstance(element, dft_gates.DftDependency):
-        return True
-    if element.element_id == dft.top_level_element.element_id:
-        return False
-    for elem in element.parents():
-        if check_dynamic_predecessor(dft, elem):
-            return True
-    return False
+    return dft.ancestor_index(_DynamicPredecessor).value(element)
+
+
+class _CycleClosure(AncestorClosure):
+    """
+    Predecessor closure used for the cycle check.
+    The closure does not continue above the top level element and above dynamic elements except dependencies and restrictors.
+    """
+
+    def follow(self, element: DftElement, parent: DftElement) -> bool:
+        if element.element_id == self._dft.top_level_element.element_id:
+            return False
+        return not element.is_dynamic() or isinstance(element, (dft_gates.DftDependency, dft_gates.DftSeq, dft_gates.DftMutex))
 
 
 def _check_for_cycle(dft: Dft, element: DftElement, current: DftElement) -> bool:
     """
     Check for cycle by checking whether element contains itself in its predecessor closure.
     The cycle check excludes dependencies and restrictors.
+    The predecessor closures are cached in an ancestor index of the DFT.
     :param dft: DFT.
     :param element: Element to search for.
     :param current: Current element.
     :return: True iff the predecessor closure of current contains element.
     """
-    if current.element_id == element.element_id:
-        return True
-    if (
-        current.is_dynamic()
-        and not isinstance(current, dft_gates.DftDependency)
-        and not isinstance(current, dft_gates.DftSeq)
-        and not isinstance(current, dft_gates.DftMutex)
-    ):
-        return False
-    if current.element_id == dft.top_level_element.element_id:
-        return False
-    for parent in current.parents():
-        if _check_for_cycle(dft, element, parent):
-            return True
-    return False
+    return dft.ancestor_index(_CycleClosure).is_ancestor(element, current)
 
 
 def try_replace_fdep_by_or(dft: Dft, fdep: DftElement) -> bool:
@@ -650,15 +757,12 @@ def try_replace_fdep_by_or(dft: Dft, fdep: DftElement) -> bool:
     dependent = fdep.dependent()[0]
 
     # Check if both trigger and dependent are part of the top module
-    top_module = dft.get_module(dft.top_level_element)
-    if trigger.element_id not in top_module or dependent.element_id not in top_module:
+    modules = dft.modules()
+    top_level = dft.top_level_element
+    if not all(any(module is top_level for module in modules.get_representatives(element)) for element in (trigger, dependent)):
         # Check if either the two elements is part of a spare module
-        for elem in dft.elements.values():
-            if isinstance(elem, dft_gates.DftSpare):
-                spare_module = dft.get_module(elem)
-                if trigger.element_id in spare_module or dependent.element_id in spare_module:
-                    # One of the two elements is part of a spare module
-                    return False
+        if modules.in_spare_module(trigger) or modules.in_spare_module(dependent):
+            return False
         # Elements are "outside" the top module
 
     # Check if dependent has some dynamic elements in the predecessor closure
@@ -699,7 +803,7 @@ def try_remove_superfluous_fdep(dft: Dft, fdep: DftElement) -> bool:
     # Trigger is single parent of dependent (apart from fdep)
     if len(dependent.parents()) > 2:
         return False
-    if trigger not in dependent.parents():
+    if not dependent.has_parent(trigger):
         return False
 
     if isinstance(trigger, dft_gates.DftAnd):
@@ -748,12 +852,14 @@ def try_remove_fdep_successors(dft: Dft, fdep: DftElement) -> bool:
     dependent = fdep.dependent()[0]
 
     # Dependent has single parent (apart from fdep)
-    if len(dependent.parents()) > 2:
+    # The order of parents is not preserved, therefore the parent is identified by excluding the fdep
+    parents = [parent for parent in dependent.parents() if parent != fdep]
+    if len(parents) != 1:
         return False
-    parent = dependent.parents()[0] if not isinstance(dependent, dft_gates.DftDependency) else dependent.parents()[1]
+    parent = parents[0]
 
     # Trigger has the same parent
-    if trigger not in parent.children():
+    if not parent.has_child(trigger):
         return False
 
     if isinstance(parent, dft_gates.DftOr):
@@ -1,10 +1,13 @@
-import itertools
 import logging
+import time
+from collections import deque
+from enum import Enum
 
+import dftlib.storage.dft_gates as dft_gates
 from dftlib.exceptions.exceptions import DftInvalidArgumentException
 from dftlib.storage.dft import Dft
-from dftlib.storage.dft_element import DftElement
-from dftlib.transformer.rewrite_rules import RewriteRules
+from dftlib.storage.dft_element import DftElement, ElementType
+from dftlib.transformer.rewrite_rules import RewriteRules, IdenticalGatesIndex
 
 """
 Simplify DFT structure by graph rewriting.
@@ -15,6 +18,183 @@ https://doi.org/10.1007/s00165-016-0412-0
 """
 
 
+class SimplificationStrategy(Enum):
+    """
+    Strategies for finding the next rewrite during simplification.
+    """
+
+    # Rescan all elements for all rules after each rewrite
+    RESTART = 0
+    # Only revisit elements in the neighbourhood of previous rewrites
+    WORKLIST = 1
+    # Apply all non-overlapping matches of a rule in one scan before rescanning
+    SWEEP = 2
+
+
+class ValidationLevel(Enum):
+    """
+    Levels of validating the DFT during simplification.
+    """
+
+    # Validate the complete DFT after each rewrite
+    STEP = 0
+    # Validate the complete DFT once after all rewrites
+    END = 1
+    # Only validate the elements changed by each rewrite
+    INCREMENTAL = 2
+
+
+# Rules whose applicability depends on non-local information (predecessor closure, modules, siblings of siblings).
+# They are re-checked on all dependencies after each rewrite.
+_DEPENDENCY_RULES = [
+    RewriteRules.REMOVE_DEPENDENCIES_TLE,
+    RewriteRules.REPLACE_FDEP_BY_OR,
+    RewriteRules.REMOVE_SUPERFLUOUS_FDEP,
+    RewriteRules.REMOVE_SUPERFLUOUS_FDEP_SUCCESSORS,
+]
+# Rules which inspect the parent of the candidate gate
+# These rules must also be tried for the children of changed elements
+_PARENT_RULES = [RewriteRules.FLATTEN_GATE, RewriteRules.SUBSUME_GATE]
+
+
+class RuleStatistics:
+    """
+    Statistics of a single rewrite rule during simplification.
+    """
+
+    def __init__(self, rule: RewriteRules) -> None:
+        """
+        Constructor.
+        :param rule: Rewrite rule.
+        """
+        self.rule = rule
+        # Number of times the rule was tried (one scan of all candidates for RESTART, one scheduled element for WORKLIST)
+        self.attempts = 0
+        # Number of successful rewrites
+        self.successes = 0
+        # Number of elements (or pairs of gates for MERGE_IDENTICAL_GATES) the rule was checked on
+        self.candidates = 0
+        # Wall time in seconds spent on trying and applying the rule
+        self.time = 0.0
+        # Number of elements removed and added by the rewrites
+        self.removed = 0
+        self.added = 0
+
+    def get_json(self) -> dict:
+        """
+        Get JSON representation.
+        :return: JSON object.
+        """
+        return {
+            "rule": self.rule.name,
+            "attempts": self.attempts,
+            "successes": self.successes,
+            "candidates": self.candidates,
+            "time": self.time,
+            "removed": self.removed,
+            "added": self.added,
+        }
+
+
+class SimplificationStatistics:
+    """
+    Statistics of a simplification run, collected per rewrite rule.
+    Pass an instance to simplify_dft_rules() to collect the statistics. No statistics are collected otherwise.
+    """
+
+    def __init__(self) -> None:
+        """
+        Constructor.
+        """
+        self.strategy: SimplificationStrategy | None = None
+        # Statistics per rule in the order in which the rules were given
+        self.rules: dict[RewriteRules, RuleStatistics] = dict()
+        # Number of scans over all elements for the strategies RESTART and SWEEP
+        self.scans = 0
+        # Total wall time in seconds including validation
+        self.time = 0.0
+        # Number of elements before and after simplification
+        self.initial_size = 0
+        self.final_size = 0
+
+    def get(self, rule: RewriteRules) -> RuleStatistics:
+        """
+        Get statistics of the given rule.
+        :param rule: Rewrite rule.
+        :return: Statistics of the rule. They are created if they do not exist yet.
+        """
+        statistics = self.rules.get(rule)
+        if statistics is None:
+            statistics = RuleStatistics(rule)
+            self.rules[rule] = statistics
+        return statistics
+
+    def record(self, rule: RewriteRules, candidates: int, rewrites: int, duration: float, dft: Dft, size: int, max_id: int) -> None:
+        """
+        Record an attempt of applying a rule.
+        Added elements are counted via the ids allocated by Dft.next_id() during the attempt.
+        :param rule: Rewrite rule.
+        :param candidates: Number of candidates checked.
+        :param rewrites: Number of successful rewrites.
+        :param duration: Wall time in seconds.
+        :param dft: DFT after the attempt.
+        :param size: Number of elements before the attempt.
+        :param max_id: Maximal id before the attempt.
+        """
+        statistics = self.get(rule)
+        statistics.attempts += 1
+        statistics.candidates += candidates
+        statistics.time += duration
+        if rewrites > 0:
+            added = dft.max_id - max_id
+            statistics.successes += rewrites
+            statistics.added += added
+            statistics.removed += size + added - dft.size()
+
+    def rewrites(self) -> int:
+        """
+        Get total number of rewrites.
+        :return: Number of successful rule applications.
+        """
+        return sum(statistics.successes for statistics in self.rules.values())
+
+    def get_json(self) -> dict:
+        """
+        Get JSON representation.
+        :return: JSON object.
+        """
+        return {
+            "strategy": self.strategy.name if self.strategy is not None else None,
+            "time": self.time,
+            "scans": self.scans,
+            "initial_size": self.initial_size,
+            "final_size": self.final_size,
+            "rewrites": self.rewrites(),
+            "rules": [statistics.get_json() for statistics in self.rules.values()],
+        }
+
+    def __str__(self) -> str:
+        lines = [
+            "{:<36} {:>9} {:>9} {:>11} {:>9} {:>8} {:>8}".format("rule", "attempts", "successes", "candidates", "time [s]", "removed", "added"),
+        ]
+        for statistics in self.rules.values():
+            lines.append(
+                "{:<36} {:>9} {:>9} {:>11} {:>9.3f} {:>8} {:>8}".format(
+                    statistics.rule.name,
+                    statistics.attempts,
+                    statistics.successes,
+                    statistics.candidates,
+                    statistics.time,
+                    statistics.removed,
+                    statistics.added,
+                )
+            )
+        lines.append(
+            "{} rewrites in {} scans and {:.3f}s, {} -> {} elements".format(self.rewrites(), self.scans, self.time, self.initial_size, self.final_size)
+        )
+        return "\n".join(lines)
+
+
 def get_all_rules() -> list[RewriteRules]:
     """
     Get all simplification rules.
@@ -54,41 +234,62 @@ def get_default_rules() -> list[RewriteRules]:
     ]
 
 
-def apply_rules(dft: Dft, rules: list[RewriteRules]) -> tuple[RewriteRules | None, DftElement | None]:
+def apply_rules(dft: Dft, rules: list[RewriteRules], statistics: SimplificationStatistics | None = None) -> tuple[RewriteRules | None, DftElement | None]:
     """
     Try to apply the given rewrite rules (of "Fault trees on a diet").
     The function stops if either a rule could be applied or no change could be made.
     :param dft: DFT.
     :param rules: Rewrite rules to apply. They are specified as a list of type RewriteRules.
+    :param statistics: Statistics to record the attempts in. None if no statistics should be collected.
     :return: Tuple (rewrite rule, element) if the rewrite rule could be applied to element. Returns (None, None) if no rule could be applied.
     """
     if RewriteRules.ADD_SINGLE_OR in rules:
         logging.warning("Rule ADD_SINGLE_OR could lead to non-termination")
 
     for rule in rules:
-        # Get function to execute for rule
-        func = RewriteRules.get_function(rule)
-
-        # Handle special rules
-        if rule == RewriteRules.MERGE_IDENTICAL_GATES:
-            # Iterate over all possible combinations of gates
-            for elem1, elem2 in itertools.combinations(dft.elements.values(), 2):
-                if func(dft, elem1, elem2):
-                    return rule, elem1
-        elif rule == RewriteRules.TRIM:
-            # Try to trim DFT
-            if func(dft):
-                return rule, None
+        if statistics is None:
+            applied, element, _ = _apply_rule(dft, rule)
         else:
-            # Default rules: apply function to all elements
-            for element in dft.elements.values():
-                if func(dft, element):
-                    return rule, element
+            size, max_id = dft.size(), dft.max_id
+            start = time.perf_counter()
+            applied, element, candidates = _apply_rule(dft, rule)
+            statistics.record(rule, candidates, int(applied), time.perf_counter() - start, dft, size, max_id)
+        if applied:
+            return rule, element
 
     # No rule could successfully be applied
     return None, None
 
 
+def _apply_rule(dft: Dft, rule: RewriteRules) -> tuple[bool, DftElement | None, int]:
+    """
+    Try to apply the given rewrite rule to any element.
+    :param dft: DFT.
+    :param rule: Rewrite rule.
+    :return: Tuple (applied, element, number of checked candidates).
+    """
+    # Get function to execute for rule
+    func = RewriteRules.get_function(rule)
+
+    # Handle special rules
+    if rule == RewriteRules.MERGE_IDENTICAL_GATES:
+        # Iterate over all combinations of gates with the same signature
+        pairs = IdenticalGatesIndex(dft).candidate_pairs(dft)
+        for candidates, (elem1, elem2) in enumerate(pairs, 1):
+            if func(dft, elem1, elem2):
+                return True, elem1, candidates
+        return False, None, len(pairs)
+    elif rule == RewriteRules.TRIM:
+        # Try to trim DFT
+        return func(dft), None, 1
+    else:
+        # Default rules: apply function to all elements
+        for candidates, element in enumerate(dft.elements.values(), 1):
+            if func(dft, element):
+                return True, element, candidates
+        return False, None, len(dft.elements)
+
+
 def simplify_dft_all_rules(dft: Dft) -> bool:
     """
     Simplify DFT by applying all available rewrite rules.
@@ -98,60 +299,428 @@ def simplify_dft_all_rules(dft: Dft) -> bool:
     return simplify_dft_rules(dft, get_all_rules())
 
 
-def simplify_dft_rules(dft: Dft, rules: list[RewriteRules]) -> bool:
+def simplify_dft_rules(
+    dft: Dft,
+    rules: list[RewriteRules],
+    strategy: SimplificationStrategy = SimplificationStrategy.RESTART,
+    validation: ValidationLevel = ValidationLevel.INCREMENTAL,
+    statistics: SimplificationStatistics | None = None,
+) -> bool:
     """
     Simplify DFT in place by applying the given rewrite rules of "Fault trees on a diet".
     :param dft: DFT.
     :param rules: Rewrite rules to apply. They are specified as a list of type RewriteRules.
+    :param strategy: Strategy for finding applicable rewrites.
+    :param validation: When to check the validity of the DFT.
+    :param statistics: Statistics which are filled during the simplification. None if no statistics should be collected.
     :return: True iff the DFT changed.
     """
-    logging.debug("Starting simplification with rules {} on {}".format(rules, dft))
-    logging.debug(dft.verbose_str())
+    if statistics is None:
+        return _simplify_dft_rules(dft, rules, strategy, validation, None)
+    statistics.strategy = strategy
+    statistics.initial_size = dft.size()
+    for rule in rules:
+        statistics.get(rule)
+    start = time.perf_counter()
+    try:
+        return _simplify_dft_rules(dft, rules, strategy, validation, statistics)
+    finally:
+        statistics.time += time.perf_counter() - start
+        statistics.final_size = dft.size()
+
+
+def _simplify_dft_rules(
+    dft: Dft,
+    rules: list[RewriteRules],
+    strategy: SimplificationStrategy,
+    validation: ValidationLevel,
+    statistics: SimplificationStatistics | None,
+) -> bool:
+    """
+    Simplify DFT in place with the given strategy and validation level.
+    :param dft: DFT.
+    :param rules: Rewrite rules to apply.
+    :param strategy: Strategy for finding applicable rewrites.
+    :param validation: When to check the validity of the DFT.
+    :param statistics: Statistics or None.
+    :return: True iff the DFT changed.
+    """
+    if logging.getLogger().isEnabledFor(logging.DEBUG):
+        logging.debug("Starting simplification with rules {} on {}".format(rules, dft))
+        logging.debug(dft.verbose_str())
 
+    if strategy == SimplificationStrategy.RESTART:
+        simplify = _simplify_restart
+    elif strategy == SimplificationStrategy.WORKLIST:
+        simplify = _simplify_worklist
+    elif strategy == SimplificationStrategy.SWEEP:
+        simplify = _simplify_sweep
+    else:
+        raise DftInvalidArgumentException("Simplification strategy {} not known".format(strategy))
+
+    if validation == ValidationLevel.STEP:
+        return simplify(dft, rules, dft.check_valid, statistics)
+    elif validation == ValidationLevel.END:
+        simplified = simplify(dft, rules, lambda: None, statistics)
+        dft.check_valid()
+        return simplified
+    elif validation == ValidationLevel.INCREMENTAL:
+        dft.start_incremental_validation()
+        try:
+            return simplify(dft, rules, dft.check_valid_incremental, statistics)
+        finally:
+            dft.stop_incremental_validation()
+    else:
+        raise DftInvalidArgumentException("Validation level {} not known".format(validation))
+
+
+def _simplify_restart(dft: Dft, rules: list[RewriteRules], validate, statistics: SimplificationStatistics | None) -> bool:
+    """
+    Simplify DFT by repeatedly scanning all elements for all rules until no rule is applicable anymore.
+    :param dft: DFT.
+    :param rules: Rewrite rules to apply.
+    :param validate: Function validating the DFT after each rewrite.
+    :param statistics: Statistics or None.
+    :return: True iff the DFT changed.
+    """
     simplified = False
     while True:
-        rule, element = apply_rules(dft, rules)
+        if statistics is not None:
+            statistics.scans += 1
+        rule, element = apply_rules(dft, rules, statistics)
 
         if rule is None:
             # No rule could be applied -> terminate
             break
 
         simplified = True
-        if rule == RewriteRules.SPLIT_FDEPS:
-            logging.debug("Split FDEP: {}".format(element))
-        elif rule == RewriteRules.MERGE_BES:
-            logging.debug("Merged BEs under OR: {}".format(element))
-        elif rule == RewriteRules.TRIM:
-            logging.debug("Trimmed DFT")
-        elif rule == RewriteRules.REMOVE_DEPENDENCIES_TLE:
-            logging.debug("Removed dependency: {}".format(element))
-        elif rule == RewriteRules.REMOVE_DUPLICATES:
-            logging.debug("Removed duplicates in gate {}".format(element))
-        elif rule == RewriteRules.FACTOR_COMMON_CAUSE:
-            logging.debug("Factored out common cause in gate {}".format(element))
-        elif rule == RewriteRules.USE_SPECIALIZED_GATE:
-            logging.debug("Used specialized gate in gate {}".format(element))
-        elif rule == RewriteRules.MERGE_IDENTICAL_GATES:
-            logging.debug("Merged gate {}".format(element))
-        elif rule == RewriteRules.REMOVE_SINGLE_SUCCESSOR:
-            logging.debug("Removed gate with single successor: {}".format(element))
-        elif rule == RewriteRules.ADD_SINGLE_OR:
-            logging.debug("Added single OR: {}".format(element))
-        elif rule == RewriteRules.FLATTEN_GATE:
-            logging.debug("Flattened gate: {}".format(element))
-        elif rule == RewriteRules.SUBSUME_GATE:
-            logging.debug("Subsumed gate: {}".format(element))
-        elif rule == RewriteRules.REPLACE_FDEP_BY_OR:
-            logging.debug("Replaced FDEP by OR: {}".format(element))
-        elif rule == RewriteRules.REMOVE_SUPERFLUOUS_FDEP:
-            logging.debug("Removed superfluous FDEP: {}".format(element))
-        elif rule == RewriteRules.REMOVE_SUPERFLUOUS_FDEP_SUCCESSORS:
-            logging.debug("Removed FDEP with successors: {}".format(element))
-        else:
-            raise DftInvalidArgumentException("Rewrite rule {} not known".format(rule))
+        _log_rewrite(dft, rule, element)
+        validate()
+    return simplified
 
-        # Print new DFT
-        logging.debug(dft.verbose_str())
 
-        dft.check_valid()
+def _simplify_worklist(dft: Dft, rules: list[RewriteRules], validate, statistics: SimplificationStatistics | None) -> bool:
+    """
+    Simplify DFT with a worklist per rule.
+    Initially, all elements are scheduled for all rules.
+    After a rewrite, only the changed elements together with their parents are scheduled again.
+    The children of changed elements are only scheduled for the rules which inspect the parent of a gate.
+    Rules are prioritized in the given order, i.e., a rule is only tried if no element is scheduled for a previous rule.
+    This yields the same rule priorities as the strategy RESTART.
+    :param dft: DFT.
+    :param rules: Rewrite rules to apply.
+    :param validate: Function validating the DFT after each rewrite.
+    :param statistics: Statistics or None.
+    :return: True iff the DFT changed.
+    """
+    if RewriteRules.ADD_SINGLE_OR in rules:
+        logging.warning("Rule ADD_SINGLE_OR could lead to non-termination")
+
+    # Worklist of element ids for each rule together with set for fast membership checks
+    queues = [deque() for _ in rules]
+    queued = [set() for _ in rules]
+    # Flag for each rule without element (TRIM) whether it must be tried again
+    pending = [rule == RewriteRules.TRIM for rule in rules]
+    # Ids of all dependencies for the rules in _DEPENDENCY_RULES
+    dependency_ids = set(elem.element_id for elem in dft.iter_gates(ElementType.FDEP)) | set(elem.element_id for elem in dft.iter_gates(ElementType.PDEP))
+    # Candidate index for merging identical gates
+    gates_index = IdenticalGatesIndex(dft) if RewriteRules.MERGE_IDENTICAL_GATES in rules else None
+
+    def schedule(index: int, element_ids) -> None:
+        for element_id in element_ids:
+            if element_id not in queued[index]:
+                queues[index].append(element_id)
+                queued[index].add(element_id)
+
+    for i, rule in enumerate(rules):
+        if rule != RewriteRules.TRIM:
+            schedule(i, dft.elements.keys())
+
+    simplified = False
+    dft.start_tracking_changes()
+    try:
+        while True:
+            # Find the first rule with scheduled work
+            index = next((i for i in range(len(rules)) if queues[i] or pending[i]), None)
+            if index is None:
+                # No rule could be applied anymore -> terminate
+                break
+
+            rule = rules[index]
+            func = RewriteRules.get_function(rule)
+            element = None
+            if rule != RewriteRules.TRIM:
+                element_id = queues[index].popleft()
+                queued[index].remove(element_id)
+                if element_id not in dft.elements:
+                    # Element was removed in the meantime
+                    continue
+                element = dft.elements[element_id]
+            if statistics is None:
+                applied = _apply_rule_to(dft, rule, func, element, gates_index)
+            else:
+                candidates = len(gates_index.candidates(element)) if rule == RewriteRules.MERGE_IDENTICAL_GATES else 1
+                size, max_id = dft.size(), dft.max_id
+                start = time.perf_counter()
+                applied = _apply_rule_to(dft, rule, func, element, gates_index)
+                statistics.record(rule, candidates, int(applied), time.perf_counter() - start, dft, size, max_id)
+            if rule == RewriteRules.TRIM:
+                pending[index] = False
+
+            if not applied:
+                continue
+
+            simplified = True
+            _log_rewrite(dft, rule, element)
+            validate()
+
+            # Schedule neighbourhood of changed elements
+            touched = []
+            for element_id in dft.pop_changed():
+                if gates_index is not None:
+                    gates_index.update(dft, element_id)
+                if element_id in dft.elements:
+                    touched.append(dft.elements[element_id])
+                    if isinstance(dft.elements[element_id], dft_gates.DftDependency):
+                        dependency_ids.add(element_id)
+                    else:
+                        dependency_ids.discard(element_id)
+                else:
+                    dependency_ids.discard(element_id)
+            neighbourhood = set()
+            successors = set()
+            for elem in touched:
+                neighbourhood.add(elem.element_id)
+                neighbourhood.update(parent.element_id for parent in elem.parents())
+                if elem.is_gate():
+                    # Only gates with a single parent can be flattened or subsumed
+                    successors.update(child.element_id for child in elem.children() if child.is_gate() and len(child.parents()) == 1)
+            neighbourhood = sorted(neighbourhood)
+            successors = sorted(successors)
+            dependencies = sorted(dependency_ids)
+            for i, other_rule in enumerate(rules):
+                if other_rule == RewriteRules.TRIM:
+                    if not pending[i] and not _all_reachable(dft, touched):
+                        pending[i] = True
+                else:
+                    schedule(i, neighbourhood)
+                    if other_rule in _PARENT_RULES:
+                        schedule(i, successors)
+                    if other_rule in _DEPENDENCY_RULES:
+                        schedule(i, dependencies)
+    finally:
+        dft.stop_tracking_changes()
+    return simplified
+
+
+def _simplify_sweep(dft: Dft, rules: list[RewriteRules], validate, statistics: SimplificationStatistics | None) -> bool:
+    """
+    Simplify DFT by sweeps which apply a rule to all matches whose neighbourhoods do not overlap.
+    In each scan, the rules are tried in the given order. The first rule with at least one match is applied in a sweep over all elements.
+    Afterward, the next scan starts again with the first rule. The simplification terminates if no rule matches anymore.
+    Compared to the strategy RESTART, the number of scans depends on the number of sweeps instead of the number of rewrites.
+    :param dft: DFT.
+    :param rules: Rewrite rules to apply.
+    :param validate: Function validating the DFT after each rewrite.
+    :param statistics: Statistics or None.
+    :return: True iff the DFT changed.
+    """
+    if RewriteRules.ADD_SINGLE_OR in rules:
+        logging.warning("Rule ADD_SINGLE_OR could lead to non-termination")
+
+    simplified = False
+    dft.start_tracking_changes()
+    try:
+        while True:
+            if statistics is not None:
+                statistics.scans += 1
+            for rule in rules:
+                if statistics is None:
+                    rewrites, _ = _sweep_rule(dft, rule, validate)
+                else:
+                    size, max_id = dft.size(), dft.max_id
+                    start = time.perf_counter()
+                    rewrites, candidates = _sweep_rule(dft, rule, validate)
+                    statistics.record(rule, candidates, rewrites, time.perf_counter() - start, dft, size, max_id)
+                if rewrites > 0:
+                    simplified = True
+                    break
+            else:
+                # No rule could be applied -> terminate
+                break
+    finally:
+        dft.stop_tracking_changes()
     return simplified
+
+
+def _sweep_rule(dft: Dft, rule: RewriteRules, validate) -> tuple[int, int]:
+    """
+    Apply the rule to all non-overlapping matches in one sweep over the elements.
+    A match overlaps with a previous rewrite of the sweep if the candidate or one of its children was changed by the previous rewrite.
+    Parents are not considered as otherwise all matches below a common parent such as the top level element would overlap.
+    Each rewrite still checks its conditions on the current DFT.
+    Change tracking must be enabled.
+    :param dft: DFT.
+    :param rule: Rewrite rule.
+    :param validate: Function validating the DFT after each rewrite.
+    :return: Tuple (number of rewrites, number of checked candidates).
+    """
+    func = RewriteRules.get_function(rule)
+    if rule == RewriteRules.TRIM:
+        # Trimming is global and therefore applied at most once
+        if not func(dft):
+            return 0, 1
+        _log_rewrite(dft, rule, None)
+        validate()
+        dft.pop_changed()
+        return 1, 1
+
+    if rule == RewriteRules.MERGE_IDENTICAL_GATES:
+        candidates = IdenticalGatesIndex(dft).candidate_pairs(dft)
+    else:
+        candidates = [(element,) for element in dft.elements.values()]
+    # Ids of elements changed by previous rewrites of the sweep (including removed elements)
+    changed: set[int] = set()
+    rewrites = 0
+    for elements in candidates:
+        if any(_overlaps(element, changed) for element in elements):
+            continue
+        if not func(dft, *elements):
+            continue
+        rewrites += 1
+        _log_rewrite(dft, rule, elements[0])
+        validate()
+        changed.update(dft.pop_changed())
+    return rewrites, len(candidates)
+
+
+def _overlaps(element: DftElement, changed: set[int]) -> bool:
+    """
+    Check whether the element or one of its children was changed.
+    :param element: Element.
+    :param changed: Ids of changed elements.
+    :return: True iff a match at the element overlaps with the changed elements.
+    """
+    if element.element_id in changed:
+        return True
+    return element.is_gate() and any(child.element_id in changed for child in element.children())
+
+
+def _apply_rule_to(dft: Dft, rule: RewriteRules, func, element: DftElement | None, gates_index: IdenticalGatesIndex | None) -> bool:
+    """
+    Try to apply the rule to the given element.
+    :param dft: DFT.
+    :param rule: Rewrite rule.
+    :param func: Function implementing the rule.
+    :param element: Element. None for TRIM.
+    :param gates_index: Index of candidate gates for MERGE_IDENTICAL_GATES.
+    :return: True iff the rule was applied.
+    """
+    if rule == RewriteRules.TRIM:
+        return func(dft)
+    elif rule == RewriteRules.MERGE_IDENTICAL_GATES:
+        return _try_merge_identical_gates_with(dft, element, func, gates_index)
+    else:
+        return func(dft, element)
+
+
+def _try_merge_identical_gates_with(dft: Dft, element: DftElement, func, gates_index: IdenticalGatesIndex) -> bool:
+    """
+    Try to merge the given element with any other identical gate.
+    As in apply_rules, the element with the larger id is removed if possible.
+    :param dft: DFT.
+    :param element: Element.
+    :param func: Function implementing the merge.
+    :param gates_index: Index of candidate gates.
+    :return: True iff a merge was performed.
+    """
+    for other in gates_index.candidates(element):
+        first, second = (other, element) if other.element_id < element.element_id else (element, other)
+        if second.element_id == dft.top_level_element.element_id or second.relevant:
+            # Second element cannot be removed
+            first, second = second, first
+        if func(dft, first, second):
+            return True
+    return False
+
+
+def _all_reachable(dft: Dft, elements: list[DftElement]) -> bool:
+    """
+    Check whether all given elements are either relevant or reachable from the top level element in the sense of trimming.
+    If all changed elements are reachable after a rewrite, all other elements which were reachable before are still reachable.
+    :param dft: DFT.
+    :param elements: Elements to check.
+    :return: True iff trimming would not remove any of the given elements.
+    """
+    reachable = set()
+    for element in elements:
+        if element.relevant:
+            continue
+        # Search backwards until the top level element or an element known to be reachable is found
+        visited = {element.element_id}
+        stack = [element]
+        found = False
+        while stack:
+            current = stack.pop()
+            if current.element_id == dft.top_level_element.element_id or current.element_id in reachable:
+                found = True
+                break
+            predecessors = list(current.parents())
+            if isinstance(current, dft_gates.DftDependency) or isinstance(current, dft_gates.DftSeq) or isinstance(current, dft_gates.DftMutex):
+                # Dependencies and restrictors are reached via their BEs
+                predecessors += [child for child in current.children() if child.is_be()]
+            for pred in predecessors:
+                if pred.element_id not in visited:
+                    visited.add(pred.element_id)
+                    stack.append(pred)
+        if not found:
+            return False
+        reachable.add(element.element_id)
+    return True
+
+
+def _log_rewrite(dft: Dft, rule: RewriteRules, element: DftElement | None) -> None:
+    """
+    Log the application of a rewrite rule.
+    :param dft: DFT.
+    :param rule: Applied rewrite rule.
+    :param element: Element the rule was applied to.
+    """
+    if not logging.getLogger().isEnabledFor(logging.DEBUG):
+        # Avoid building the messages and the string of the complete DFT
+        return
+    if rule == RewriteRules.SPLIT_FDEPS:
+        logging.debug("Split FDEP: {}".format(element))
+    elif rule == RewriteRules.MERGE_BES:
+        logging.debug("Merged BEs under OR: {}".format(element))
+    elif rule == RewriteRules.TRIM:
+        logging.debug("Trimmed DFT")
+    elif rule == RewriteRules.REMOVE_DEPENDENCIES_TLE:
+        logging.debug("Removed dependency: {}".format(element))
+    elif rule == RewriteRules.REMOVE_DUPLICATES:
+        logging.debug("Removed duplicates in gate {}".format(element))
+    elif rule == RewriteRules.FACTOR_COMMON_CAUSE:
+        logging.debug("Factored out common cause in gate {}".format(element))
+    elif rule == RewriteRules.USE_SPECIALIZED_GATE:
+        logging.debug("Used specialized gate in gate {}".format(element))
+    elif rule == RewriteRules.MERGE_IDENTICAL_GATES:
+        logging.debug("Merged gate {}".format(element))
+    elif rule == RewriteRules.REMOVE_SINGLE_SUCCESSOR:
+        logging.debug("Removed gate with single successor: {}".format(element))
+    elif rule == RewriteRules.ADD_SINGLE_OR:
+        logging.debug("Added single OR: {}".format(element))
+    elif rule == RewriteRules.FLATTEN_GATE:
+        logging.debug("Flattened gate: {}".format(element))
+    elif rule == RewriteRules.SUBSUME_GATE:
+        logging.debug("Subsumed gate: {}".format(element))
+    elif rule == RewriteRules.REPLACE_FDEP_BY_OR:
+        logging.debug("Replaced FDEP by OR: {}".format(element))
+    elif rule == RewriteRules.REMOVE_SUPERFLUOUS_FDEP:
+        logging.debug("Removed superfluous FDEP: {}".format(element))
+    elif rule == RewriteRules.REMOVE_SUPERFLUOUS_FDEP_SUCCESSORS:
+        logging.debug("Removed FDEP with successors: {}".format(element))
+    else:
+        raise DftInvalidArgumentException("Rewrite rule {} not known".format(rule))
+
+    # Print new DFT
+    logging.debug(dft.verbose_str())
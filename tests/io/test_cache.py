@@ -0,0 +1,110 @@
+import argparse
+import os
+import shutil
+from concurrent.futures import ProcessPoolExecutor
+
+from helpers.helper import get_example_path
+
+import dftlib.io.parser
+from dftlib.io.cache import DftCache, add_cache_argument, cache_from_args
+
+
+def _parse_cached(args):
+    directory, file = args
+    return dftlib.io.parser.parse_dft_file(file, DftCache(directory)).statistics()
+
+
+def test_cache(tmpdir):
+    cache = DftCache(os.path.join(tmpdir, "cache"))
+    file = get_example_path("galileo", "mcs.dft")
+    dft = dftlib.io.parser.parse_dft_file(file)
+
+    # First call parses and stores the DFT
+    cached = dftlib.io.parser.parse_dft_file(file, cache)
+    assert dft.compare(cached, respect_ids=True)
+    entry = cache.entry(cache.key(file))
+    assert os.path.exists(entry)
+    assert cache.size() == os.path.getsize(entry)
+
+    # Second call loads the DFT from the cache
+    os.utime(entry, (0, 0))
+    cached = cache.parse_dft_file(file)
+    assert dft.compare(cached, respect_ids=True)
+    assert os.path.getmtime(entry) > 0
+
+    # Changed content results in a new entry
+    changed_file = os.path.join(tmpdir, "mcs.dft")
+    shutil.copyfile(file, changed_file)
+    assert cache.key(changed_file) == cache.key(file)
+    with open(changed_file, "a") as out_file:
+        out_file.write("// comment\n")
+    assert cache.key(changed_file) != cache.key(file)
+    assert dft.compare(cache.parse_dft_file(changed_file), respect_ids=True)
+    assert len(os.listdir(cache.directory)) == 2
+
+    # Corrupted entries are replaced
+    with open(entry, "wb") as out_file:
+        out_file.write(b"corrupted")
+    assert dft.compare(cache.parse_dft_file(file), respect_ids=True)
+    assert dft.compare(dftlib.io.parser.parse_dft_binary_file(entry), respect_ids=True)
+
+    cache.clear()
+    assert cache.size() == 0
+
+
+def test_cache_arguments(tmpdir):
+    parser = argparse.ArgumentParser()
+    add_cache_argument(parser)
+    assert cache_from_args(parser.parse_args([])) is None
+    directory = os.path.join(tmpdir, "cache")
+    cache = cache_from_args(parser.parse_args(["--cache", directory]))
+    assert isinstance(cache, DftCache)
+    assert cache.directory == directory
+    assert os.path.isdir(directory)
+
+
+def test_cache_corrupted_records(tmpdir):
+    cache = DftCache(os.path.join(tmpdir, "cache"))
+    file = get_example_path("json", "hecs.json")
+    dft = dftlib.io.parser.parse_dft_file(file)
+    entry = cache.entry(cache.key(file))
+    cache.parse_dft_file(file)
+    size = os.path.getsize(entry)
+    # Damage the sections after the valid header
+    for position in range(size // 8, size - 16, size // 8):
+        with open(entry, "r+b") as out_file:
+            out_file.seek(position)
+            out_file.write(b"\xff" * 16)
+        assert dft.compare(cache.parse_dft_file(file), respect_ids=True)
+        assert dft.compare(dftlib.io.parser.parse_dft_binary_file(entry), respect_ids=True)
+
+
+def test_cache_eviction(tmpdir):
+    files = [get_example_path("json", file) for file in ["hecs.json", "all_gates.json", "all_be_distributions.json"]]
+    cache = DftCache(os.path.join(tmpdir, "cache"))
+    for file in files:
+        cache.parse_dft_file(file)
+    entries = [cache.entry(cache.key(file)) for file in files]
+    sizes = [os.path.getsize(entry) for entry in entries]
+    for time, entry in enumerate(entries):
+        os.utime(entry, (time + 1, time + 1))
+    # Use first entry again
+    cache.parse_dft_file(files[0])
+
+    # Least recently used entry is removed
+    cache.max_size = sum(sizes) - 1
+    cache.evict()
+    assert [os.path.exists(entry) for entry in entries] == [True, False, True]
+    cache.max_size = 0
+    cache.evict()
+    assert cache.size() == 0
+
+
+def test_cache_concurrent(tmpdir):
+    directory = os.path.join(tmpdir, "cache")
+    files = [get_example_path("json", file) for file in ["hecs.json", "all_gates.json", "all_be_distributions.json"]]
+    expected = [dftlib.io.parser.parse_dft_file(file).statistics() for file in files]
+    with ProcessPoolExecutor(max_workers=4) as executor:
+        results = list(executor.map(_parse_cached, [(directory, file) for file in files * 4]))
+    assert results == expected * 4
+    assert len(os.listdir(directory)) == len(files)
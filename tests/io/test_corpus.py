@@ -0,0 +1,53 @@
+import os
+import shutil
+import signal
+
+import pytest
+from helpers.helper import get_example_path
+
+import dftlib.io.corpus
+import dftlib.io.parser
+from dftlib.exceptions.exceptions import DftInvalidArgumentException
+
+
+def test_load_corpus(tmpdir):
+    directory = os.path.join(tmpdir, "corpus")
+    shutil.copytree(get_example_path("json"), os.path.join(directory, "json"))
+    shutil.copytree(get_example_path("galileo"), os.path.join(directory, "nested", "galileo"))
+    with open(os.path.join(directory, "invalid.dft"), "w") as out_file:
+        out_file.write('toplevel "A";\n"A" and "B";\n')
+    with open(os.path.join(directory, "readme.md"), "w") as out_file:
+        out_file.write("Not a DFT\n")
+
+    files = dftlib.io.corpus.find_dft_files(directory)
+    assert len(files) == 7
+    assert not any(file.endswith(".md") for file in files)
+
+    for workers, max_in_flight in [(2, None), (1, 1)]:
+        results = list(dftlib.io.corpus.load_corpus(directory, workers=workers, max_in_flight=max_in_flight))
+        assert sorted(result.file for result in results) == files
+        for result in results:
+            if result.file.endswith("invalid.dft"):
+                assert not result.success()
+                assert result.statistics is None
+                assert "error" in str(result)
+            else:
+                assert result.success()
+                assert result.statistics == dftlib.io.parser.parse_dft_file(result.file).statistics()
+
+    with pytest.raises(DftInvalidArgumentException):
+        list(dftlib.io.corpus.load_corpus(os.path.join(tmpdir, "missing")))
+
+
+@pytest.mark.skipif(not hasattr(signal, "setitimer"), reason="Timeout not supported")
+def test_load_corpus_timeout(tmpdir):
+    file = os.path.join(tmpdir, "large.dft")
+    with open(file, "w") as out_file:
+        out_file.write('toplevel "Top";\n')
+        out_file.write('"Top" or {};\n'.format(" ".join('"BE{}"'.format(i) for i in range(20000))))
+        for i in range(20000):
+            out_file.write('"BE{}" lambda=0.5 dorm=0;\n'.format(i))
+    result = dftlib.io.corpus.parse_corpus_file(file, timeout=0.01)
+    assert not result.success()
+    assert "Timeout" in result.error
+    assert dftlib.io.corpus.parse_corpus_file(file, timeout=None).success()
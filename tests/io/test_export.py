@@ -1,8 +1,10 @@
+import io
+import json
 import os
 
-from conftest import stormpy
 from helpers.helper import get_example_path
 
+import dftlib.io.export_binary
 import dftlib.io.export_galileo
 import dftlib.io.export_json
 import dftlib.io.export_txt
@@ -89,7 +91,6 @@ def test_export_json_string_all_be():
     assert dft.compare(dft2, respect_ids=True)
 
 
-@stormpy
 def test_export_galileo_all_gates(tmpdir):
     file = get_example_path("json", "all_gates.json")
     dft = dftlib.io.parser.parse_dft_json_file(file)
@@ -101,7 +102,6 @@ def test_export_galileo_all_gates(tmpdir):
     assert dft.compare(dft2, respect_ids=False)
 
 
-@stormpy
 def test_export_galileo_all_be(tmpdir):
     file = get_example_path("json", "all_be_distributions.json")
     dft = dftlib.io.parser.parse_dft_json_file(file)
@@ -131,3 +131,50 @@ def test_export_txt_string():
 
     txt_string = dftlib.io.export_txt.export_dft_string(dft)
     assert txt_string == "AND(AND(BE0,BE1),AND(BE1,BE0),AND(BE0,BE1),OR(BE0,BE1))"
+
+
+def test_export_txt_shared():
+    dft = dftlib.io.parser.parse_dft_txt_string("G1 = OR(A,B); AND(G1, OR(G1,C))")
+    assert dft.size() == 6
+    assert dftlib.io.export_txt.export_dft_string(dft) == "G0 = OR(BE0,BE1); AND(G0,OR(G0,BE2))"
+
+    # Sharing over many levels only leads to linear growth
+    depth = 50
+    text = "L0 = OR(A0,B0); " + "".join("L{} = AND(L{}, OR(L{}, B{})); ".format(i, i - 1, i - 1, i) for i in range(1, depth)) + "OR(L{}, C)".format(depth - 1)
+    dft = dftlib.io.parser.parse_dft_txt_string(text)
+    txt_string = dftlib.io.export_txt.export_dft_string(dft)
+    assert len(txt_string) < 2 * len(text)
+    dft2 = dftlib.io.parser.parse_dft_txt_string(txt_string)
+    assert dft2.size() == dft.size()
+    assert dft2.structural_hash() == dft.structural_hash()
+
+
+def test_export_json_stream(tmpdir):
+    for file in ["all_gates.json", "parametric.json"]:
+        dft = dftlib.io.parser.parse_dft_json_file(get_example_path("json", file))
+        stream = io.StringIO()
+        dftlib.io.export_json.export_dft_stream(dft, stream, indent=4)
+        assert stream.getvalue() == json.dumps(dft.json(), indent=4)
+
+        tmp_path = os.path.join(tmpdir, file)
+        dftlib.io.export_json.export_dft_file(dft, tmp_path, compact=True)
+        with open(tmp_path) as json_file:
+            text = json_file.read()
+        assert text == json.dumps(dft.json(), separators=(",", ":"))
+        assert dft.compare(dftlib.io.parser.parse_dft_json_string(text), respect_ids=True)
+
+
+def test_export_binary(tmpdir):
+    for file in ["all_gates.json", "all_be_distributions.json", "parametric.json"]:
+        dft = dftlib.io.parser.parse_dft_json_file(get_example_path("json", file))
+        dft.top_level_element.relevant = True
+        tmp_path = os.path.join(tmpdir, file.replace(".json", ".dftb"))
+        dftlib.io.export_binary.export_dft_file(dft, tmp_path)
+        stream = io.BytesIO()
+        dftlib.io.export_binary.export_dft_stream(dft, stream)
+        with open(tmp_path, "rb") as binary_file:
+            assert binary_file.read() == stream.getvalue()
+
+        dft2 = dftlib.io.parser.parse_dft_file(tmp_path)
+        assert dft.compare(dft2, respect_ids=True)
+        assert dft2.json() == dft.json()
@@ -1,9 +1,22 @@
-from conftest import stormpy
+import gzip
+import io
+import math
+import os
+import shutil
+
+import pytest
 from helpers.helper import get_example_path
 
+import dftlib.io.export_binary
+import dftlib.io.export_galileo
 import dftlib.io.export_json
+import dftlib.io.export_txt
+import dftlib.io.formats as formats
 import dftlib.io.parser
 import dftlib.storage.dft_be as dft_be
+import dftlib.storage.dft_gates as dft_gates
+from dftlib.exceptions.exceptions import DftInvalidArgumentException
+from dftlib.storage.dft_array import ARRAY_NAMES
 
 
 def test_load_json():
@@ -16,7 +29,6 @@ def test_load_json():
     assert no_elements == 22
 
 
-@stormpy
 def test_load_galileo():
     file = get_example_path("galileo", "mcs.dft")
     dft = dftlib.io.parser.parse_dft_galileo_file(file)
@@ -39,7 +51,6 @@ def test_load_parametric_json():
     assert len(dft.parameters) == 2
 
 
-@stormpy
 def test_load_parametric_galileo():
     file = get_example_path("galileo", "parametric.dft")
     dft = dftlib.io.parser.parse_dft_galileo_file(file)
@@ -87,3 +98,192 @@ def test_all_be_types():
     assert isinstance(dft.get_element_by_name("E"), dft_be.BeErlang)
     assert isinstance(dft.get_element_by_name("F"), dft_be.BeLognormal)
     assert isinstance(dft.get_element_by_name("G"), dft_be.BeWeibull)
+
+
+def test_galileo_parametric_round_trip(tmpdir):
+    dft = dftlib.io.parser.parse_dft_json_file(get_example_path("json", "parametric.json"))
+    tmp_path = os.path.join(tmpdir, "parametric.dft")
+    dftlib.io.export_galileo.export_dft_file(dft, tmp_path)
+    dft2 = dftlib.io.parser.parse_dft_galileo_file(tmp_path)
+    assert dft.compare(dft2, respect_ids=False)
+    assert dft.parameters == dft2.parameters
+
+
+def test_galileo_syntax():
+    s = """
+    // Forward references, comments and alternative gate types
+    toplevel Top;
+    Top 2of3 "A B" Spare Pdep; /* block
+    comment */ "Pdep" pdep=0.5 "A B" C;
+    "Spare" hsp C D ;
+    "A B" lambda=0.5 dorm=0.3 repair=0.1;
+    C prob=1; D prob=0.2 dorm=1.0;
+    """
+    dft = dftlib.io.parser.parse_dft_galileo_string(s)
+    top = dft.top_level_element
+    assert isinstance(top, dft_gates.DftVotingGate)
+    assert top.voting_threshold == 2
+    assert [child.name for child in top.children()] == ["A B", "Spare", "Pdep"]
+    assert dft.get_element_by_name("Pdep").probability == 0.5
+    assert dft.get_element_by_name("A B").repair == 0.1
+    assert isinstance(dft.get_element_by_name("C"), dft_be.BeConstant)
+    assert isinstance(dft.get_element_by_name("D"), dft_be.BeProbability)
+
+    with pytest.raises(DftInvalidArgumentException):
+        dftlib.io.parser.parse_dft_galileo_string('toplevel "A"; "A" and "B";')
+    with pytest.raises(DftInvalidArgumentException):
+        dftlib.io.parser.parse_dft_galileo_string('toplevel "A"; "A" lambda=1')
+
+
+def test_load_txt_all_gates():
+    s = "OR(VOT2(A, B, C), PAND(A, SPARE(D, E)), POR(B, C), FDEP(F, A), SEQ(D, E), MUTEX(B, C))"
+    dft = dftlib.io.parser.parse_dft_txt_string(s)
+    no_be, no_static, no_dynamic, no_elements = dft.statistics()
+    assert no_be == 6
+    assert no_static == 2
+    assert no_dynamic == 6
+    assert no_elements == 14
+    vot = dft.top_level_element.children()[0]
+    assert isinstance(vot, dft_gates.DftVotingGate)
+    assert vot.voting_threshold == 2
+    assert [child.name for child in dft.get_element_by_name("Pand_5").children()] == ["A", "Spare_6"]
+
+    invalid_texts = ["AND(A,,B)", "AND(A,B", "AND(A),B", "(A,B)", "AND(A)B"]
+    # Invalid definitions
+    invalid_texts += ["G = AND(A,B); G = OR(A,B); G", "G = ; AND(A,B)", "AND(A,B); OR(A,B)", "G = AND(A,B)", "AND(A, G = OR(B,C))"]
+    for invalid in invalid_texts:
+        with pytest.raises(DftInvalidArgumentException):
+            dftlib.io.parser.parse_dft_txt_string(invalid)
+
+
+def test_load_txt_deep():
+    depth = 5000
+    s = "AND(A," * depth + "B" + ")" * depth
+    dft = dftlib.io.parser.parse_dft_txt_string(s)
+    assert dft.size() == depth + 2
+
+
+class _SmallChunkStream(io.StringIO):
+    """
+    Stream which returns only few characters per read to test incomplete values.
+    """
+
+    def read(self, size=-1):
+        return super().read(3)
+
+
+def test_load_json_stream():
+    for file in [get_example_path("json", name) for name in ["hecs.json", "all_gates.json", "all_be_distributions.json", "parametric.json"]]:
+        with open(file) as json_file:
+            text = json_file.read()
+        expected = dftlib.io.parser.parse_dft_json_string(text)
+        dft = dftlib.io.parser.parse_dft_json_stream(_SmallChunkStream(text))
+        assert dft.compare(expected, respect_ids=True)
+        assert list(dft.elements.keys()) == list(expected.elements.keys())
+        assert dft.parameters == expected.parameters
+
+    for invalid in ['{"toplevel": "0"}', '{"nodes": []}', '{"toplevel": "0", "nodes": [}', '{"toplevel": "0", "nodes": []} x']:
+        with pytest.raises((DftInvalidArgumentException, ValueError)):
+            dftlib.io.parser.parse_dft_json_stream(io.StringIO(invalid))
+
+
+def test_load_binary_array(tmpdir):
+    for file in ["all_gates.json", "all_be_distributions.json", "hecs.json"]:
+        dft = dftlib.io.parser.parse_dft_json_file(get_example_path("json", file))
+        tmp_path = os.path.join(tmpdir, file.replace(".json", ".dftb"))
+        dftlib.io.export_binary.export_dft_file(dft, tmp_path)
+        expected = dftlib.io.parser.parse_dft_binary_file(tmp_path).freeze()
+        frozen = dftlib.io.parser.load_dft_array_binary_file(tmp_path)
+        assert frozen.size() == expected.size()
+        assert frozen.top_level_index() == expected.top_level_index()
+        for i in range(frozen.size()):
+            assert frozen.name(i) == expected.name(i)
+            assert frozen.index(dft.get_element_by_name(frozen.name(i)).element_id) == i
+        for name in ARRAY_NAMES:
+            values, expected_values = frozen.get_array(name).tolist(), expected.get_array(name).tolist()
+            assert values == expected_values or all(v == e or (math.isnan(v) and math.isnan(e)) for v, e in zip(values, expected_values))
+
+    # Parametric values cannot be stored in arrays
+    dft = dftlib.io.parser.parse_dft_json_file(get_example_path("json", "parametric.json"))
+    tmp_path = os.path.join(tmpdir, "parametric.dftb")
+    dftlib.io.export_binary.export_dft_file(dft, tmp_path)
+    with pytest.raises(DftInvalidArgumentException):
+        dftlib.io.parser.load_dft_array_binary_file(tmp_path)
+
+
+def test_load_binary_invalid(tmpdir):
+    dft = dftlib.io.parser.parse_dft_json_file(get_example_path("json", "hecs.json"))
+    stream = io.BytesIO()
+    dftlib.io.export_binary.export_dft_stream(dft, stream)
+    data = stream.getvalue()
+
+    invalid = [
+        b"",
+        b"JSON" + data[4:],
+        data[:4] + bytes([99, 0]) + data[6:],
+        data[:-8],
+        data + bytes(8),
+    ]
+    for i, content in enumerate(invalid):
+        tmp_path = os.path.join(tmpdir, "invalid{}.dftb".format(i))
+        with open(tmp_path, "wb") as binary_file:
+            binary_file.write(content)
+        with pytest.raises(DftInvalidArgumentException):
+            dftlib.io.parser.parse_dft_binary_file(tmp_path)
+
+
+def test_load_compressed(tmpdir):
+    dft = dftlib.io.parser.parse_dft_json_file(get_example_path("json", "all_gates.json"))
+    exports = [
+        ("dft.json.gz", dftlib.io.export_json.export_dft_file),
+        ("dft.dft.xz", dftlib.io.export_galileo.export_dft_file),
+        ("dft.dftb.bz2", dftlib.io.export_binary.export_dft_file),
+        ("dft.dftb.gz", dftlib.io.export_binary.export_dft_file),
+    ]
+    for name, export in exports:
+        tmp_path = os.path.join(tmpdir, name)
+        export(dft, tmp_path)
+        assert formats.is_compressed(tmp_path)
+        assert dft.compare(dftlib.io.parser.parse_dft_file(tmp_path), respect_ids=False)
+
+    # Text format
+    dft = dftlib.io.parser.parse_dft_txt_string("AND(OR(A,B),OR(A,C))")
+    tmp_path = os.path.join(tmpdir, "dft.txt.gz")
+    dftlib.io.export_txt.export_dft_file(dft, tmp_path)
+    text = dftlib.io.export_txt.export_dft_string(dft)
+    with gzip.open(tmp_path, "rt") as txt_file:
+        assert txt_file.read() == text
+    assert dftlib.io.parser.parse_dft_txt_string(text).compare(dftlib.io.parser.parse_dft_file(tmp_path), respect_ids=True)
+
+
+def test_detect_format(tmpdir):
+    files = [
+        (get_example_path("json", "hecs.json"), formats.DftFormats.JSON),
+        (get_example_path("galileo", "mcs.dft"), formats.DftFormats.GALILEO),
+        (get_example_path("galileo", "parametric.dft"), formats.DftFormats.GALILEO),
+    ]
+    dft = dftlib.io.parser.parse_dft_json_file(get_example_path("json", "hecs.json"))
+    binary_file = os.path.join(tmpdir, "hecs.dftb")
+    dftlib.io.export_binary.export_dft_file(dft, binary_file)
+    files.append((binary_file, formats.DftFormats.BINARY))
+    txt_file = os.path.join(tmpdir, "dft.txt")
+    dftlib.io.export_txt.export_dft_file(dftlib.io.parser.parse_dft_txt_string("AND(A,B)"), txt_file)
+    files.append((txt_file, formats.DftFormats.TEXT))
+
+    for i, (file, file_format) in enumerate(files):
+        assert formats.detect_format(file) == file_format
+        expected = dftlib.io.parser.parse_dft_file(file)
+        # Without extension the format is detected from the content
+        tmp_path = os.path.join(tmpdir, "model{}".format(i))
+        shutil.copyfile(file, tmp_path)
+        assert formats.get_format(tmp_path) is None
+        assert not formats.is_compressed(tmp_path)
+        assert formats.detect_format(tmp_path) == file_format
+        assert expected.compare(dftlib.io.parser.parse_dft_file(tmp_path), respect_ids=True)
+        # Compression is detected from the content as well
+        compressed_path = os.path.join(tmpdir, "compressed{}".format(i))
+        with open(file, "rb") as in_file, gzip.open(compressed_path, "wb") as out_file:
+            shutil.copyfileobj(in_file, out_file)
+        assert formats.is_compressed(compressed_path)
+        assert formats.detect_format(compressed_path) == file_format
+        assert expected.compare(dftlib.io.parser.parse_dft_file(compressed_path), respect_ids=True)
@@ -1,3 +1,6 @@
+import random
+
+import pytest
 from conftest import stormpy
 from helpers.helper import get_example_path
 
@@ -6,6 +9,9 @@ import dftlib.storage.dft as dfts
 import dftlib.storage.dft_be as dft_be
 import dftlib.storage.dft_gates as dft_gates
 import dftlib.tools.stormpy as sp
+from dftlib.storage.dft_ancestors import AncestorClosure, AncestorProperty
+from dftlib.storage.dft_element import ElementType
+from dftlib.exceptions.exceptions import DftInvalidArgumentException
 
 
 def test_create_dft():
@@ -28,6 +34,40 @@ def test_create_dft():
     dft.check_valid()
 
 
+def test_element_names():
+    dft = dfts.Dft()
+
+    be_a = dft_be.BeExponential(dft.next_id(), "A", 5.0, 1, 0, (0, 0))
+    dft.add(be_a)
+    be_b = dft_be.BeExponential(dft.next_id(), "B", 3.0, 1, 0, (2, 2))
+    dft.add(be_b)
+    or_t = dft_gates.DftOr(dft.next_id(), "T", [be_a, be_b], (10, 10))
+    dft.add(or_t)
+    dft.set_top_level_element(or_t.element_id)
+    assert dft.get_element_by_name("B") is be_b
+
+    # Name collisions are detected on insert
+    with pytest.raises(DftInvalidArgumentException):
+        dft.add(dft_be.BeExponential(dft.next_id(), "A", 1.0, 1, 0, (0, 0)))
+    assert dft.get_unique_name("A") == "A_1"
+    assert dft.get_unique_name("C") == "C"
+
+    # Renaming updates the lookup
+    be_b.name = "C"
+    assert not dft.has_name("B")
+    assert dft.get_element_by_name("C") is be_b
+    with pytest.raises(DftInvalidArgumentException):
+        be_b.name = "A"
+
+    # Removal and replacement
+    dft.remove(be_b)
+    assert not dft.has_name("C")
+    and_t = dft_gates.DftAnd(or_t.element_id, "T", or_t.children(), or_t.position)
+    dft.replace(or_t, and_t)
+    assert dft.get_element_by_name("T") is and_t
+    dft.check_valid()
+
+
 @stormpy
 def test_convert_stormpy_dft():
     file = get_example_path("galileo", "mcs.dft")
@@ -43,3 +83,471 @@ def test_convert_stormpy_dft():
     assert sp_dft.nr_be() == 12
     assert sp_dft.nr_dynamic() == 5
     assert sp_dft.nr_elements() == 21
+
+
+def test_elements_without_dict():
+    file = get_example_path("json", "all_gates.json")
+    dft = dftlib.io.parser.parse_dft_json_file(file)
+    file = get_example_path("json", "all_be_distributions.json")
+    dft2 = dftlib.io.parser.parse_dft_json_file(file)
+    for element in list(dft.elements.values()) + list(dft2.elements.values()):
+        assert not hasattr(element, "__dict__")
+
+
+def test_high_fan_in():
+    dft = dfts.Dft()
+    be_power = dft_be.BeExponential(dft.next_id(), "Power", 1.0, 1, 0, (0, 0))
+    dft.add(be_power)
+    gates = []
+    for i in range(100):
+        be = dft_be.BeExponential(dft.next_id(), "B{}".format(i), 1.0, 1, 0, (0, 0))
+        dft.add(be)
+        gate = dft_gates.DftOr(dft.next_id(), "G{}".format(i), [be, be_power], (0, 0))
+        dft.add(gate)
+        gates.append(gate)
+    top = dft_gates.DftVotingGate(dft.next_id(), "Top", 50, gates + [gates[0]], (0, 0))
+    dft.add(top)
+    dft.set_top_level_element(top.element_id)
+    assert len(be_power.parents()) == 100
+    assert top.has_child(gates[0])
+    dft.check_valid()
+
+    # Remove every second gate
+    for gate in gates[::2]:
+        dft.remove(gate)
+    assert len(be_power.parents()) == 50
+    assert set(be_power.parents()) == set(gates[1::2])
+    assert all(be_power.has_parent(gate) for gate in gates[1::2])
+    assert not any(be_power.has_parent(gate) for gate in gates[::2])
+    # Order of remaining children is kept
+    assert top.children() == gates[1::2]
+    assert not top.has_child(gates[0])
+
+    # Replace child
+    top.replace_child(gates[1], be_power)
+    assert top.children()[0] == be_power
+    assert top.has_child(be_power)
+    assert not top.has_child(gates[1])
+    assert be_power.has_parent(top)
+    dft.remove(be_power)
+    assert not top.has_child(be_power)
+    for gate in gates[1::2]:
+        assert len(gate.children()) == 1
+
+
+def test_element_type_counters():
+    file = get_example_path("json", "all_gates.json")
+    dft = dftlib.io.parser.parse_dft_json_file(file)
+    assert dft.statistics() == (19, 5, 18, 42)
+    assert dft.number_of_be() == 19
+    assert len(list(dft.iter_bes())) == 19
+    assert len(list(dft.iter_gates())) == 23
+    assert all(isinstance(gate, dft_gates.DftSpare) for gate in dft.iter_gates(ElementType.SPARE))
+    no_spares = dft.number_of_elements(ElementType.SPARE)
+    assert len(list(dft.iter_gates(ElementType.SPARE))) == no_spares
+
+    # Counters are updated
+    spare = next(dft.iter_gates(ElementType.SPARE))
+    dft.remove(spare)
+    assert dft.number_of_elements(ElementType.SPARE) == no_spares - 1
+    vot = next(dft.iter_gates(ElementType.VOT))
+    and_gate = dft_gates.DftAnd(vot.element_id, vot.name, vot.children(), vot.position)
+    dft.replace(vot, and_gate)
+    assert and_gate in dft.iter_gates(ElementType.AND)
+    assert vot not in dft.iter_gates(ElementType.VOT)
+    assert dft.statistics() == (19, 5, 17, 41)
+
+
+def test_cycle_detection():
+    # Deep chain of gates
+    dft = dfts.Dft()
+    element = dft_be.BeExponential(dft.next_id(), "B", 1.0, 1, 0, (0, 0))
+    dft.add(element)
+    bottom = element
+    for i in range(20000):
+        element = dft_gates.DftOr(dft.next_id(), "G{}".format(i), [element], (0, 0))
+        dft.add(element)
+    dft.set_top_level_element(element.element_id)
+    assert not dft.is_cyclic()
+    dft.check_valid()
+
+    # Incremental check rejects edge closing a cycle
+    dft.enable_incremental_cycle_check()
+    middle = dft.get_element_by_name("G100")
+    with pytest.raises(DftInvalidArgumentException, match="cycle"):
+        middle.add_child(element)
+    assert not middle.has_child(element)
+    assert not dft.is_cyclic()
+    middle.add_child(bottom)
+    # Edges of dependencies are not relevant for cycles
+    fdep = dft_gates.DftDependency(dft.next_id(), "FDEP", 1, [middle], (0, 0))
+    dft.add(fdep)
+    fdep.add_child(element)
+
+    # Cycle is detected without incremental check
+    dft.enable_incremental_cycle_check(False)
+    middle.add_child(element)
+    assert dft.is_cyclic()
+    with pytest.raises(DftInvalidArgumentException):
+        dft.enable_incremental_cycle_check()
+
+    # First edge of an empty gate is checked as well
+    dft = dfts.Dft()
+    empty = dft_gates.DftOr(dft.next_id(), "E", [], (0, 0))
+    dft.add(empty)
+    top = dft_gates.DftAnd(dft.next_id(), "T", [empty], (0, 0))
+    dft.add(top)
+    dft.set_top_level_element(top.element_id)
+    dft.enable_incremental_cycle_check()
+    with pytest.raises(DftInvalidArgumentException, match="cycle"):
+        empty.add_child(top)
+    assert not empty.children()
+    dft.enable_incremental_cycle_check(False)
+    assert not dft.is_cyclic()
+
+
+def test_incremental_validation():
+    dft = dfts.Dft()
+    be_a = dft_be.BeExponential(dft.next_id(), "A", 1.0, 1, 0, (0, 0))
+    dft.add(be_a)
+    be_b = dft_be.BeExponential(dft.next_id(), "B", 1.0, 1, 0, (0, 0))
+    dft.add(be_b)
+    vot = dft_gates.DftVotingGate(dft.next_id(), "Vot", 2, [be_a, be_b], (0, 0))
+    dft.add(vot)
+    top = dft_gates.DftAnd(dft.next_id(), "Top", [vot], (0, 0))
+    dft.add(top)
+    dft.set_top_level_element(top.element_id)
+    dft.start_incremental_validation()
+    dft.check_valid_incremental()
+
+    # Cycle is detected
+    vot.add_child(top)
+    with pytest.raises(AssertionError):
+        dft.check_valid_incremental()
+    vot.remove_child(top)
+    dft.check_valid_incremental()
+
+    # Removing child invalidates voting threshold
+    dft.remove(be_b)
+    with pytest.raises(AssertionError):
+        dft.check_valid_incremental()
+    # Failed elements are checked again
+    with pytest.raises(AssertionError):
+        dft.check_valid_incremental()
+    dft.set_attribute(vot, "voting_threshold", 1)
+    dft.check_valid_incremental()
+    dft.stop_incremental_validation()
+    dft.check_valid()
+    dft.set_attribute(vot, "voting_threshold", 2)
+    with pytest.raises(AssertionError):
+        dft.check_valid()
+
+
+def _create_shared_dft(prefix, order_and=True, order_pand=True):
+    dft = dfts.Dft()
+    be_a = dft_be.BeExponential(dft.next_id(), prefix + "A", 1.0, 1, 0, (0, 0))
+    dft.add(be_a)
+    be_b = dft_be.BeExponential(dft.next_id(), prefix + "B", 2.0, 1, 0, (0, 0))
+    dft.add(be_b)
+    gate_and = dft_gates.DftAnd(dft.next_id(), prefix + "And", [be_a, be_b] if order_and else [be_b, be_a], (0, 0))
+    dft.add(gate_and)
+    pand = dft_gates.DftPand(dft.next_id(), prefix + "Pand", False, [be_a, be_b] if order_pand else [be_b, be_a], (0, 0))
+    dft.add(pand)
+    top = dft_gates.DftOr(dft.next_id(), prefix + "Top", [gate_and, pand, be_b], (0, 0))
+    dft.add(top)
+    dft.set_top_level_element(top.element_id)
+    return dft
+
+
+def test_structural_hash():
+    dft = _create_shared_dft("")
+    # Hash does not depend on names or order of children of static gates
+    assert dft.structural_hash() == _create_shared_dft("X", order_and=False).structural_hash()
+    assert dft.structural_hash() != _create_shared_dft("", order_pand=False).structural_hash()
+    assert dft.structural_hash(dft.get_element_by_name("A")) != dft.structural_hash(dft.get_element_by_name("B"))
+    assert dft.compare(_create_shared_dft("", order_and=False), respect_ids=True)
+    with pytest.raises(Exception):
+        dft.compare(_create_shared_dft("", order_pand=False), respect_ids=False)
+
+    # Cached hashes are invalidated by changes
+    top_hash = dft.structural_hash()
+    gate_and = dft.get_element_by_name("And")
+    and_hash = dft.structural_hash(gate_and)
+    pand_hash = dft.structural_hash(dft.get_element_by_name("Pand"))
+    be_c = dft_be.BeExponential(dft.next_id(), "C", 1.0, 1, 0, (0, 0))
+    dft.add(be_c)
+    gate_and.add_child(be_c)
+    assert dft.structural_hash(gate_and) != and_hash
+    assert dft.structural_hash() != top_hash
+    assert dft.structural_hash(dft.get_element_by_name("Pand")) == pand_hash
+    dft.remove(be_c)
+    assert dft.structural_hash(gate_and) == and_hash
+    assert dft.structural_hash() == top_hash
+
+    groups = dfts.group_equal_dfts([dft, _create_shared_dft("X"), _create_shared_dft(""), _create_shared_dft("", order_pand=False)])
+    assert groups == [[0, 2], [1], [3]]
+
+
+def test_clone():
+    file = get_example_path("json", "all_gates.json")
+    dft = dftlib.io.parser.parse_dft_json_file(file)
+    top_hash = dft.structural_hash()
+    clone = dft.clone()
+    clone.check_valid()
+    assert clone.compare(dft, respect_ids=True)
+    assert clone.structural_hash() == top_hash
+    assert all(clone.elements[element_id] is not element for element_id, element in dft.elements.items())
+    assert all(
+        clone.get_element(element.element_id).children() == [clone.get_element(child.element_id) for child in element.children()]
+        for element in dft.iter_gates()
+    )
+
+    # Changes to the clone do not affect the original
+    spare = next(clone.iter_gates(ElementType.SPARE))
+    clone.remove(spare)
+    assert clone.structural_hash() != top_hash
+    assert dft.structural_hash() == top_hash
+    assert dft.size() == clone.size() + 1
+    clone.get_element_by_name(dft.top_level_element.name).name = "Renamed"
+    assert dft.has_name(dft.top_level_element.name)
+    assert not dft.has_name("Renamed")
+    dft.check_valid()
+
+
+def _adjacency(dft):
+    return {
+        element_id: ([parent.element_id for parent in element.parents()], [child.element_id for child in element.children()] if element.is_gate() else [])
+        for element_id, element in dft.elements.items()
+    }
+
+
+def test_transactions():
+    import dftlib.transformer.simplifier as simplifier
+
+    for file in [get_example_path("json", "all_gates.json"), get_example_path("json", "hecs.json"), get_example_path("simplify", "rule2_test.json")]:
+        dft = dftlib.io.parser.parse_dft_json_file(file)
+        original = dft.clone()
+        adjacency = _adjacency(dft)
+        top_hash = dft.structural_hash()
+        assert not dft.in_transaction()
+        dft.checkpoint()
+        assert simplifier.simplify_dft_all_rules(dft)
+        assert dft.in_transaction()
+        dft.rollback()
+        assert not dft.in_transaction()
+        dft.check_valid()
+        assert dft.compare(original, respect_ids=True)
+        assert _adjacency(dft) == adjacency
+        assert dft.structural_hash() == top_hash
+
+    # Nested transactions
+    dft = dftlib.io.parser.parse_dft_json_file(get_example_path("json", "all_gates.json"))
+    original = dft.clone()
+    top = dft.top_level_element
+    dft.checkpoint()
+    be = dft_be.BeExponential(dft.next_id(), "New", 1.0, 1, 0, (100, 100))
+    dft.add(be)
+    top.add_child(be)
+    dft.checkpoint()
+    dft.set_attribute(be, "rate", 2.0)
+    be.name = "Renamed"
+    dft.commit()
+    assert be.rate == 2.0
+    dft.checkpoint()
+    dft.remove(be)
+    dft.set_top_level_element(top.children()[0].element_id)
+    dft.rollback()
+    assert dft.get_element_by_name("Renamed") is be
+    assert dft.top_level_element is top
+    assert top.has_child(be)
+    dft.rollback()
+    assert not dft.has_name("Renamed") and not dft.has_name("New")
+    assert dft.max_id == original.max_id
+    assert dft.position_bounds == original.position_bounds
+    assert dft.compare(original, respect_ids=True)
+    with pytest.raises(DftInvalidArgumentException):
+        dft.rollback()
+    with pytest.raises(DftInvalidArgumentException):
+        dft.set_attribute(top, "_dft", None)
+
+
+def test_transaction_high_fan_in():
+    dft = dfts.Dft()
+    be_power = dft_be.BeExponential(dft.next_id(), "Power", 1.0, 1, 0, (0, 0))
+    dft.add(be_power)
+    gates = []
+    for i in range(30):
+        gate = dft_gates.DftOr(dft.next_id(), "G{}".format(i), [be_power], (0, 0))
+        dft.add(gate)
+        gates.append(gate)
+    top = dft_gates.DftAnd(dft.next_id(), "Top", gates, (0, 0))
+    dft.add(top)
+    dft.set_top_level_element(top.element_id)
+    adjacency = _adjacency(dft)
+
+    dft.checkpoint()
+    # Removing many parents drops the index of parents
+    for gate in gates[::-2] + gates[:16]:
+        if gate.element_id in dft.elements:
+            dft.remove(gate)
+    top.replace_child(gates[20], be_power)
+    dft.rollback()
+    dft.check_valid()
+    assert _adjacency(dft) == adjacency
+    assert all(be_power.has_parent(gate) for gate in gates)
+    assert all(top.has_child(gate) for gate in gates)
+
+
+def test_modules():
+    dft = dftlib.io.parser.parse_dft_txt_string("AND(OR(A,B),OR(B,C),AND(D,PAND(E,F)))")
+    modules = dft.modules()
+    assert modules is dft.modules()
+    names = {element.name for element in modules.independent_modules()}
+    assert len(names) == 3
+    assert dft.top_level_element.name in names
+    and_gate = dft.top_level_element.children()[2]
+    pand = and_gate.children()[1]
+    assert modules.is_independent_module(and_gate) and modules.is_independent_module(pand)
+    assert not modules.is_static_module(and_gate) and not modules.is_static_module(pand)
+    assert not modules.is_independent_module(dft.top_level_element.children()[0])
+    assert modules.get_independent_module(dft.get_element_by_name("A")) == dft.top_level_element
+    assert modules.get_independent_module(dft.get_element_by_name("D")) == and_gate
+    assert modules.get_independent_module(dft.get_element_by_name("E")) == pand
+    assert modules.get_independent_module(pand) == pand
+
+    # Cache is invalidated by changes
+    dft.top_level_element.children()[0].add_child(dft.get_element_by_name("D"))
+    modules = dft.modules()
+    assert not modules.is_independent_module(and_gate)
+    assert modules.is_independent_module(pand)
+
+
+def test_spare_modules():
+    dft = dftlib.io.parser.parse_dft_galileo_string(
+        'toplevel "T"; "T" and "S" "X"; "S" wsp "P" "Q"; "P" or "P1" "P2"; "F" fdep "X" "P2";'
+        '"Q" lambda=1 dorm=0.5; "X" lambda=1 dorm=0; "P1" lambda=1 dorm=0; "P2" lambda=1 dorm=0;'
+    )
+    modules = dft.modules()
+    top, spare, p, q, f = (dft.get_element_by_name(name) for name in ["T", "S", "P", "Q", "F"])
+    assert modules.representatives() == [top, p, q]
+    assert {element.name for element in modules.get_module(top)} == {"T", "S", "X", "F", "P2"}
+    assert {element.name for element in modules.get_module(p)} == {"P", "P1", "P2", "F", "X"}
+    assert [element.name for element in modules.get_module(q)] == ["Q"]
+    assert modules.get_module(spare) == []
+    assert sorted(dft.get_module(p)) == sorted(element.element_id for element in modules.get_module(p))
+    assert modules.get_parent_module(p) == top
+    assert modules.get_parent_module(top) is None
+    assert modules.in_spare_module(dft.get_element_by_name("P1"))
+    assert not modules.in_spare_module(spare)
+    assert set(modules.get_representatives(dft.get_element_by_name("P2"))) == {top, p}
+
+    # Dependency connects X and P2, so neither the top nor P are independent modules
+    assert not modules.is_independent_module(top)
+    assert not modules.is_independent_module(p)
+
+
+def test_independent_modules_random():
+    rng = random.Random(42)
+    for _ in range(20):
+        dft = dfts.Dft()
+        elements = []
+        for i in range(15):
+            be = dft_be.BeExponential(dft.next_id(), "B{}".format(i), 1.0, 1, 0, (0, 0))
+            dft.add(be)
+            elements.append(be)
+        for i in range(20):
+            children = rng.sample(elements, rng.randint(1, 3))
+            gate = dft_gates.DftAnd(dft.next_id(), "G{}".format(i), children, (0, 0))
+            dft.add(gate)
+            elements.append(gate)
+        top = dft_gates.DftOr(dft.next_id(), "Top", [element for element in elements if not element.parents()], (0, 0))
+        dft.add(top)
+        dft.set_top_level_element(top.element_id)
+
+        modules = dft.modules()
+        for gate in dft.iter_gates():
+            # Gate is an independent module iff all descendants only have parents within the sub-DFT
+            descendants = set()
+            stack = list(gate.children())
+            while stack:
+                element = stack.pop()
+                if element not in descendants:
+                    descendants.add(element)
+                    if element.is_gate():
+                        stack.extend(element.children())
+            expected = all(parent in descendants or parent is gate for element in descendants for parent in element.parents())
+            assert modules.is_independent_module(gate) == expected
+
+
+class _AndAncestor(AncestorProperty):
+    def own_value(self, element):
+        return isinstance(element, dft_gates.DftAnd)
+
+    def follow(self, element, parent):
+        return True
+
+
+def _ancestors(element):
+    ancestors = {element}
+    stack = [element]
+    while stack:
+        for parent in stack.pop().parents():
+            if parent not in ancestors:
+                ancestors.add(parent)
+                stack.append(parent)
+    return ancestors
+
+
+def _check_ancestor_indices(dft):
+    closure = dft.ancestor_index(AncestorClosure)
+    property_index = dft.ancestor_index(_AndAncestor)
+    elements = list(dft.elements.values())
+    for element in elements:
+        ancestors = _ancestors(element)
+        assert property_index.value(element) == any(isinstance(ancestor, dft_gates.DftAnd) for ancestor in ancestors)
+        for other in elements:
+            assert closure.is_ancestor(other, element) == (other in ancestors)
+
+
+def test_ancestor_index():
+    rng = random.Random(23)
+    for _ in range(10):
+        dft = dfts.Dft()
+        elements = []
+        for i in range(10):
+            be = dft_be.BeExponential(dft.next_id(), "B{}".format(i), 1.0, 1, 0, (0, 0))
+            dft.add(be)
+            elements.append(be)
+        for i in range(15):
+            children = rng.sample(elements, rng.randint(1, 3))
+            gate_class = dft_gates.DftAnd if rng.random() < 0.3 else dft_gates.DftOr
+            gate = gate_class(dft.next_id(), "G{}".format(i), children, (0, 0))
+            dft.add(gate)
+            elements.append(gate)
+        top = dft_gates.DftOr(dft.next_id(), "Top", [element for element in elements if not element.parents()], (0, 0))
+        dft.add(top)
+        dft.set_top_level_element(top.element_id)
+        _check_ancestor_indices(dft)
+
+        # Indices are updated after changes
+        dft.checkpoint()
+        gates = [gate for gate in dft.iter_gates() if gate is not top]
+        for _ in range(5):
+            gate = rng.choice(gates)
+            child = rng.choice(gate.children())
+            if len(gate.children()) > 1:
+                gate.remove_child(child)
+            candidates = [element for element in elements if gate not in _ancestors(element) and not gate.has_child(element)]
+            if candidates:
+                gate.add_child(rng.choice(candidates))
+            _check_ancestor_indices(dft)
+        removable = [gate for gate in gates if gate.parents() and all(len(parent.children()) > 1 for parent in gate.parents())]
+        if removable:
+            dft.remove(removable[0])
+            _check_ancestor_indices(dft)
+        dft.rollback()
+        _check_ancestor_indices(dft)
+
+    # Subclasses must define the property
+    with pytest.raises(TypeError):
+        dft.ancestor_index(AncestorProperty)
@@ -0,0 +1,53 @@
+import math
+import pickle
+
+import pytest
+from helpers.helper import get_example_path
+
+import dftlib.io.parser
+from dftlib.exceptions.exceptions import DftInvalidArgumentException
+from dftlib.storage.dft_element import ElementType
+
+
+def test_freeze():
+    file = get_example_path("json", "hecs.json")
+    dft = dftlib.io.parser.parse_dft_json_file(file)
+    frozen = dft.freeze()
+    assert frozen.size() == dft.size()
+    assert frozen.name(frozen.top_level_index()) == "HECS"
+
+    # Structure is the same as in DFT
+    for element in dft.elements.values():
+        index = frozen.index(element.element_id)
+        assert frozen.get_array("ids")[index] == element.element_id
+        assert frozen.name(index) == element.name
+        assert frozen.element_type(index) == element.element_type
+        assert [frozen.name(i) for i in frozen.parents(index)] == [parent.name for parent in element.parents()]
+        if element.is_gate():
+            assert [frozen.name(i) for i in frozen.children(index)] == [child.name for child in element.children()]
+        else:
+            assert len(frozen.children(index)) == 0
+
+    be = frozen.index(dft.get_element_by_name("M1").element_id)
+    assert frozen.get_array("rates")[be] == 6e-05
+    assert frozen.get_array("dorms")[be] == 0
+    vot = frozen.index(dft.get_element_by_name("MSF").element_id)
+    assert frozen.element_type(vot) == ElementType.VOT
+    assert frozen.get_array("thresholds")[vot] == 3
+    assert math.isnan(frozen.get_array("rates")[vot])
+
+    # Snapshot is immutable
+    with pytest.raises(TypeError):
+        frozen.get_array("rates")[be] = 1.0
+
+    # Snapshot can be pickled
+    frozen2 = pickle.loads(pickle.dumps(frozen))
+    assert frozen2.size() == frozen.size()
+    assert list(frozen2.get_array("child_indices")) == list(frozen.get_array("child_indices"))
+
+
+def test_freeze_parametric():
+    file = get_example_path("json", "parametric.json")
+    dft = dftlib.io.parser.parse_dft_json_file(file)
+    with pytest.raises(DftInvalidArgumentException):
+        dft.freeze()
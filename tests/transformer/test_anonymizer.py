@@ -26,3 +26,20 @@ def test_anonymize_small():
     assert dft.size() == 5
     for i in range(0, 5):
         assert dft.get_element(i).name == "A" + str(i)
+
+
+def test_anonymize_name_clash():
+    s = "AND(A3, OR(A0, A1), A4)"
+    dft = dftlib.io.parser.parse_dft_txt_string(s)
+    assert dft.size() == 6
+    ids = list(dft.elements.keys())
+
+    dftlib.transformer.anonymizer.make_anonymous(dft)
+    assert dft.size() == 6
+    for i in range(0, 6):
+        element = dft.get_element(i)
+        assert element.element_id == i
+        assert element.name == "A" + str(i)
+        assert dft.get_element_by_name("A" + str(i)) is element
+    assert dft.top_level_element.element_id == ids.index(0)
+    dft.check_valid()
@@ -5,7 +5,7 @@ import dftlib.transformer.simplifier as simplifier
 from dftlib.storage.dft_element import ElementType
 from dftlib.storage.dft_be import BeExponential
 from dftlib.storage.dft_gates import DftPand
-from dftlib.transformer.rewrite_rules import RewriteRules
+from dftlib.transformer.rewrite_rules import RewriteRules, IdenticalGatesIndex, try_merge_identical_gates, try_remove_fdep_successors
 
 
 def test_split_fdeps():
@@ -62,6 +62,26 @@ def test_rewrite_all_rule2():
     assert no_elements == 3
 
 
+def test_identical_gates_index():
+    file = get_example_path("simplify", "rule2_test2.json")
+    dft = dftlib.io.parser.parse_dft_json_file(file)
+    index = IdenticalGatesIndex(dft)
+    gate_b1 = dft.get_element_by_name("B1")
+    gate_b2 = dft.get_element_by_name("B2")
+    gate_and9 = dft.get_element_by_name("and_9")
+    # OR-gate with same children has a different signature
+    assert set(elem.name for elem in index.candidates(gate_b1)) == {"B2", "and_9"}
+    assert index.candidates(dft.get_element_by_name("or_10")) == []
+    assert index.candidates(dft.get_element_by_name("C")) == []
+    pairs = index.candidate_pairs(dft)
+    assert [(elem1.name, elem2.name) for elem1, elem2 in pairs] == [("B1", "B2"), ("B1", "and_9"), ("B2", "and_9")]
+
+    # Merge and update index
+    assert try_merge_identical_gates(dft, gate_b1, gate_b2)
+    index.update(dft, gate_b2.element_id)
+    assert [elem.name for elem in index.candidates(gate_and9)] == ["B1_B2"]
+
+
 def test_rewrite_all_rule3():
     file = get_example_path("simplify", "rule3_test.json")
     dft = dftlib.io.parser.parse_dft_json_file(file)
@@ -176,6 +196,17 @@ def test_rewrite_all_rule28():
     assert no_elements == 4
 
 
+def test_rule28_parent_order():
+    # FDEP is declared first and therefore precedes the PAND in the parents of the dependent element
+    dft = dftlib.io.parser.parse_dft_galileo_string(
+        'toplevel "A"; "A" and "G"; "F" fdep "B2" "B1"; "G" and "B"; "B" pand "B1" "B2"; "B1" lambda=1 dorm=0; "B2" lambda=1 dorm=0;'
+    )
+    fdep = dft.get_element_by_name("F")
+    assert [parent.name for parent in dft.get_element_by_name("B1").parents()] == ["F", "B"]
+    assert try_remove_fdep_successors(dft, fdep)
+    assert fdep.element_id not in dft.elements
+
+
 def test_rewrite_all_rule35():
     file = get_example_path("simplify", "rule35_test.json")
     dft = dftlib.io.parser.parse_dft_json_file(file)
@@ -1,7 +1,12 @@
+import json
+import logging
+import os
+
 from helpers.helper import get_example_path
-from conftest import stormpy
 
 import dftlib.io.parser
+import dftlib.storage.dft
+import dftlib.storage.dft_be
 import dftlib.storage.dft_gates as dft_gates
 import dftlib.transformer.simplifier as simplifier
 
@@ -106,7 +111,6 @@ def test_rewrite_keep_order():
     assert children[1].name == "B"
 
 
-@stormpy
 def test_rewrite_replace_parents():
     file = get_example_path("simplify", "replace_parents.dft")
     dft = dftlib.io.parser.parse_dft_galileo_file(file)
@@ -132,3 +136,103 @@ def test_rewrite_replace_parents():
     for child in children:
         assert isinstance(child, dft_gates.DftSpare)
         assert len(child.children()) == 2
+
+
+def test_rewrite_worklist_same_result():
+    files = [
+        get_example_path("json", "all_gates.json"),
+        get_example_path("json", "hecs.json"),
+        get_example_path("simplify", "fdep.json"),
+        get_example_path("simplify", "fdep_cycle.json"),
+        get_example_path("simplify", "rule24_test.json"),
+        get_example_path("simplify", "rule26_test.json"),
+        get_example_path("simplify", "rule28_test.json"),
+        get_example_path("simplify", "rule2_test2.json"),
+        get_example_path("simplify", "rule35_test.json"),
+        get_example_path("simplify", "small.json"),
+    ]
+    for file in files:
+        for rules in [simplifier.get_default_rules(), simplifier.get_all_rules()]:
+            dft_restart = dftlib.io.parser.parse_dft_json_file(file)
+            changed_restart = simplifier.simplify_dft_rules(dft_restart, rules, simplifier.SimplificationStrategy.RESTART, simplifier.ValidationLevel.STEP)
+            dft_worklist = dftlib.io.parser.parse_dft_json_file(file)
+            changed_worklist = simplifier.simplify_dft_rules(dft_worklist, rules, simplifier.SimplificationStrategy.WORKLIST)
+            assert changed_restart == changed_worklist
+            assert dft_restart.statistics() == dft_worklist.statistics()
+            assert dft_restart.compare(dft_worklist, respect_ids=False)
+
+
+def test_rewrite_statistics(monkeypatch, caplog):
+    def fail(self):
+        raise AssertionError("DFT string built without debug logging")
+
+    # Tracing is skipped without debug logging
+    monkeypatch.setattr(dftlib.storage.dft.Dft, "verbose_str", fail)
+    caplog.set_level(logging.INFO)
+
+    file = get_example_path("simplify", "rule24_test.json")
+    rules = simplifier.get_all_rules()
+    for strategy in [simplifier.SimplificationStrategy.RESTART, simplifier.SimplificationStrategy.WORKLIST]:
+        dft = dftlib.io.parser.parse_dft_json_file(file)
+        initial_size = dft.size()
+        statistics = simplifier.SimplificationStatistics()
+        assert simplifier.simplify_dft_rules(dft, rules, strategy, statistics=statistics)
+        assert list(statistics.rules.keys()) == rules
+        assert statistics.strategy == strategy
+        assert statistics.initial_size == initial_size
+        assert statistics.final_size == dft.size()
+        assert statistics.rewrites() == 4
+        removed = sum(rule_statistics.removed for rule_statistics in statistics.rules.values())
+        added = sum(rule_statistics.added for rule_statistics in statistics.rules.values())
+        assert initial_size - removed + added == dft.size()
+        replace_fdep = statistics.get(simplifier.RewriteRules.REPLACE_FDEP_BY_OR)
+        assert replace_fdep.successes == 1
+        assert replace_fdep.added == 1 and replace_fdep.removed == 1
+        for rule_statistics in statistics.rules.values():
+            assert rule_statistics.successes <= rule_statistics.attempts
+            assert rule_statistics.time >= 0
+        assert json.loads(json.dumps(statistics.get_json()))["rewrites"] == 4
+        assert "REPLACE_FDEP_BY_OR" in str(statistics)
+
+
+def test_rewrite_sweep_same_result():
+    directory = get_example_path("simplify")
+    files = sorted(os.path.join(directory, file) for file in os.listdir(directory))
+    for file in files:
+        for rules in [simplifier.get_default_rules(), simplifier.get_all_rules()]:
+            dft_restart = dftlib.io.parser.parse_dft_file(file)
+            statistics_restart = simplifier.SimplificationStatistics()
+            changed_restart = simplifier.simplify_dft_rules(
+                dft_restart, rules, simplifier.SimplificationStrategy.RESTART, simplifier.ValidationLevel.STEP, statistics_restart
+            )
+            dft_sweep = dftlib.io.parser.parse_dft_file(file)
+            statistics_sweep = simplifier.SimplificationStatistics()
+            changed_sweep = simplifier.simplify_dft_rules(dft_sweep, rules, simplifier.SimplificationStrategy.SWEEP, statistics=statistics_sweep)
+            assert changed_restart == changed_sweep
+            assert dft_restart.statistics() == dft_sweep.statistics()
+            assert dft_restart.compare(dft_sweep, respect_ids=False)
+            assert statistics_sweep.scans <= statistics_restart.scans
+            assert statistics_sweep.final_size == statistics_restart.final_size
+
+
+def test_rewrite_sweep_scans():
+    # Independent OR-gates below the top level element with single children which can all be removed in one sweep
+    file = get_example_path("simplify", "small.json")
+    dft = dftlib.io.parser.parse_dft_json_file(file)
+    top = dft.top_level_element
+    for i in range(10):
+        be = dftlib.storage.dft_be.BeExponential(dft.next_id(), "X{}".format(i), 1.0, 1, 0, (0, 0))
+        dft.add(be)
+        gate = dft_gates.DftOr(dft.next_id(), "G{}".format(i), [be], (0, 0))
+        dft.add(gate)
+        top.add_child(gate)
+    dft_restart = dft.clone()
+    rules = [simplifier.RewriteRules.REMOVE_SINGLE_SUCCESSOR]
+    statistics_restart = simplifier.SimplificationStatistics()
+    assert simplifier.simplify_dft_rules(dft_restart, rules, simplifier.SimplificationStrategy.RESTART, statistics=statistics_restart)
+    statistics_sweep = simplifier.SimplificationStatistics()
+    assert simplifier.simplify_dft_rules(dft, rules, simplifier.SimplificationStrategy.SWEEP, statistics=statistics_sweep)
+    assert dft.compare(dft_restart, respect_ids=False)
+    assert statistics_sweep.rewrites() == statistics_restart.rewrites() >= 10
+    assert statistics_restart.scans == statistics_restart.rewrites() + 1
+    assert statistics_sweep.scans < statistics_restart.scans